@@ -0,0 +1,200 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from constants import DEFAULT_TEAM_SIZE
+from models import SolverMode
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when a request is not admitted.
+
+    Attributes:
+        status_code (int): 429 when the client is over its rate, 503 when the worker is overloaded.
+        retry_after (int): Seconds after which the request can be retried.
+    """
+
+    def __init__(self, status_code, retry_after, detail):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.detail = detail
+
+
+# cost of a cache hit, a rejected budget or a request joining a solve already in flight
+MIN_COST = 1.0
+# candidate products x team slots the DP handles for one token - roughly the cost
+# of a cache hit or a rejected budget, which are charged MIN_COST
+WORK_PER_TOKEN = 50
+# the fast solver stops at its deadline whatever the catalog size
+FAST_MODE_MS_PER_TOKEN = 5
+
+
+def estimate_solve_cost(catalog, budget, constraints=None, mode=SolverMode.exact, deadline_ms=None) -> float:
+    """
+    Estimate the solver work a request will cause, in tokens. The DP visits every
+    candidate product (see CatalogIndex.candidates) once per team slot, so cached
+    teams and budgets too small for any team cost 1 token, while large budgets on
+    wide catalogs cost up to (categories x 10 x team size) / WORK_PER_TOKEN.
+    Constrained requests are counted on the unrestricted candidates: their filters only
+    remove candidates (and lower the price limits), so this bounds their search too.
+
+    Args:
+        catalog (Catalog): The catalog the request is solved against
+        budget (int): The requested budget
+        constraints (TeamConstraints): Optional restrictions on the team
+        mode (SolverMode): Exact or fast solver
+        deadline_ms (int): Time budget of the fast solver in milliseconds
+
+    Returns:
+        float: Estimated cost in tokens (at least 1)
+    """
+    team_size = constraints.team_size if constraints is not None else DEFAULT_TEAM_SIZE
+    if catalog.teams.get(budget, constraints) is not None:
+        return MIN_COST
+    # below the sum of the cheapest category minimums no team exists - a cheap 400
+    cheapest = sorted(catalog.index.min_price_by_category.values())[:team_size]
+    if len(cheapest) < team_size or budget < sum(cheapest):
+        return MIN_COST
+
+    candidates = sum(len(products) for products in catalog.index.candidates(budget, team_size).values())
+    cost = MIN_COST + candidates * team_size / WORK_PER_TOKEN
+    if mode == SolverMode.fast and deadline_ms is not None:
+        cost = min(cost, MIN_COST + deadline_ms / FAST_MODE_MS_PER_TOKEN)
+    return cost
+
+
+class TokenBucket:
+    """Classic token bucket: refills at `rate` tokens per second up to `capacity`."""
+
+    def __init__(self, rate, capacity, now=None):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic() if now is None else now
+
+    def take(self, cost, now=None) -> float:
+        """
+        Take `cost` tokens if available.
+
+        Args:
+            cost (float): Tokens the request needs.
+            now (float): Current time.monotonic() value (for tests).
+
+        Returns:
+            float: 0 if the tokens were taken, otherwise seconds until they would be available.
+        """
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        # a request costing more than the burst still gets in with a full bucket
+        needed = min(cost, self.capacity)
+        if self.tokens >= needed:
+            self.tokens -= needed
+            return 0.0
+        return (needed - self.tokens) / self.rate
+
+
+class AdmissionController:
+    """
+    Cost-aware admission control in front of the solver. Every client gets a token
+    bucket charged with the estimated cost of each request (see estimate_solve_cost),
+    so a burst of expensive solves is throttled long before a burst of cheap ones.
+    Independently, the total estimated cost of admitted requests still running is
+    capped, and requests are shed with 503 before the solver threads back up. Requests
+    joining a solve already in flight add no work: they are only charged to their bucket.
+    """
+
+    # clients are user controlled, keep the bucket table bounded
+    MAX_CLIENTS = 10000
+
+    def __init__(self, rate=50.0, burst=200.0, max_pending_cost=400.0):
+        """
+        Args:
+            rate (float): Tokens per second each client's bucket refills with (0 disables the limits).
+            burst (float): Bucket capacity - tokens a client can spend at once.
+            max_pending_cost (float): Maximum total cost of admitted requests in progress.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_pending_cost = max_pending_cost
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self.pending_cost = 0.0
+        self.counters = {'admitted': 0, 'rate_limited': 0, 'overloaded': 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def admit(self, client, cost, pending=True) -> float:
+        """
+        Admit a request or raise AdmissionRejected. Admitted requests must call
+        release() with the returned cost when done.
+
+        Args:
+            client (str): Client identity (e.g. remote address).
+            cost (float): Estimated cost in tokens.
+            pending (bool): False if the request causes no solver work of its own (it
+                joins a solve in flight): it is never shed and adds nothing to the pending cost.
+
+        Returns:
+            float: The pending cost added (0 when admission control is disabled or not pending).
+        """
+        if not self.enabled:
+            return 0.0
+        with self._lock:
+            # shed before charging the client: it isn't their fault the worker is busy
+            if pending and self.pending_cost > 0 and self.pending_cost + cost > self.max_pending_cost:
+                self.counters['overloaded'] += 1
+                raise AdmissionRejected(503, 1, "Server is busy, please retry shortly")
+
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = TokenBucket(self.rate, self.burst)
+                if len(self._buckets) > self.MAX_CLIENTS:
+                    self._buckets.popitem(last=False)
+            self._buckets.move_to_end(client)
+
+            wait = bucket.take(cost)
+            if wait > 0:
+                self.counters['rate_limited'] += 1
+                retry_after = max(1, math.ceil(wait))
+                raise AdmissionRejected(429, retry_after, f"Rate limit exceeded, retry in {retry_after}s")
+
+            self.counters['admitted'] += 1
+            if not pending:
+                return 0.0
+            self.pending_cost += cost
+            return cost
+
+    def release(self, cost):
+        """Mark an admitted request of the given cost as finished."""
+        with self._lock:
+            self.pending_cost = max(0.0, self.pending_cost - cost)
+
+    def reset(self):
+        """Forget every client bucket and counter."""
+        with self._lock:
+            self._buckets.clear()
+            self.pending_cost = 0.0
+            self.counters = dict.fromkeys(self.counters, 0)
+
+    def snapshot(self) -> dict:
+        """
+        Return the admission state for monitoring.
+
+        Returns:
+            dict: Limits, pending cost, tracked clients and admitted/rejected counts
+        """
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "max_pending_cost": self.max_pending_cost,
+                "pending_cost": round(self.pending_cost, 3),
+                "clients": len(self._buckets),
+                **self.counters,
+            }
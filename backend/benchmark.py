@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Solver latency benchmark for the Team Builder API
+
+Measures curate_product_team latency for several team sizes against a latency SLO,
+on the sample catalog and on a larger synthetic catalog.
+
+Usage:
+    python3 benchmark.py                      # team sizes 3, 5 and 8, 50 ms SLO
+    python3 benchmark.py --team-sizes 3 5 8 --slo-ms 20 --products-per-category 500
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+
+from constants import sample_product_json
+from logic import CatalogIndex, curate_product_team
+from models import ProductCategory, TeamConstraints
+
+
+def synthetic_catalog(products_per_category, seed=42):
+    """Generate a catalog with every category filled with random products"""
+    rng = random.Random(seed)
+    products = []
+    for category in ProductCategory:
+        for _ in range(products_per_category):
+            products.append({
+                "id": len(products) + 1,
+                "name": f"{category.value} {len(products) + 1}",
+                "category": category.value,
+                "price": rng.randint(5, 600),
+                "rating": round(rng.uniform(3.0, 5.0), 1),
+            })
+    return products
+
+
+def measure(index, team_size, budgets, repeats):
+    """Return per-solve latencies in milliseconds"""
+    constraints = TeamConstraints(team_size=team_size)
+    latencies = []
+    for budget in budgets:
+        for _ in range(repeats):
+            started = time.perf_counter()
+            curate_product_team(index, budget, constraints)
+            latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark solver latency per team size")
+    parser.add_argument("--team-sizes", type=int, nargs="+", default=[3, 5, 8])
+    parser.add_argument("--slo-ms", type=float, default=50.0, help="p95 latency objective per solve")
+    parser.add_argument("--products-per-category", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    catalogs = {
+        "sample": CatalogIndex(sample_product_json),
+        f"synthetic ({args.products_per_category}/category)": CatalogIndex(
+            synthetic_catalog(args.products_per_category)
+        ),
+    }
+    # cover all three scoring tiers
+    budgets = [300, 450, 600, 800, 1000, 1500, 2500, 5000]
+
+    print(f"⏱️  Solver latency (SLO: p95 <= {args.slo_ms} ms)")
+    print("=" * 72)
+    print(f"{'catalog':<32}{'team':>6}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}  SLO")
+    within_slo = True
+    for name, index in catalogs.items():
+        for team_size in args.team_sizes:
+            if team_size > len(index.categories):
+                continue
+            latencies = sorted(measure(index, team_size, budgets, args.repeats))
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            ok = p95 <= args.slo_ms
+            within_slo = within_slo and ok
+            print(f"{name:<32}{team_size:>6}{statistics.median(latencies):>10.2f}{p95:>10.2f}"
+                  f"{latencies[-1]:>10.2f}  {'✅' if ok else '❌'}")
+    print("=" * 72)
+
+    sys.exit(0 if within_slo else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import hashlib
+
+# Teams only change when the catalog changes, and the ETag already encodes the
+# catalog version, so browsers and the CDN can keep a response for a while and
+# revalidate it cheaply with If-None-Match afterwards.
+TEAM_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a strong ETag from the values that fully determine a response.
+
+    Args:
+        *parts: Values identifying the response (catalog version, budget, options...).
+
+    Returns:
+        str: Quoted strong ETag, e.g. '"3f2a..."'.
+    """
+    raw = "|".join(str(part) for part in parts)
+    return '"' + hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match, etag) -> bool:
+    """
+    Check an If-None-Match request header against an ETag.
+    Handles lists of tags, the '*' wildcard and weak validators (W/ prefix),
+    since If-None-Match uses the weak comparison function (RFC 9110, 13.1.2).
+
+    Args:
+        if_none_match (str): Raw If-None-Match header value (may be None).
+        etag (str): Current ETag of the resource.
+
+    Returns:
+        bool: True if the client already holds the current representation.
+    """
+    if not if_none_match:
+        return False
+
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    if '*' in candidates:
+        return True
+
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for tag in candidates:
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag == opaque:
+            return True
+    return False
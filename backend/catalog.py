@@ -0,0 +1,293 @@
+import hashlib
+import json
+import sys
+import threading
+from collections import OrderedDict
+
+from logic import CatalogIndex
+from team_cache import TeamCache
+from catalog_stats import CatalogStats
+from constants import DEFAULT_CATALOG_ID
+
+
+def catalog_version(products) -> str:
+    """
+    Compute a stable version identifier for a product catalog.
+    The version only changes when the catalog content changes, so it can be
+    used to key caches and HTTP validators (ETags) that must be dropped on update.
+
+    Args:
+        products (list): List of product dictionaries.
+
+    Returns:
+        str: Short hex digest of the catalog content.
+    """
+    # sort keys and products so that dict ordering doesn't change the version
+    canonical = json.dumps(
+        sorted(products, key=lambda p: p.get('id', 0)),
+        sort_keys=True,
+        separators=(',', ':'),
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def load_catalog(path):
+    """Load a catalog file: a JSON list of product dictionaries"""
+    with open(path) as catalog_file:
+        products = json.load(catalog_file)
+    if not isinstance(products, list):
+        raise ValueError(f"{path}: expected a JSON list of products")
+    return products
+
+
+def deep_size(obj, seen=None) -> int:
+    """
+    Approximate memory footprint of a structure of dicts, lists, tuples and scalars.
+    Objects shared between containers (e.g. products referenced from several index
+    tables) are only counted once.
+
+    Args:
+        obj: The object to measure.
+        seen (set): Ids of objects already counted.
+
+    Returns:
+        int: Size in bytes.
+    """
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(key, seen) + deep_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(deep_size(item, seen) for item in obj)
+    return size
+
+
+class Catalog:
+    """
+    A loaded product catalog: the raw products, their content version, the
+    solver index built from them and the teams solved so far. The index is built
+    separately (build_index) so that loading and indexing can be timed as distinct
+    startup phases. Catalogs are never modified in place - updated() returns a new one.
+    """
+
+    def __init__(self, products, catalog_id=DEFAULT_CATALOG_ID):
+        self.catalog_id = catalog_id
+        # keep a private copy so later edits to the source list can't skew the version
+        self.products = [dict(product) for product in products]
+        self.version = catalog_version(products)
+        self.index = None
+        self.stats = None
+        self.teams = TeamCache()
+        self.memory_bytes = None
+
+    def build_index(self, previous=None, changed_ids=()):
+        """
+        Build (or rebuild) the solver index, the Product models and the budget stats
+        for this catalog.
+
+        Args:
+            previous (Catalog): Catalog this one was updated from, whose models and
+                stats are reused for unchanged products instead of being recomputed.
+            changed_ids (iterable): Ids of the products changed since `previous`.
+
+        Returns:
+            CatalogIndex: The freshly built index.
+        """
+        self.index = CatalogIndex(self.products)
+        self.index.build_models(previous.index if previous is not None else None, changed_ids)
+        if previous is not None and previous.stats is not None:
+            self.stats = previous.stats.updated(self.index, changed_ids)
+        else:
+            self.stats = CatalogStats(self.index)
+        # measured once here - products and index don't change after this point
+        self.memory_bytes = deep_size((self.products, self.index.__dict__))
+        return self.index
+
+    def updated(self, upserts=(), removed_ids=()):
+        """
+        Create the next version of this catalog with some products changed.
+
+        Args:
+            upserts (list): Product dictionaries to add, or to replace by id.
+            removed_ids (iterable): Ids of products to remove.
+
+        Returns:
+            tuple: (new Catalog without an index yet, set of changed product ids)
+        """
+        products = {product['id']: product for product in self.products}
+        changed_ids = set()
+        for product in upserts:
+            if products.get(product['id']) != product:
+                changed_ids.add(product['id'])
+                products[product['id']] = product
+        for product_id in removed_ids:
+            if products.pop(product_id, None) is not None:
+                changed_ids.add(product_id)
+        return Catalog(list(products.values()), self.catalog_id), changed_ids
+
+
+class CatalogRegistry:
+    """
+    The catalogs served by this process, one per storefront/tenant.
+    Catalogs are loaded and indexed on first use and kept in LRU order; when the
+    resident indexes exceed the memory budget the coldest catalogs are evicted and
+    simply reloaded the next time they are asked for. Catalogs changed in this process
+    are pinned instead: reloading them would silently revert the changes.
+    Solved teams are bounded separately by TeamCache.max_entries and aren't counted
+    against the budget.
+    """
+
+    DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+
+    def __init__(self, factory, memory_budget_bytes=DEFAULT_MEMORY_BUDGET):
+        """
+        Args:
+            factory (callable): factory(catalog_id) -> Catalog with its index built,
+                or None when there is no such catalog.
+            memory_budget_bytes (int): Total size of the resident catalogs to stay under.
+        """
+        self._factory = factory
+        self.memory_budget_bytes = memory_budget_bytes
+        self._catalogs = OrderedDict()
+        # ids of catalogs the factory can't reproduce, never evicted
+        self._pinned = set()
+        self._lock = threading.Lock()
+        # one lock per catalog being loaded, so concurrent first requests load it once
+        self._load_locks = {}
+        self.loads = 0
+        self.evictions = 0
+
+    def get(self, catalog_id) -> Catalog:
+        """
+        Return a catalog, loading it if it isn't resident.
+
+        Args:
+            catalog_id (str): Catalog (tenant) identifier.
+
+        Returns:
+            Catalog: The loaded catalog with its solver index built.
+
+        Raises:
+            KeyError: If the factory doesn't know the catalog.
+        """
+        with self._lock:
+            catalog = self._lookup(catalog_id)
+            if catalog is not None:
+                return catalog
+            load_lock = self._load_locks.setdefault(catalog_id, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                catalog = self._lookup(catalog_id)
+            if catalog is not None:
+                return catalog
+            try:
+                catalog = self._factory(catalog_id)
+            except BaseException:
+                with self._lock:
+                    self._load_locks.pop(catalog_id, None)
+                raise
+            with self._lock:
+                # dropped together with the catalog becoming resident, so a thread
+                # arriving now either finds the catalog or waits for this load
+                self._load_locks.pop(catalog_id, None)
+                if catalog is None:
+                    raise KeyError(catalog_id)
+                self.loads += 1
+                self._put(catalog)
+        return catalog
+
+    def get_resident(self, catalog_id):
+        """
+        Return a catalog if it is resident, without ever loading it.
+
+        Args:
+            catalog_id (str): Catalog (tenant) identifier.
+
+        Returns:
+            Catalog: The catalog, or None if it would have to be loaded.
+        """
+        with self._lock:
+            return self._lookup(catalog_id)
+
+    def put(self, catalog, pinned=False):
+        """
+        Make a catalog resident, replacing any catalog with the same id, and evict
+        the least recently used unpinned ones if the memory budget is exceeded. The
+        catalog being put is never evicted, even if it is larger than the whole budget.
+
+        Args:
+            catalog (Catalog): Catalog with its index built.
+            pinned (bool): Never evict the catalog, e.g. because it was changed in
+                this process and the factory would load the unchanged version.
+        """
+        with self._lock:
+            self._put(catalog, pinned)
+
+    def _put(self, catalog, pinned=False):
+        # put() with the registry lock held
+        self._catalogs[catalog.catalog_id] = catalog
+        self._catalogs.move_to_end(catalog.catalog_id)
+        if pinned:
+            self._pinned.add(catalog.catalog_id)
+        else:
+            self._pinned.discard(catalog.catalog_id)
+        while self.memory_bytes() > self.memory_budget_bytes:
+            coldest = next(
+                (catalog_id for catalog_id in self._catalogs
+                 if catalog_id != catalog.catalog_id and catalog_id not in self._pinned),
+                None,
+            )
+            if coldest is None:
+                break
+            # requests still holding an evicted catalog finish against it
+            del self._catalogs[coldest]
+            self.evictions += 1
+
+    def memory_bytes(self) -> int:
+        """Estimated size of the resident catalogs."""
+        return sum(catalog.memory_bytes or 0 for catalog in self._catalogs.values())
+
+    def clear(self):
+        """Drop every resident catalog."""
+        with self._lock:
+            self._catalogs.clear()
+            self._pinned.clear()
+
+    def snapshot(self) -> dict:
+        """
+        Return the registry state for monitoring.
+
+        Returns:
+            dict: Resident catalogs (most recently used last) with their version, size
+                and whether they are pinned, total and budget in bytes, load and
+                eviction counts.
+        """
+        with self._lock:
+            return {
+                "resident": [
+                    {
+                        "id": catalog.catalog_id,
+                        "version": catalog.version,
+                        "memory_bytes": catalog.memory_bytes,
+                        "pinned": catalog.catalog_id in self._pinned,
+                    }
+                    for catalog in self._catalogs.values()
+                ],
+                "memory_bytes": self.memory_bytes(),
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "loads": self.loads,
+                "evictions": self.evictions,
+            }
+
+    def __contains__(self, catalog_id):
+        return catalog_id in self._catalogs
+
+    def _lookup(self, catalog_id):
+        catalog = self._catalogs.get(catalog_id)
+        if catalog is not None:
+            self._catalogs.move_to_end(catalog_id)
+        return catalog
@@ -0,0 +1,150 @@
+import threading
+
+from constants import DEFAULT_TEAM_SIZE
+from logic import SCORE_TIER_LIMITS, affected_budget_floor, find_best_combination
+
+# a budget so large that every product is affordable and the score weights have
+# reached their limit - the team solved here is the one large budgets end up with
+LIMIT_BUDGET = 10 ** 9
+
+
+def category_stats(products) -> dict:
+    """Count and price range of one category's products"""
+    prices = [product['price'] for product in products]
+    return {"count": len(prices), "min_price": min(prices), "max_price": max(prices)}
+
+
+def saturation_budget(index, minimum_budget, team_size=DEFAULT_TEAM_SIZE):
+    """
+    Find the budget from which the best team stops changing.
+
+    Once every category's top products are affordable the candidates stop changing,
+    and within a tier of score_weights the composite score only changes through its
+    cost weight, which shrinks as the budget grows - so the budgets of a tier where the
+    limit team is optimal are taken to be the tier's upper part, found by bisection with
+    the solver (~30 solves). The cost weight jumps up at each tier boundary, though,
+    so a lower tier is only searched when the limit team wins the whole tier above it.
+
+    Args:
+        index (CatalogIndex): Index of the catalog.
+        minimum_budget (int): Cheapest feasible team for this team size.
+        team_size (int): Number of products in a team.
+
+    Returns:
+        int: Lowest budget returning the same team as every larger budget.
+    """
+    def solve(budget):
+        return find_best_combination(index.candidates(budget, team_size), budget, (), team_size)
+
+    limit_team = solve(LIMIT_BUDGET)
+    limit_ids = sorted(product['id'] for product in limit_team)
+
+    def has_limit_team(budget):
+        team = solve(budget)
+        return team is not None and sorted(product['id'] for product in team) == limit_ids
+
+    def first_limit_budget(low, high):
+        # lowest budget of [low, high] from which the limit team wins, given that it wins at high
+        if has_limit_team(low):
+            return low
+        while high - low > 1:
+            middle = (low + high) // 2
+            if has_limit_team(middle):
+                high = middle
+            else:
+                low = middle
+        return high
+
+    lowest = max(minimum_budget, sum(product['price'] for product in limit_team))
+    # tiers of score_weights as (first budget, last budget), searched from the top one down
+    tier_starts = [0] + [limit + 1 for limit in SCORE_TIER_LIMITS]
+    tier_ends = [start - 1 for start in tier_starts[1:]] + [LIMIT_BUDGET]
+    for start, end in reversed(list(zip(tier_starts, tier_ends))):
+        if end < LIMIT_BUDGET and not has_limit_team(end):
+            # the limit team loses at the top of this tier, and wins the whole tier above
+            return end + 1
+        low = max(start, lowest)
+        budget = first_limit_budget(low, end)
+        # the bottom tier starts at 0, so it always returns
+        if budget > low or low == lowest:
+            return budget
+
+
+class CatalogStats:
+    """
+    Budget-related statistics of a catalog version, for clients to validate budgets
+    without calling the solver: per-category product counts and price ranges, the
+    minimum feasible budget per team size and the budget from which the team stops
+    changing (computed on first use, per team size).
+    Built incrementally from the previous version's stats when the catalog changes.
+    """
+
+    def __init__(self, index, categories=None, saturation=None):
+        """
+        Args:
+            index (CatalogIndex): Index of the catalog version.
+            categories (dict): Per-category stats, computed from the index if None.
+            saturation (dict): Already known saturation budgets per team size.
+        """
+        self.index = index
+        if categories is None:
+            categories = {name: category_stats(products) for name, products in index.categories.items()}
+        self.categories = dict(sorted(categories.items()))
+        self.product_count = sum(stats["count"] for stats in self.categories.values())
+        # the cheapest team of k products takes the cheapest product of the k cheapest categories
+        self.minimum_budgets = {}
+        total = 0
+        for team_size, price in enumerate(sorted(stats["min_price"] for stats in self.categories.values()), 1):
+            total += price
+            self.minimum_budgets[team_size] = total
+        self._saturation = dict(saturation or {})
+        self._lock = threading.Lock()
+
+    def minimum_budget(self, team_size=DEFAULT_TEAM_SIZE):
+        """Cheapest feasible team, or None when there are fewer categories than team members"""
+        return self.minimum_budgets.get(team_size)
+
+    def saturation_budget(self, team_size=DEFAULT_TEAM_SIZE):
+        """
+        Budget from which the best team stops changing (None when no team exists).
+        Solved once per team size and catalog version.
+        """
+        minimum_budget = self.minimum_budget(team_size)
+        if minimum_budget is None:
+            return None
+        with self._lock:
+            if team_size not in self._saturation:
+                self._saturation[team_size] = saturation_budget(self.index, minimum_budget, team_size)
+            return self._saturation[team_size]
+
+    def updated(self, new_index, changed_ids):
+        """
+        Stats of the next catalog version: only the categories of changed products are
+        recounted, and saturation budgets are kept when the change can't affect any team.
+
+        Args:
+            new_index (CatalogIndex): Index of the updated catalog.
+            changed_ids (iterable): Ids of products added, removed or modified.
+
+        Returns:
+            CatalogStats: Stats of the new version.
+        """
+        changed_ids = set(changed_ids)
+        touched = {
+            index.products_by_id[product_id]['category']
+            for index in (self.index, new_index)
+            for product_id in changed_ids
+            if product_id in index.products_by_id
+        }
+        categories = {name: stats for name, stats in self.categories.items() if name not in touched}
+        for name in touched:
+            if name in new_index.categories:
+                categories[name] = category_stats(new_index.categories[name])
+
+        with self._lock:
+            known = dict(self._saturation)
+        saturation = {
+            team_size: budget for team_size, budget in known.items()
+            if affected_budget_floor(self.index, new_index, changed_ids, team_size) == float('inf')
+        }
+        return CatalogStats(new_index, categories, saturation)
@@ -19,4 +19,10 @@ sample_product_json = [
     { "id": 18, "name": "Smart Plug", "category": "Electronics", "price": 20, "rating": 4.1 },
     { "id": 19, "name": "Compact Scanner", "category": "Peripherals", "price": 95, "rating": 4.2 },
     { "id": 20, "name": "VR Headset", "category": "Wearables", "price": 350, "rating": 4.9 }
-]
\ No newline at end of file
+]
+
+# Number of products (each from a distinct category) in a team unless the request asks otherwise
+DEFAULT_TEAM_SIZE = 5
+
+# catalog served when a request doesn't name one
+DEFAULT_CATALOG_ID = "default"
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Differential testing harness for the team builder solver engines
+
+Generates random catalogs, budgets and team shapes, runs every registered engine
+against the brute-force reference (exhaustive_best_combination) and checks that
+each returns a valid team with the reference's optimal score and, on score ties, the
+same team (see logic.team_rank). A mismatch is shrunk to a minimal reproducer; the
+relative speed of each engine is reported per case.
+
+Usage:
+    python3 differential.py                         # 500 random cases, every engine
+    python3 differential.py --cases 2000 --seed 7 --engine dp --verbose
+
+New engines are registered with @register_engine and take
+(categories, budget, required_categories, team_size) like find_best_combination.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+
+from logic import (
+    CatalogIndex,
+    approximate_best_combination,
+    composite_score,
+    exhaustive_best_combination,
+    find_best_combination,
+)
+from models import ProductCategory
+
+ENGINES = {}
+
+
+def register_engine(name):
+    """
+    Register a solver engine to be checked against the reference.
+
+    Args:
+        name (str): Engine name used in reports and on the command line.
+    """
+    def decorator(engine):
+        ENGINES[name] = engine
+        return engine
+    return decorator
+
+
+@register_engine("dp")
+def dp_engine(categories, budget, required_categories, team_size):
+    return find_best_combination(categories, budget, required_categories, team_size)
+
+
+@register_engine("fast")
+def fast_engine(categories, budget, required_categories, team_size):
+    # without a deadline the anytime solver must end on the exact optimum
+    return approximate_best_combination(categories, budget, required_categories, team_size)[0]
+
+
+def random_case(seed, max_categories=7, max_products_per_category=6):
+    """
+    Generate a random solver case. The seed alone reproduces it.
+
+    Args:
+        seed (int): Seed of the case.
+        max_categories (int): Maximum number of categories in the catalog.
+        max_products_per_category (int): Maximum number of products per category.
+
+    Returns:
+        dict: products, budget, team_size and required_categories
+    """
+    rng = random.Random(seed)
+    category_names = rng.sample([category.value for category in ProductCategory], rng.randint(1, max_categories))
+    products = []
+    for category in category_names:
+        for _ in range(rng.randint(1, max_products_per_category)):
+            products.append({
+                "id": len(products) + 1,
+                "name": f"{category} {len(products) + 1}",
+                "category": category,
+                # few distinct prices and ratings, so ties actually happen
+                "price": rng.choice([rng.randint(1, 400), rng.randrange(50, 401, 50)]),
+                "rating": rng.choice([3.0, 3.5, 4.0, 4.5, 5.0, round(rng.uniform(1.0, 5.0), 1)]),
+            })
+    team_size = rng.randint(1, len(category_names))
+    required_categories = tuple(sorted(rng.sample(category_names, rng.randint(0, min(2, team_size)))))
+    # mostly budgets around what a team costs, so the budget actually binds
+    budget = rng.randint(0, 250 * team_size + 100)
+    return {
+        "seed": seed,
+        "products": products,
+        "budget": budget,
+        "team_size": team_size,
+        "required_categories": required_categories,
+    }
+
+
+def team_score(combination, budget):
+    """Composite score of a team (None when there is no team)"""
+    if combination is None:
+        return None
+    return composite_score(sum(p["value"] for p in combination), sum(p["price"] for p in combination), budget)
+
+
+def team_ids(combination):
+    """Sorted product ids of a team"""
+    return sorted(p["id"] for p in combination)
+
+
+def invalid_reason(combination, case):
+    """
+    Check the hard rules every team must satisfy.
+
+    Returns:
+        str: Why the team is invalid, or None if it is valid.
+    """
+    if combination is None:
+        return None
+    if len(combination) != case["team_size"]:
+        return f"team has {len(combination)} products, expected {case['team_size']}"
+    categories = [p["category"] for p in combination]
+    if len(set(categories)) != len(categories):
+        return "team repeats a category"
+    if sum(p["price"] for p in combination) > case["budget"]:
+        return "team is over budget"
+    if not set(case["required_categories"]) <= set(categories):
+        return "team misses a required category"
+    return None
+
+
+def check_case(case, engines=None):
+    """
+    Run the reference and the engines on one case.
+
+    Args:
+        case (dict): Case from random_case().
+        engines (dict): Engines to check (defaults to every registered engine).
+
+    Returns:
+        dict: reference_ms and, per engine, ok, reason, ms and speedup over the reference
+    """
+    engines = ENGINES if engines is None else engines
+    # every engine searches the same candidates, as in curate_product_team
+    categories = CatalogIndex(case["products"]).candidates(case["budget"], case["team_size"])
+    args = (categories, case["budget"], case["required_categories"], case["team_size"])
+
+    started = time.perf_counter()
+    reference = exhaustive_best_combination(*args)
+    reference_ms = (time.perf_counter() - started) * 1000
+    reference_score = team_score(reference, case["budget"])
+
+    results = {}
+    for name, engine in engines.items():
+        started = time.perf_counter()
+        try:
+            combination = engine(*args)
+            reason = invalid_reason(combination, case)
+        except Exception as exc:
+            combination, reason = None, f"raised {type(exc).__name__}: {exc}"
+        ms = (time.perf_counter() - started) * 1000
+        if reason is None:
+            score = team_score(combination, case["budget"])
+            if (score is None) != (reference_score is None):
+                reason = "no team found" if score is None else "found a team where the reference found none"
+            elif score is not None and abs(score - reference_score) > 1e-9 * max(1.0, abs(reference_score)):
+                reason = f"score {score!r} differs from the reference's {reference_score!r}"
+            elif score is not None and team_ids(combination) != team_ids(reference):
+                # every engine follows team_rank's tie-break, so ties must give the same team
+                reason = f"team {team_ids(combination)} differs from the reference's {team_ids(reference)} on a score tie"
+        results[name] = {
+            "ok": reason is None,
+            "reason": reason,
+            "ms": ms,
+            "speedup": reference_ms / ms if ms > 0 else float("inf"),
+        }
+    return {"reference_ms": reference_ms, "engines": results}
+
+
+def shrink(case, name, engine):
+    """
+    Greedily simplify a failing case while the engine keeps failing on it:
+    drop products, required categories and team members, then lower the budget.
+
+    Args:
+        case (dict): Case the engine fails on.
+        name (str): Engine name.
+        engine (callable): The failing engine.
+
+    Returns:
+        dict: A minimal failing case (no single simplification step still fails).
+    """
+    def fails(candidate):
+        return not check_case(candidate, {name: engine})["engines"][name]["ok"]
+
+    def simpler(current):
+        for i in range(len(current["products"])):
+            yield {**current, "products": current["products"][:i] + current["products"][i + 1:]}
+        for category in current["required_categories"]:
+            yield {**current, "required_categories": tuple(c for c in current["required_categories"] if c != category)}
+        if current["team_size"] > 1:
+            yield {**current, "team_size": current["team_size"] - 1}
+        for budget in (0, current["budget"] // 2, current["budget"] - 1):
+            if 0 <= budget < current["budget"]:
+                yield {**current, "budget": budget}
+
+    shrinking = True
+    while shrinking:
+        shrinking = False
+        for candidate in simpler(case):
+            if fails(candidate):
+                case, shrinking = candidate, True
+                break
+    return case
+
+
+def run(cases=500, seed=0, engines=None, verbose=False):
+    """
+    Check the engines on many random cases.
+
+    Args:
+        cases (int): Number of random cases.
+        seed (int): Seed of the first case; case i uses seed + i.
+        engines (dict): Engines to check (defaults to every registered engine).
+        verbose (bool): Print the relative speed of every case.
+
+    Returns:
+        dict: Per engine: mismatches (shrunk reproducers) and speedups over the reference
+    """
+    engines = ENGINES if engines is None else engines
+    report = {name: {"mismatches": [], "speedups": []} for name in engines}
+    for case_seed in range(seed, seed + cases):
+        case = random_case(case_seed)
+        result = check_case(case, engines)
+        for name, outcome in result["engines"].items():
+            report[name]["speedups"].append(outcome["speedup"])
+            if not outcome["ok"]:
+                minimal = shrink(case, name, engines[name])
+                reason = check_case(minimal, {name: engines[name]})["engines"][name]["reason"]
+                report[name]["mismatches"].append({"reason": reason, "case": minimal})
+        if verbose:
+            speeds = "  ".join(
+                f"{name} {outcome['speedup']:7.1f}x{'' if outcome['ok'] else ' ❌'}"
+                for name, outcome in result["engines"].items()
+            )
+            print(f"seed {case_seed:>6}  reference {result['reference_ms']:8.3f} ms  {speeds}")
+    return report
+
+
+def main(argv=None):
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Check solver engines against the brute-force reference")
+    parser.add_argument("--cases", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--engine", action="append", choices=sorted(ENGINES), help="Engine to check (repeatable)")
+    parser.add_argument("--verbose", action="store_true", help="Print the relative speed of every case")
+    args = parser.parse_args(argv)
+
+    engines = {name: ENGINES[name] for name in args.engine} if args.engine else ENGINES
+    report = run(args.cases, args.seed, engines, args.verbose)
+
+    print(f"🔬 {args.cases} random cases against the brute-force reference")
+    print("=" * 72)
+    print(f"{'engine':<12}{'mismatches':>12}{'median speedup':>18}{'min speedup':>15}")
+    failed = False
+    for name, result in report.items():
+        failed = failed or bool(result["mismatches"])
+        print(f"{name:<12}{len(result['mismatches']):>12}{statistics.median(result['speedups']):>17.1f}x"
+              f"{min(result['speedups']):>14.1f}x")
+    print("=" * 72)
+    for name, result in report.items():
+        for mismatch in result["mismatches"][:1]:
+            print(f"❌ {name}: {mismatch['reason']}. Minimal reproducer:")
+            print(json.dumps(mismatch["case"], indent=2))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
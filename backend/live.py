@@ -0,0 +1,87 @@
+import asyncio
+import json
+
+
+class LatestOnly:
+    """
+    Single-slot mailbox between the socket reader and the solver loop of a live
+    connection. put() overwrites a value that hasn't been taken yet, so while a
+    budget is being solved only the newest of the updates that arrive meanwhile is
+    answered - the ones it superseded are dropped.
+    """
+
+    def __init__(self):
+        self._value = None
+        self._pending = False
+        self._event = asyncio.Event()
+        self.dropped = 0
+
+    def put(self, value):
+        """Store a value, replacing (and counting as dropped) any value still pending."""
+        if self._pending:
+            self.dropped += 1
+        self._value = value
+        self._pending = True
+        self._event.set()
+
+    async def get(self):
+        """Wait for and take the latest value."""
+        await self._event.wait()
+        self._event.clear()
+        value, self._value, self._pending = self._value, None, False
+        return value
+
+
+def parse_budget_update(text):
+    """
+    Parse a budget update sent by a live client: {"budget": 1000, "seq": 7}, where
+    seq is an optional client counter echoed back in the answer.
+
+    Args:
+        text (str): Raw websocket message.
+
+    Returns:
+        tuple: (budget, seq)
+
+    Raises:
+        ValueError: If the message isn't a valid update.
+    """
+    try:
+        message = json.loads(text)
+    except json.JSONDecodeError:
+        raise ValueError("Message must be JSON, e.g. {\"budget\": 1000}")
+    budget = message.get("budget") if isinstance(message, dict) else None
+    # bools are ints in Python, but not budgets
+    if not isinstance(budget, int) or isinstance(budget, bool) or budget < 0:
+        raise ValueError("budget must be a non-negative integer")
+    return budget, message.get("seq")
+
+
+class TeamDiffer:
+    """
+    Per-connection view of the team last sent to a live client, used to send only
+    what changed: products added (or modified under the same id) and ids removed.
+    """
+
+    def __init__(self):
+        self.products = {}
+
+    def diff(self, team) -> dict:
+        """
+        Diff a new team against the last one sent and remember it.
+
+        Args:
+            team (list): List of Product models.
+
+        Returns:
+            dict: added products, removed ids and the ids of the full team in order
+        """
+        current = {product.id: product for product in team}
+        added = [product for product in team if self.products.get(product.id) != product]
+        removed = [product_id for product_id in self.products if product_id not in current]
+        self.products = current
+        return {
+            "added": [product.model_dump(mode="json") for product in added],
+            "removed": removed,
+            "product_ids": [product.id for product in team],
+        }
@@ -1,123 +1,888 @@
+import heapq
+import time
+from bisect import bisect_right, insort
+from itertools import islice
+from operator import itemgetter
 from typing import List
-from models import Product, ProductCategory
+from itertools import combinations #https://docs.python.org/3/library/itertools.html#itertools.combinations
+from itertools import product as itertools_product
+from models import Product, ProductCategory, SolverMode
+from constants import DEFAULT_TEAM_SIZE
+from tracing import trace_stage, trace_count
 
-def curate_product_team(products, budget) -> List[Product]:
+# For performance, the search only considers the top products (by value) from each category
+# among those that fit the budget (see CatalogIndex.candidates)
+MAX_PRODUCTS_PER_CATEGORY = 10
+
+# Bump whenever a change can make the solver return another team for the same catalog,
+# budget and constraints (scoring, candidates, tie-breaking): persisted teams are only
+# served by the solver version that solved them (see ResultStore)
+SOLVER_VERSION = 1
+
+
+class SolverDeadlineExceeded(Exception):
+    """Raised by the exact solver when it runs past its deadline."""
+
+
+class _PriceLimits:
+    """
+    Per-category price limits of a team within budget, from the cheapest product of
+    every category (min_price_by_category) - shared by indexes and restricted views.
+    """
+
+    def _index_minimums(self):
+        # category minimums in ascending order with prefix sums, for the per-category price limits
+        self._minimums = sorted((price, category) for category, price in self.min_price_by_category.items())
+        self._minimum_rank = {category: rank for rank, (_, category) in enumerate(self._minimums)}
+        self._minimum_sums = [0]
+        for price, _ in self._minimums:
+            self._minimum_sums.append(self._minimum_sums[-1] + price)
+
+    def max_affordable_prices(self, budget, team_size=DEFAULT_TEAM_SIZE) -> dict:
+        """
+        Highest price a product of each category can have and still be part of a team
+        within budget: the budget minus the cheapest products of the cheapest
+        `team_size - 1` other categories.
+
+        Args:
+            budget (float): Maximum budget allowed.
+            team_size (int): Number of products in a team.
+
+        Returns:
+            dict: Category name to price limit (empty if there are too few categories).
+        """
+        if team_size < 1 or len(self._minimums) < team_size:
+            return {}
+        limits = {}
+        for category, rank in self._minimum_rank.items():
+            if rank < team_size - 1:
+                # the category is one of the cheapest others itself, the next one takes its place
+                others = self._minimum_sums[team_size] - self._minimums[rank][0]
+            else:
+                others = self._minimum_sums[team_size - 1]
+            limits[category] = budget - others
+        return limits
+
+
+class CatalogIndex(_PriceLimits):
+    """
+    Precomputed, read-only view of a product catalog used by the solver.
+    Building it once per catalog (instead of on every request) takes the value
+    calculation, grouping and sorting off the request path.
+    """
+
+    def __init__(self, products, models=None):
+        # copy the dictionaries so the caller's catalog is never mutated
+        self.products = calculate_rating_to_price_ratio([dict(product) for product in products])
+        # validated Product models by id, shared by every response built from this index
+        self.models = {} if models is None else models
+
+        # Group products by category
+        self.categories = {}
+        for product in self.products:
+            category = product.get('category')
+            if category:
+                if category not in self.categories:
+                    self.categories[category] = []
+                self.categories[category].append(product)
+
+        # Sort products within each category by value (descending) - best value first
+        for category in self.categories:
+            self.categories[category].sort(key=lambda x: x.get('value', 0), reverse=True)
+
+        self.products_by_id = {product['id']: product for product in self.products}
+        # cheapest price per category, used to bound which budgets a product can matter for
+        self.min_price_by_category = {
+            category: min(product['price'] for product in products)
+            for category, products in self.categories.items()
+        }
+        self._index_minimums()
+        # per category: products by ascending price with their rank in the value order,
+        # so the affordable ones are a prefix found by bisection
+        self._by_price = {}
+        self._prices = {}
+        self._top_max_price = {}
+        for category, products in self.categories.items():
+            self._by_price[category] = sorted(enumerate(products), key=lambda item: item[1]['price'])
+            self._prices[category] = [product['price'] for _, product in self._by_price[category]]
+            self._top_max_price[category] = max(p['price'] for p in products[:MAX_PRODUCTS_PER_CATEGORY])
+        self._candidate_ids = {}
+
+    def restricted(self, constraints):
+        """
+        View of this index with only the products allowed by the constraints, for one
+        request. Nothing is copied or re-sorted: the filters are applied while picking
+        the candidates, so an excluded product's slot goes to the next best product of
+        its category.
+
+        Args:
+            constraints (TeamConstraints): Restrictions to apply (None for no restrictions).
+
+        Returns:
+            CatalogIndex or RestrictedIndex: This index if no product is filtered out,
+                otherwise a restricted view of it.
+        """
+        if not filters_products(constraints):
+            return self
+        return RestrictedIndex(self, constraints)
+
+    def filtered(self, constraints):
+        """
+        Full index of the products allowed by the constraints (product copies, values
+        and sorts are rebuilt). For the rare callers that need the whole CatalogIndex
+        API on the filtered catalog, like team cache migration - requests use restricted().
+
+        Args:
+            constraints (TeamConstraints): Restrictions to apply (None for no restrictions).
+
+        Returns:
+            CatalogIndex: This index if no product is filtered out, otherwise a new index.
+        """
+        if not filters_products(constraints):
+            return self
+        return CatalogIndex([product for product in self.products if constraints.allows(product)], self.models)
+
+    def model(self, product):
+        """
+        The shared, immutable Product model of a product of this index, validated on
+        first use. Concurrent first uses may both validate; either result is equal.
+
+        Args:
+            product (dict): Product dictionary from this index.
+
+        Returns:
+            Product: The product's model.
+        """
+        model = self.models.get(product['id'])
+        if model is None:
+            model = self.models[product['id']] = product_model(product)
+        return model
+
+    def build_models(self, previous=None, changed_ids=()):
+        """
+        Validate every product model up front, so no request pays for it.
+
+        Args:
+            previous (CatalogIndex): Index of the previous catalog version, whose
+                models are reused for the products that didn't change.
+            changed_ids (iterable): Ids of the products changed since `previous`.
+        """
+        changed_ids = set(changed_ids)
+        for product in self.products:
+            model = None
+            if previous is not None and product['id'] not in changed_ids:
+                model = previous.models.get(product['id'])
+            self.models[product['id']] = model if model is not None else product_model(product)
+
+    def candidates(self, budget, team_size=DEFAULT_TEAM_SIZE) -> dict:
+        """
+        Products the search considers for a budget: per category, the top products by
+        value among those under the category's price limit (max_affordable_prices).
+        Products that can't be in any team within budget are bisected away before the
+        top products are picked, so they never take a better affordable product's slot.
+        Same result as candidate_products(self.categories, budget, team_size).
+
+        Args:
+            budget (float): Maximum budget allowed.
+            team_size (int): Number of products in a team.
+
+        Returns:
+            dict: Category name to candidate products, best value first.
+        """
+        limits = self.max_affordable_prices(budget, team_size)
+        return {
+            category: self.top_affordable(category, limits.get(category, float('-inf')))
+            for category in self.categories
+        }
+
+    def top_affordable(self, category, limit, allows=None) -> list:
+        """
+        The top products by value of a category among those priced at most `limit`
+        (and passing `allows`, if given), from the prebuilt value and price orders.
+
+        Args:
+            category (str): Category name.
+            limit (float): Highest price allowed.
+            allows (callable): Optional product filter, e.g. TeamConstraints.allows.
+
+        Returns:
+            list: Up to MAX_PRODUCTS_PER_CATEGORY products, best value first.
+        """
+        products = self.categories[category]
+        if allows is None and self._top_max_price[category] <= limit:
+            # high budgets: the top products all fit, nothing to filter
+            return products[:MAX_PRODUCTS_PER_CATEGORY]
+        affordable = bisect_right(self._prices[category], limit)
+        # walking the value order takes ~MAX * len / affordable steps, the price prefix ~affordable
+        if affordable * affordable >= MAX_PRODUCTS_PER_CATEGORY * len(products):
+            # enough products fit: walk the value order until the slots are filled
+            top = []
+            for product in products:
+                if product['price'] <= limit and (allows is None or allows(product)):
+                    top.append(product)
+                    if len(top) == MAX_PRODUCTS_PER_CATEGORY:
+                        break
+            return top
+        # few products fit: pick the best ranked of the affordable price prefix
+        prefix = islice(self._by_price[category], affordable)
+        if allows is not None:
+            prefix = (item for item in prefix if allows(item[1]))
+        return [product for _, product in heapq.nsmallest(MAX_PRODUCTS_PER_CATEGORY, prefix, key=itemgetter(0))]
+
+    def candidate_ids(self, category) -> set:
+        """
+        Ids of the products of a category that are candidates at some budget. A product
+        never is when at least MAX_PRODUCTS_PER_CATEGORY better-value products of its
+        category cost no more: they are affordable whenever it is, and fill the slots.
+        """
+        ids = self._candidate_ids.get(category)
+        if ids is None:
+            ids = set()
+            cheaper_or_equal = []
+            for product in self.categories.get(category, []):
+                if bisect_right(cheaper_or_equal, product['price']) < MAX_PRODUCTS_PER_CATEGORY:
+                    ids.add(product['id'])
+                insort(cheaper_or_equal, product['price'])
+            self._candidate_ids[category] = ids
+        return ids
+
+    def feasibility_threshold(self, product_id, team_size=DEFAULT_TEAM_SIZE) -> float:
+        """
+        Lowest budget at which the product can be part of any feasible team: its own
+        price plus the cheapest products of the cheapest other categories.
+
+        Args:
+            product_id (int): Id of the product.
+            team_size (int): Number of products in a team.
+
+        Returns:
+            float: The threshold budget, or infinity if no team can contain the product.
+        """
+        product = self.products_by_id.get(product_id)
+        if product is None:
+            return float('inf')
+        other_minimums = sorted(
+            price for category, price in self.min_price_by_category.items()
+            if category != product['category']
+        )
+        if len(other_minimums) < team_size - 1:
+            return float('inf')
+        return product['price'] + sum(other_minimums[:team_size - 1])
+
+
+class RestrictedIndex(_PriceLimits):
+    """
+    Per-request view of a CatalogIndex restricted by TeamConstraints. Only the cheapest
+    allowed product of each category is looked up up front; the other filters are
+    applied by CatalogIndex.top_affordable while the candidates are picked.
+    """
+
+    def __init__(self, index, constraints):
+        """
+        Args:
+            index (CatalogIndex): The catalog index.
+            constraints (TeamConstraints): Restrictions on the products.
+        """
+        self.index = index
+        self.constraints = constraints
+        # cheapest allowed price per category (categories with no allowed product are left out)
+        self.min_price_by_category = {}
+        for category, by_price in index._by_price.items():
+            for _, product in by_price:
+                if constraints.max_item_price is not None and product['price'] > constraints.max_item_price:
+                    break
+                if constraints.allows(product):
+                    self.min_price_by_category[category] = product['price']
+                    break
+        self._index_minimums()
+
+    def restricted(self, constraints):
+        """This view for its own constraints, otherwise a view of the underlying index."""
+        return self if constraints == self.constraints else self.index.restricted(constraints)
+
+    def model(self, product):
+        """The shared Product model of a product (see CatalogIndex.model)."""
+        return self.index.model(product)
+
+    def candidates(self, budget, team_size=DEFAULT_TEAM_SIZE) -> dict:
+        """
+        Allowed products the search considers for a budget, like CatalogIndex.candidates
+        with the price limits of the restricted catalog.
+
+        Args:
+            budget (float): Maximum budget allowed.
+            team_size (int): Number of products in a team.
+
+        Returns:
+            dict: Category name to candidate products, best value first.
+        """
+        limits = self.max_affordable_prices(budget, team_size)
+        max_item_price = self.constraints.max_item_price
+        candidates = {}
+        for category in self.min_price_by_category:
+            limit = limits.get(category, float('-inf'))
+            if max_item_price is not None:
+                limit = min(limit, max_item_price)
+            candidates[category] = self.index.top_affordable(category, limit, self.constraints.allows)
+        return candidates
+
+
+def filters_products(constraints) -> bool:
+    """Whether the constraints filter out products (not just shape the team)."""
+    return constraints is not None and bool(
+        constraints.exclude_ids or constraints.max_item_price is not None or constraints.min_rating is not None
+    )
+
+
+def affected_budget_floor(old_index, new_index, changed_ids, team_size=DEFAULT_TEAM_SIZE) -> float:
+    """
+    Find the lowest budget whose best team may differ between two versions of a catalog.
+
+    The best team for a budget only depends on the products that can appear in a
+    feasible team at that budget and that make the per-category candidate cut.
+    A changed product (or one pushed in or out of the cut by the change) therefore
+    only matters from its feasibility threshold upwards, in either version.
+    Results for every budget below the returned floor can be reused as-is.
+
+    Args:
+        old_index (CatalogIndex): Index of the catalog before the update.
+        new_index (CatalogIndex): Index of the catalog after the update.
+        changed_ids (iterable): Ids of products added, removed or modified.
+        team_size (int): Number of products in a team.
+
+    Returns:
+        float: Lowest affected budget (0 if everything is affected, infinity if nothing is).
+    """
+    if set(old_index.categories) != set(new_index.categories):
+        # category set changed - the combinations searched are different everywhere
+        return 0
+
+    floor = float('inf')
+    changed_ids = set(changed_ids)
+    for category in new_index.categories:
+        old_candidates = old_index.candidate_ids(category)
+        new_candidates = new_index.candidate_ids(category)
+        # changed products that are searched at all, plus products the change moved across the cut
+        relevant = ((old_candidates | new_candidates) & changed_ids) | (old_candidates ^ new_candidates)
+        for product_id in relevant:
+            if product_id in old_candidates:
+                floor = min(floor, old_index.feasibility_threshold(product_id, team_size))
+            if product_id in new_candidates:
+                floor = min(floor, new_index.feasibility_threshold(product_id, team_size))
+    return floor
+
+
+def curate_product_team(products, budget, constraints=None, mode=SolverMode.exact, deadline_ms=None, report=None, trace=None) -> List[Product]:
     """
     Curate product teams based on the provided budget.
-    Selects 5 products from 5 distinct categories, staying within budget
-    and optimized for the highest "value" (rating to price ratio).
+    Selects one product from each of `team_size` distinct categories (5 by default),
+    staying within budget and optimized for the highest "value" (rating to price ratio).
 
     Args:
-        products (list): List of product dictionaries.
+        products (list or CatalogIndex): List of product dictionaries, or a prebuilt index
+            (possibly already restricted by the same constraints).
         budget (float): The budget amount for building the team.
+        constraints (TeamConstraints): Optional restrictions (team size, required categories,
+            excluded products, max price per item, minimum rating).
+        mode (SolverMode): "exact" for the optimal team, "fast" for the anytime solver
+            that returns the best team found within deadline_ms.
+        deadline_ms (float): Time budget of the fast mode in milliseconds.
+        report (SolveReport): Optional report filled in with the solve quality.
+        trace (SolverTrace): Optional trace that records the work done and time per stage.
 
     Returns:
         list: List of curated Product models within the budget.
     """
-    # First, ensure all products have a 'value' field calculated
-    products_with_value = calculate_rating_to_price_ratio(products.copy()) #ideally don't do this step every time we call endpoint - but working with sample data here so it's ok
-    
-    # Group products by category
-    categories = {}
-    for product in products_with_value:
-        category = product.get('category')
-        if category:
-            if category not in categories:
-                categories[category] = []
-            categories[category].append(product)
-
-    # Check if we have at least 5 distinct categories
-    if len(categories) < 5:
-        # If we don't have 5 categories, return empty list or handle gracefully
+    started = time.perf_counter()
+    if report is not None:
+        report.mode = mode
+        report.proven_optimal = True
+        report.optimality_gap = 0.0
+
+    with trace_stage(trace, "filter"):
+        # reuse the prebuilt index (or the request's restricted view of it) when we get one,
+        # otherwise index the raw list now
+        index = products if isinstance(products, (CatalogIndex, RestrictedIndex)) else CatalogIndex(products)
+        index = index.restricted(constraints)
+        team_size = constraints.team_size if constraints else DEFAULT_TEAM_SIZE
+        # drop disallowed products, then the ones no team within budget can contain,
+        # so the search never enumerates them
+        categories = index.candidates(budget, team_size)
+        trace_count(trace, "candidates", sum(len(products) for products in categories.values()))
+    required_categories = constraints.required_categories if constraints else ()
+
+    # Check if we have enough distinct categories for the team
+    if len(categories) < team_size:
+        # If we don't have enough categories, return empty list or handle gracefully
         # possibility to return a message or raise an exception, or repeat a category
         return []
+
+    if any(not categories.get(category) for category in required_categories):
+        # a required category has no product left after filtering
+        return []
     
-    # Sort products within each category by value (descending) - best value first
-    for category in categories:
-        categories[category].sort(key=lambda x: x.get('value', 0), reverse=True)
-    
-    # Use dynamic programming approach to break down the logic to find the best combination
-    # that stays within budget and maximizes total value
-    best_combination = find_best_combination(categories, budget)
+    if mode == SolverMode.fast:
+        deadline = started + deadline_ms / 1000 if deadline_ms is not None else None
+        with trace_stage(trace, "search"):
+            best_combination, upper_bound, proven_optimal = approximate_best_combination(
+                categories, budget, required_categories, team_size, deadline, trace
+            )
+        if report is not None and best_combination:
+            value_weight, cost_weight = score_weights(budget)
+            score = sum(value_weight * p['value'] + cost_weight * p['price'] for p in best_combination)
+            report.proven_optimal = proven_optimal
+            report.optimality_gap = 0.0 if proven_optimal else max(0.0, (upper_bound - score) / upper_bound)
+    else:
+        # Use dynamic programming approach to break down the logic to find the best combination
+        # that stays within budget and maximizes total value
+        with trace_stage(trace, "search"):
+            best_combination = find_best_combination(categories, budget, required_categories, team_size, trace=trace)
+
+    if report is not None:
+        report.elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
     
     if not best_combination:
         return []
     
-    # Convert dictionaries to Product models
-    curated_team = []
-    for product_dict in best_combination:
-        curated_team.append(
-            Product(
-                id=product_dict['id'],
-                name=product_dict['name'],
-                price=product_dict['price'],
-                rating=product_dict['rating'],
-                description=product_dict.get('description'),
-                category=ProductCategory(product_dict['category']) if 'category' in product_dict else None,
-                value=product_dict.get('value')
-            )
-        )
+    # Look up the Product models (validated once per catalog version)
+    with trace_stage(trace, "build_models"):
+        curated_team = [index.model(product_dict) for product_dict in best_combination]
     
     return curated_team
 
 
-def find_best_combination(categories, budget):
+def product_model(product_dict) -> Product:
     """
-    Find the best combination of 5 products (one from each of 5 categories)
+    Convert a product dictionary of an index to its Product model.
+
+    Args:
+        product_dict (dict): Product dictionary, with its value calculated.
+
+    Returns:
+        Product: The validated model.
+    """
+    return Product(
+        id=product_dict['id'],
+        name=product_dict['name'],
+        price=product_dict['price'],
+        rating=product_dict['rating'],
+        description=product_dict.get('description'),
+        category=ProductCategory(product_dict['category']) if 'category' in product_dict else None,
+        value=product_dict.get('value')
+    )
+
+
+# highest budgets of the low and medium tiers of score_weights - the cost weight jumps
+# up at each tier boundary, so the best team can change back at a higher budget
+SCORE_TIER_LIMITS = (500, 1000)
+
+
+def score_weights(budget):
+    """
+    Weights of the composite score for a budget, which is linear in the team's
+    total value and total cost: score = value_weight * value + cost_weight * cost.
+
+    Dynamic weighting based on budget level
+    Low budgets: focus more on pure value (rating/price)
+    High budgets: balance value with utilizing more of the budget for quality
+
+    Args:
+        budget (float): Maximum budget allowed
+
+    Returns:
+        tuple: (value_weight, cost_weight)
+    """
+    if budget <= 500:
+        # Low budget: prioritize value, with only a small bonus for using more of the budget.
+        return 1.0, (0.5 / budget if budget > 0 else 0)
+    elif budget <= 1000:
+        # Medium budget: balance value and budget utilization
+        return 0.7, 2 / budget
+    else:
+        # High budget: prioritize spending more of the budget for quality
+        return 0.5, 3 / budget + 1 / 100
+
+
+def composite_score(total_value, total_cost, budget):
+    """
+    Calculate a composite score that balances value and budget utilization.
+    Higher budgets should prefer higher-cost, higher-quality items.
+
+    Args:
+        total_value (float): Sum of the products' values
+        total_cost (int): Sum of the products' prices
+        budget (float): Maximum budget allowed
+
+    Returns:
+        float: The score of the combination (higher is better)
+    """
+    budget_utilization = total_cost / budget if budget > 0 else 0 # = 1 if cost is equal to budget, and for higher budgets this will be > 1
+
+    if budget <= 500:
+        return total_value + (budget_utilization * 0.5)
+    elif budget <= 1000:
+        return (total_value * 0.7) + (budget_utilization * 2)
+    else:
+        return (total_value * 0.5) + (budget_utilization * 3) + (total_cost / 100)
+
+
+# gains are summed in integer units of 2**-40 so that every engine gets exactly the same
+# score for a team, whatever order it adds the products in
+SCORE_UNITS = 2 ** 40
+
+
+def gain_units(product, weights) -> int:
+    """
+    Score contribution of a product in SCORE_UNITS.
+
+    Args:
+        product (dict): Product with its price and value
+        weights (tuple): (value_weight, cost_weight) from score_weights
+
+    Returns:
+        int: The product's share of a team's composite score
+    """
+    value_weight, cost_weight = weights
+    return round((value_weight * product['value'] + cost_weight * product['price']) * SCORE_UNITS)
+
+
+def tie_break(product_ids) -> tuple:
+    """
+    Tie-break key of a team: of two teams of the same size and score, the one whose
+    sorted product ids come first wins. Negated so that the larger key wins, like the
+    score. Adding the same products to two partial teams doesn't change which one
+    wins, so the dynamic program can prune on it.
+
+    Args:
+        product_ids (iterable): Ids of the team's products
+
+    Returns:
+        tuple: Key that is larger for the winning team
+    """
+    return tuple(-product_id for product_id in sorted(product_ids))
+
+
+def team_rank(combination, budget) -> tuple:
+    """
+    Rank of a team that every solver engine maximizes, so that they all return the
+    same team: the composite score in SCORE_UNITS, then the tie_break of its ids.
+
+    Args:
+        combination (list): Product dictionaries of the team
+        budget (float): Maximum budget allowed
+
+    Returns:
+        tuple: (score units, tie-break key), higher is better
+    """
+    weights = score_weights(budget)
+    return sum(gain_units(p, weights) for p in combination), tie_break(p['id'] for p in combination)
+
+
+def picks_tie_break(picks) -> tuple:
+    """tie_break of a partial team of find_best_combination, a (product, previous picks) linked list"""
+    product_ids = []
+    while picks is not None:
+        product, picks = picks
+        product_ids.append(product['id'])
+    return tie_break(product_ids)
+
+
+def find_best_combination(categories, budget, required_categories=(), team_size=DEFAULT_TEAM_SIZE, deadline=None, trace=None):
+    """
+    Find the best combination of `team_size` products (one from each of `team_size` categories)
     that balances value optimization with budget utilization.
     Higher budgets will prefer more expensive, higher-quality items.
+
+    Because the composite score is linear in total value and total cost (see score_weights),
+    each product contributes independently and the search is a dynamic program over the
+    categories: after each category we keep, for every number of products picked so far,
+    only the partial teams that are not dominated (no other partial team is at most as
+    expensive and scores at least as well). Work grows linearly with the team size and
+    the number of categories, instead of with C(categories, team_size) * 10^team_size.
+    Teams are ranked by team_rank, so ties go to the same team as in the other engines.
     
     Args:
-        categories (dict): Dictionary mapping category names to lists of products
+        categories (dict): Dictionary mapping category names to their candidate products
+            (see CatalogIndex.candidates) - every product given is searched
         budget (float): Maximum budget allowed
+        required_categories (tuple): Category names every combination must include
+        team_size (int): Number of products (and categories) in the team
+        deadline (float): Optional time.perf_counter() value; SolverDeadlineExceeded is
+            raised if the search is still running by then
+        trace (SolverTrace): Optional trace counting partial teams generated and pruned
     
     Returns:
-        list: List of 5 product dictionaries representing the best combination
+        list: List of `team_size` product dictionaries representing the best combination
     """
+    weights = score_weights(budget)
     category_names = list(categories.keys())
+    required = set(required_categories)
+
+    # products over the whole budget can't be in any team, the others with their gain
+    candidates = [
+        [(p, gain_units(p, weights)) for p in categories[category] if p['price'] <= budget]
+        for category in category_names
+    ]
+    trace_count(trace, "categories_considered", len(category_names))
+    trace_count(trace, "products_considered", sum(len(products) for products in candidates))
+
+    # cheapest_completion[i][m]: cheapest way to pick m more products from categories i onwards
+    cheapest_completion = []
+    for i in range(len(category_names) + 1):
+        minimums = sorted(min(p['price'] for p, _ in products) for products in candidates[i:] if products)
+        sums = [0]
+        for price in minimums[:team_size]:
+            sums.append(sums[-1] + price)
+        cheapest_completion.append(sums)
+
+    # layers[j]: partial teams with j products as (cost, score units, picks), picks is a
+    # linked list (product, previous picks) so extending a team doesn't copy it
+    layers = [[(0, 0, None)]] + [[] for _ in range(team_size)]
+    for i, category in enumerate(category_names):
+        products = candidates[i]
+        # skipping a required category is not allowed
+        new_layers = [[] for _ in layers] if category in required else [list(layer) for layer in layers]
+        for j in range(team_size):
+            if deadline is not None and time.perf_counter() > deadline:
+                raise SolverDeadlineExceeded()
+            trace_count(trace, "combinations_enumerated", len(layers[j]) * len(products))
+            for cost, score, picks in layers[j]:
+                for product, gain in products:
+                    new_cost = cost + product['price']
+                    if new_cost <= budget:
+                        new_layers[j + 1].append((new_cost, score + gain, (product, picks)))
+
+        for j, layer in enumerate(new_layers):
+            # drop partial teams that can no longer be completed within budget
+            needed = team_size - j
+            completion = cheapest_completion[i + 1]
+            if needed >= len(completion):
+                new_layers[j] = []
+                continue
+            slack = budget - completion[needed]
+            layer.sort(key=lambda state: (state[0], -state[1]))
+            frontier = []
+            best_tie_break = None
+            for state in layer:
+                if state[0] > slack:
+                    break
+                if frontier and state[1] < frontier[-1][1]:
+                    continue
+                if frontier and state[1] == frontier[-1][1]:
+                    # as good as a cheaper partial team: only kept if it wins the tie
+                    if best_tie_break is None:
+                        best_tie_break = picks_tie_break(frontier[-1][2])
+                    state_tie_break = picks_tie_break(state[2])
+                    if state_tie_break <= best_tie_break:
+                        continue
+                    best_tie_break = state_tie_break
+                else:
+                    best_tie_break = None
+                frontier.append(state)
+            trace_count(trace, "combinations_pruned", len(layer) - len(frontier))
+            new_layers[j] = frontier
+        layers = new_layers
+
+    if not layers[team_size]:
+        return None
+    best_cost, best_score, picks = max(layers[team_size], key=lambda state: (state[1], picks_tie_break(state[2])))
+    if best_score <= 0:
+        return None
+
+    best_combination = []
+    while picks is not None:
+        product, picks = picks
+        best_combination.append(product)
+    best_combination.reverse()
+    return best_combination
+
+
+def approximate_best_combination(categories, budget, required_categories=(), team_size=DEFAULT_TEAM_SIZE, deadline=None, trace=None):
+    """
+    Anytime solver: quickly finds a good team and keeps improving it until the deadline.
+
+    1. Greedy seed: repeatedly add the product with the best score contribution that
+       still leaves enough budget to fill the remaining slots with the cheapest products.
+    2. Local search: apply the best improving swap (another product of the same category,
+       or a product of an unused category) until no swap helps or the deadline passes.
+    3. If time is left, run the exact solver with the remaining time - if it finishes,
+       the result is proven optimal and, among teams with the same score, the team
+       every engine picks (see team_rank). A team reaching the upper bound is already
+       optimal, but may not be the one that wins the tie.
+
+    The upper bound ignores how the budget is shared between categories, so it is
+    always at least the optimal score and bounds how far the returned team can be from it.
+
+    Args:
+        categories (dict): Dictionary mapping category names to their candidate products
+            (see CatalogIndex.candidates)
+        budget (float): Maximum budget allowed
+        required_categories (tuple): Category names every combination must include
+        team_size (int): Number of products (and categories) in the team
+        deadline (float): time.perf_counter() value by which to return (None for no limit)
+        trace (SolverTrace): Optional trace counting local search moves
+
+    Returns:
+        tuple: (list of product dictionaries or None, upper bound on the score, proven optimal flag)
+    """
+    value_weight, cost_weight = score_weights(budget)
+
+    def gain(product):
+        return value_weight * product['value'] + cost_weight * product['price']
+
+    required = set(required_categories)
+    candidates = {}
+    for category, products in categories.items():
+        affordable = [p for p in products if p['price'] <= budget]
+        if affordable:
+            candidates[category] = affordable
+    if len(candidates) < team_size or len(required) > team_size or any(c not in candidates for c in required):
+        # no team can be formed at all - trivially optimal
+        return None, 0.0, True
+
+    # Upper bound: best contribution per category without sharing the budget, and
+    # best value per category plus the whole budget as cost - whichever is tighter
+    def best_selection(per_category):
+        optional = sorted((score for c, score in per_category.items() if c not in required), reverse=True)
+        return sum(per_category[c] for c in required) + sum(optional[:team_size - len(required)])
+    upper_bound = min(
+        best_selection({c: max(gain(p) for p in ps) for c, ps in candidates.items()}),
+        best_selection({c: max(value_weight * p['value'] for p in ps) for c, ps in candidates.items()})
+        + cost_weight * budget,
+    )
+
+    cheapest = {c: min(p['price'] for p in ps) for c, ps in candidates.items()}
+
+    def completion_cost(used, slots):
+        # cheapest way to fill the remaining slots from unused categories, honouring required ones
+        required_left = [cheapest[c] for c in required if c not in used]
+        others = sorted(cheapest[c] for c in candidates if c not in used and c not in required)
+        if len(required_left) > slots or len(others) < slots - len(required_left):
+            return float('inf')
+        return sum(required_left) + sum(others[:slots - len(required_left)])
+
+    # 1. Greedy seed
+    team = {}
+    cost = 0
+    for step in range(team_size):
+        slots_after = team_size - step - 1
+        best = None
+        for category, products in candidates.items():
+            if category in team:
+                continue
+            room = budget - cost - completion_cost(set(team) | {category}, slots_after)
+            for product in products:
+                if product['price'] <= room and (best is None or gain(product) > gain(best[1])):
+                    best = (category, product)
+        if best is None:
+            # even the cheapest team doesn't fit
+            return None, upper_bound, True
+        team[best[0]] = best[1]
+        cost += best[1]['price']
+
+    # 2. Local search with best-improvement swaps
+    improved = True
+    while improved and (deadline is None or time.perf_counter() < deadline):
+        improved = False
+        best_move = None
+        best_delta = 1e-12
+        for category, current in team.items():
+            # replace within the category, or move the slot to an unused category
+            options = [category] if category in required else [category] + [c for c in candidates if c not in team]
+            for new_category in options:
+                for product in candidates[new_category]:
+                    delta = gain(product) - gain(current)
+                    if delta > best_delta and cost - current['price'] + product['price'] <= budget:
+                        best_move, best_delta = (category, new_category, product), delta
+        if best_move is not None:
+            trace_count(trace, "local_search_moves")
+            category, new_category, product = best_move
+            cost += product['price'] - team.pop(category)['price']
+            team[new_category] = product
+            improved = True
+
+    # keep the team in category order, like the exact solver
+    combination = [team[category] for category in categories if category in team]
+    score = sum(gain(product) for product in combination)
+    proven_optimal = score >= upper_bound - 1e-12
+
+    # 3. Exact solve with whatever time is left
+    if deadline is None or time.perf_counter() < deadline:
+        try:
+            exact = find_best_combination(categories, budget, required_categories, team_size, deadline, trace)
+        except SolverDeadlineExceeded:
+            exact = None
+        if exact:
+            exact_score = sum(gain(product) for product in exact)
+            return exact, exact_score, True
+
+    return combination, upper_bound, proven_optimal
+
+
+def exhaustive_best_combination(categories, budget, required_categories=(), team_size=DEFAULT_TEAM_SIZE, trace=None):
+    """
+    Reference implementation of find_best_combination: tries every combination of
+    `team_size` categories and every combination of their candidate products.
+    Exponential in the team size - only use it for small inputs (tests, benchmarks).
+    
+    Args:
+        categories (dict): Dictionary mapping category names to their candidate products
+            (see CatalogIndex.candidates)
+        budget (float): Maximum budget allowed
+        required_categories (tuple): Category names every combination must include
+        team_size (int): Number of products (and categories) in the team
+        trace (SolverTrace): Optional trace counting subsets and combinations
     
-    # Try all combinations of 5 categories from available categories
-    from itertools import combinations #https://docs.python.org/3/library/itertools.html#itertools.combinations
+    Returns:
+        list: List of `team_size` product dictionaries representing the best combination
+    """
+    category_names = list(categories.keys())
     
     best_combination = None
-    best_score = 0
+    best_rank = None
     
-    # Try all possible combinations of 5 categories
-    for selected_categories in combinations(category_names, 5):
+    # Try all possible combinations of team_size categories
+    for selected_categories in category_combinations(category_names, team_size, required_categories):
+        trace_count(trace, "subsets_considered")
         # For each combination of categories, find the best product from each
-        combination = find_best_products_for_categories(categories, selected_categories, budget)
+        combination = find_best_products_for_categories(categories, selected_categories, budget, trace)
         
         # test each combination to see if it fits within budget
         if combination:
-            # Calculate total cost and value for this combination
-            total_cost = sum(product['price'] for product in combination)
-            total_value = sum(product.get('value', 0) for product in combination)
+            # Rank this combination like every other engine does (score, then tie-break)
+            rank = team_rank(combination, budget)
             
-            # Calculate a composite score that balances value and budget utilization
-            # Higher budgets should prefer higher-cost, higher-quality items
-            budget_utilization = total_cost / budget if budget > 0 else 0 # = 1 if cost is equal to budget, and for higher budgets this will be > 1
-            
-            # Dynamic weighting based on budget level
-            # Low budgets: focus more on pure value (rating/price)
-            # High budgets: balance value with utilizing more of the budget for quality
-            if budget <= 500:
-                # Low budget: prioritize value, with only a small bonus for using more of the budget.
-                composite_score = total_value + (budget_utilization * 0.5)
-            elif budget <= 1000:
-                # Medium budget: balance value and budget utilization
-                composite_score = (total_value * 0.7) + (budget_utilization * 2)
-            else:
-                # High budget: prioritize spending more of the budget for quality
-                composite_score = (total_value * 0.5) + (budget_utilization * 3) + (total_cost / 100)
-            
-            if composite_score > best_score:
-                best_score = composite_score
+            if best_rank is None or rank > best_rank:
+                best_rank = rank
                 best_combination = combination
     
     return best_combination
 
 
-def find_best_products_for_categories(categories, selected_categories, budget):
+def category_combinations(category_names, size, required_categories=()):
+    """
+    Generate the combinations of categories to search, in the order of category_names.
+    Required categories are fixed up front and only the remaining slots are enumerated,
+    so C(n - r, size - r) subsets are generated instead of filtering C(n, size).
+
+    Args:
+        category_names (list): Available category names.
+        size (int): Number of categories per combination.
+        required_categories (tuple): Category names that must be in every combination.
+
+    Yields:
+        tuple: Category names of one combination.
+    """
+    required = set(required_categories)
+    optional = [category for category in category_names if category not in required]
+    if len(required) > size:
+        return
+    for chosen in combinations(optional, size - len(required)):
+        chosen = set(chosen)
+        yield tuple(category for category in category_names if category in required or category in chosen)
+
+
+def find_best_products_for_categories(categories, selected_categories, budget, trace=None):
     """
     Find the best product from each selected category that fits within budget.
     Uses exhaustive search to test all possible combinations and find the one
@@ -128,52 +893,81 @@ def find_best_products_for_categories(categories, selected_categories, budget):
 
     Args:
         categories (dict): Dictionary mapping category names to lists of products
-        selected_categories (tuple): Tuple of 5 category names
+        selected_categories (tuple): Tuple of category names
         budget (float): Maximum budget allowed
+        trace (SolverTrace): Optional trace counting combinations enumerated and pruned
     
     Returns:
-        list: List of 5 products (one from each category) or None if impossible
+        list: List of products (one from each category) or None if impossible
     """
     # Get all possible combinations by taking products from each category
     category_products = [categories[cat] for cat in selected_categories]
     
     # Use iterative approach to find best combination within budget
     best_combination = None
-    best_score = 0
+    best_rank = None
     
-    # For performance, limit to top products from each category
-    MAX_PRODUCTS_PER_CATEGORY = 10
-    limited_products = [cat_products[:MAX_PRODUCTS_PER_CATEGORY] for cat_products in category_products]
+    # the candidates given are already limited to the top products of each category
+    limited_products = category_products
+
+    # Prune before enumerating: a product can only be in a team if its price plus the
+    # cheapest candidate of every other selected category fits the budget
+    cheapest = [min((p['price'] for p in cat_products), default=0) for cat_products in limited_products]
+    cheapest_total = sum(cheapest)
+    if cheapest_total > budget:
+        trace_count(trace, "subsets_pruned")
+        return None
+    considered = sum(len(cat_products) for cat_products in limited_products)
+    limited_products = [
+        [p for p in cat_products if p['price'] <= budget - (cheapest_total - cheapest[i])]
+        for i, cat_products in enumerate(limited_products)
+    ]
+    trace_count(trace, "products_pruned", considered - sum(len(cat_products) for cat_products in limited_products))
     
-    # 1. itertools_product(*limited_products) generates ALL possible combinations of products (one from each of the 5 selected categories)
+    # 1. itertools_product(*limited_products) generates ALL possible combinations of products (one from each of the selected categories)
     # 2. For each complete combination, it checks if the total cost is within budget
     # 3. If within budget, it calculates a composite score and keeps track of the best one found so far
-    from itertools import product as itertools_product
-    
     for combination in itertools_product(*limited_products):
+        trace_count(trace, "combinations_enumerated")
         total_cost = sum(product['price'] for product in combination)
-        if total_cost <= budget:
-            total_value = sum(product.get('value', 0) for product in combination)
-            # repeated code, should be refactored into a function
-            budget_utilization = total_cost / budget if budget > 0 else 0
+        if total_cost > budget:
+            trace_count(trace, "combinations_pruned")
+        else:
+            rank = team_rank(combination, budget)
             
-            # Use the same scoring logic as the parent function
-            if budget <= 500:
-                # Low budget: prioritize value
-                composite_score = total_value + (budget_utilization * 0.5)
-            elif budget <= 1000:
-                # Medium budget: balance value and budget utilization
-                composite_score = (total_value * 0.7) + (budget_utilization * 2)
-            else:
-                # High budget: prioritize budget utilization for quality
-                composite_score = (total_value * 0.5) + (budget_utilization * 3) + (total_cost / 100)
-            
-            if composite_score > best_score:
-                best_score = composite_score
+            # only teams with a positive score count, ties go to team_rank's tie-break
+            if rank[0] > 0 and (best_rank is None or rank > best_rank):
+                best_rank = rank
                 best_combination = list(combination)
     
     return best_combination
 
+def candidate_products(categories, budget, team_size=DEFAULT_TEAM_SIZE) -> dict:
+    """
+    Reference implementation of CatalogIndex.candidates by a linear scan: per category,
+    the top MAX_PRODUCTS_PER_CATEGORY products by value whose price leaves room for the
+    cheapest products of the cheapest `team_size - 1` other categories.
+
+    Args:
+        categories (dict): Dictionary mapping category names to products sorted by value (descending)
+        budget (float): Maximum budget allowed
+        team_size (int): Number of products in a team
+
+    Returns:
+        dict: Category name to candidate products, best value first
+    """
+    minimums = {category: min(p['price'] for p in products) for category, products in categories.items() if products}
+    candidates = {}
+    for category, products in categories.items():
+        others = sorted(price for other, price in minimums.items() if other != category)[:team_size - 1]
+        if len(others) < team_size - 1:
+            candidates[category] = []
+            continue
+        limit = budget - sum(others)
+        candidates[category] = [p for p in products if p['price'] <= limit][:MAX_PRODUCTS_PER_CATEGORY]
+    return candidates
+
+
 def calculate_rating_to_price_ratio(products):
     """
     Calculate the rating to price ratio for each product.
@@ -192,59 +986,49 @@ def calculate_rating_to_price_ratio(products):
     
     return products
 
-def lowest_price_combination(products):
+def lowest_price_combination(products, constraints=None, trace=None):
     """
-    Find the total price of the cheapest combination of 5 products from 5 distinct categories.
-    This represents the minimum budget required to form any team.
+    Find the total price of the cheapest combination of `team_size` products (5 by default)
+    from distinct categories. This represents the minimum budget required to form any team.
+    The cheapest team simply takes the cheapest product of the cheapest categories, so no
+    combinations need to be enumerated.
 
     Args:
-        products (list): List of product dictionaries.
+        products (list or CatalogIndex): List of product dictionaries, or a prebuilt index
+            (or restricted view), whose cheapest product per category is already known.
+        constraints (TeamConstraints): Optional restrictions the team has to satisfy.
+        trace (SolverTrace): Optional trace counting the categories considered.
 
     Returns:
-        int: The total price of the cheapest 5-product combination from 5 categories.
+        int: The total price of the cheapest team.
     """
-    # Group products by category and sort each category by price (ascending)
-    categories = {}
-    for product in products:
-        category = product['category']
-        if category not in categories:
-            categories[category] = []
-        categories[category].append(product)
-    
-    # Sort products within each category by price (cheapest first)
-    for category in categories:
-        categories[category].sort(key=lambda x: x['price'])
-    
-    # Check if we have at least 5 distinct categories
-    if len(categories) < 5:
-        raise ValueError("Not enough categories available. Need at least 5 distinct categories.")
-    
-    # Try all combinations of 5 categories and find the cheapest total
-    from itertools import combinations
-    
-    min_total_price = float('inf') # start at infinity and find the smallest
-    cheapest_combination = None
-    
-    # Try all possible combinations of 5 categories from available categories
-    for selected_categories in combinations(categories.keys(), 5):
-        # For each combination of 5 categories, take the cheapest product from each
-        total_price = 0
-        combination = []
-        
-        for category in selected_categories:
-            cheapest_product = categories[category][0]  # First item is cheapest due to sorting
-            total_price += cheapest_product['price']
-            combination.append(cheapest_product)
-        
-        # Keep track of the overall cheapest combination
-        if total_price < min_total_price:
-            min_total_price = total_price
-            cheapest_combination = combination
+    required_categories = constraints.required_categories if constraints else ()
+    team_size = constraints.team_size if constraints else DEFAULT_TEAM_SIZE
+
+    # Cheapest price per category
+    if isinstance(products, (CatalogIndex, RestrictedIndex)):
+        cheapest_by_category = products.restricted(constraints).min_price_by_category
+    else:
+        if constraints is not None:
+            products = [product for product in products if constraints.allows(product)]
+        cheapest_by_category = {}
+        for product in products:
+            category = product['category']
+            if category not in cheapest_by_category or product['price'] < cheapest_by_category[category]:
+                cheapest_by_category[category] = product['price']
     
-    # Optional debug output (uncomment for debugging)
-    # print(f"Cheapest 5-product combination total: ${min_total_price}")
-    # print(f"Categories: {[p['category'] for p in cheapest_combination]}")
-    # product_details = [f"{p['name']} (${p['price']})" for p in cheapest_combination]
-    # print(f"Products: {product_details}")
+    trace_count(trace, "minimum_budget_categories", len(cheapest_by_category))
+
+    # Check if we have enough distinct categories
+    if len(cheapest_by_category) < team_size:
+        raise ValueError(f"Not enough categories available. Need at least {team_size} distinct categories.")
+
+    if len(required_categories) > team_size or any(c not in cheapest_by_category for c in required_categories):
+        raise ValueError(f"No combination of {team_size} categories satisfies the constraints.")
     
+    # required categories are always paid for, the remaining slots go to the cheapest other categories
+    required_total = sum(cheapest_by_category[category] for category in required_categories)
+    others = sorted(price for category, price in cheapest_by_category.items() if category not in required_categories)
+    min_total_price = required_total + sum(others[:team_size - len(required_categories)])
+
     return min_total_price
@@ -1,15 +1,178 @@
-from fastapi import FastAPI, Query, HTTPException
+import time
+_IMPORT_STARTED = time.perf_counter()
+
+import asyncio
+import os
+import threading
+from contextlib import asynccontextmanager, nullcontext
+
+from typing import Annotated, List, Optional
+
+from fastapi import FastAPI, Query, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-import uvicorn
-from models import TeamBuilderResponse, NotFoundException
-from constants import sample_product_json
+from fastapi.responses import JSONResponse
+from models import (
+    TeamBuilderResponse, NotFoundException, ProductCategory, TeamConstraints, SolverMode, SolveReport,
+    CatalogStatsResponse, CategoryStats, TeamIdsResponse, CatalogProductsResponse,
+)
+from constants import sample_product_json, DEFAULT_TEAM_SIZE, DEFAULT_CATALOG_ID
+
+from logic import SOLVER_VERSION, curate_product_team, lowest_price_combination
+from catalog import Catalog, CatalogRegistry, load_catalog
+from caching import TEAM_CACHE_CONTROL, make_etag, etag_matches
+from negotiation import JSON, MSGPACK, TEAM_IDS, available, negotiate, encode
+from singleflight import SingleFlight
+from startup import StartupPipeline
+from live import LatestOnly, TeamDiffer, parse_budget_update
+from admission import MIN_COST, AdmissionController, AdmissionRejected, estimate_solve_cost
+from result_store import ResultStore
+from tracing import SolverTrace, export_trace, otlp_endpoint, trace_exporter, trace_stage, trace_count
+
+# uvicorn is only needed when running this file directly, so it is imported under __main__
+
+startup = StartupPipeline()
+startup.record("import", time.perf_counter() - _IMPORT_STARTED)
+
+# identical budget queries arriving together share one solver run
+solver_flight = SingleFlight()
+
+# per-client token buckets charged with the estimated solver cost of each request
+admission = AdmissionController(
+    rate=float(os.environ.get("ADMISSION_RATE", 50)),
+    burst=float(os.environ.get("ADMISSION_BURST", 200)),
+    max_pending_cost=float(os.environ.get("ADMISSION_MAX_PENDING_COST", 400)),
+)
+
+# live connections and how many of their budget updates were superseded before being solved
+live_stats = {"connections": 0, "updates": 0, "dropped": 0}
+
+# tenant catalogs are read from {CATALOG_DIR}/{catalog_id}.json
+CATALOG_DIR_ENV = "CATALOG_DIR"
+CATALOG_MEMORY_BUDGET_ENV = "CATALOG_MEMORY_BUDGET_MB"
+CATALOG_ID_PATTERN = r"^[A-Za-z0-9_-]{1,64}$"
+# solved teams are persisted to this SQLite file (if set) and reloaded on restart
+RESULT_STORE_ENV = "RESULT_STORE_PATH"
+
+result_store = ResultStore(os.environ[RESULT_STORE_ENV]) if os.environ.get(RESULT_STORE_ENV) else None
+
+
+def load_tenant_catalog(catalog_id):
+    """
+    Load and index a catalog by id: the built-in sample catalog for the default id,
+    otherwise the matching file in CATALOG_DIR. Only the default catalog's load is
+    timed as a startup phase.
+
+    Args:
+        catalog_id (str): Catalog identifier (already validated against CATALOG_ID_PATTERN).
+
+    Returns:
+        Catalog: The loaded catalog with its solver index built, or None if unknown.
+    """
+    phase = startup.phase if catalog_id == DEFAULT_CATALOG_ID else lambda name: nullcontext()
+    with phase("catalog_load"):
+        if catalog_id == DEFAULT_CATALOG_ID:
+            products = sample_product_json
+        else:
+            directory = os.environ.get(CATALOG_DIR_ENV)
+            path = os.path.join(directory, f"{catalog_id}.json") if directory else None
+            if path is None or not os.path.isfile(path):
+                return None
+            products = load_catalog(path)
+        catalog = Catalog(products, catalog_id)
+    with phase("index_build"):
+        catalog.build_index()
+    if result_store is not None:
+        # teams solved for this exact catalog content before the last restart
+        with phase("result_store_load"):
+            result_store.load(catalog)
+    return catalog
+
+
+catalogs = CatalogRegistry(
+    load_tenant_catalog,
+    int(float(os.environ.get(CATALOG_MEMORY_BUDGET_ENV, 256)) * 1024 * 1024),
+)
+# serializes catalog updates
+_catalog_lock = threading.RLock()
+
+
+def get_catalog(catalog_id=DEFAULT_CATALOG_ID) -> Catalog:
+    """
+    Return a served catalog, loading and indexing it on first use.
+    Normally the default catalog is loaded during warm-up, but a request that arrives
+    first (or a test client that skips the lifespan) loads it lazily instead. Other
+    catalogs are always loaded lazily and may be evicted again when memory is short.
+
+    Args:
+        catalog_id (str): Catalog (tenant) identifier.
+
+    Returns:
+        Catalog: The loaded catalog with its solver index built.
+
+    Raises:
+        HTTPException: 404 if there is no such catalog.
+    """
+    try:
+        return catalogs.get(catalog_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Catalog '{catalog_id}' not found")
+
+
+async def get_catalog_async(catalog_id=DEFAULT_CATALOG_ID) -> Catalog:
+    """
+    get_catalog for async endpoints: a resident catalog is returned right away, one
+    that has to be loaded (file parse, index build, stored teams) is loaded in a
+    worker thread so the event loop keeps serving other requests meanwhile.
+
+    Args:
+        catalog_id (str): Catalog (tenant) identifier.
+
+    Returns:
+        Catalog: The loaded catalog with its solver index built.
+
+    Raises:
+        HTTPException: 404 if there is no such catalog.
+    """
+    catalog = catalogs.get_resident(catalog_id)
+    if catalog is not None:
+        return catalog
+    return await asyncio.get_running_loop().run_in_executor(None, get_catalog, catalog_id)
+
+
+def warm_up():
+    """
+    Run the startup pipeline: load and index the catalog, then solve once at the
+    minimum budget so the first real request doesn't pay any cold-path costs.
+    The worker is only marked ready once this succeeds.
+    """
+    try:
+        catalog = get_catalog()
+        with startup.phase("warm_up_solve"):
+            minimum_budget = lowest_price_combination(catalog.products)
+            curate_product_team(catalog.index, minimum_budget)
+    except Exception as exc:
+        startup.mark_failed(exc)
+        raise
+    startup.mark_ready()
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # warm up in the background so the server starts accepting connections
+    # (and answering /ready with 503) straight away
+    warm_up_task = asyncio.get_running_loop().run_in_executor(None, warm_up)
+    yield
+    if not warm_up_task.done():
+        warm_up_task.cancel()
+    if result_store is not None:
+        result_store.flush()
 
-from logic import curate_product_team, lowest_price_combination
 
 app = FastAPI(
     title="Team Builder API",
     description="FastAPI backend for the budget-based team builder application",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Enable CORS for React frontend
@@ -19,21 +182,91 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Retry-After"],
 )
 
-@app.get("/team-builder", responses={500:{'model': NotFoundException}})
-async def build_team(budget: int = Query(..., description="Budget amount for team building", ge=0)) -> TeamBuilderResponse:
+def remember_team(catalog, budget, team, constraints=None):
     """
-    Build a team based on the provided budget.
-    
+    Cache a solved team for its catalog version, and persist it when a result
+    store is configured (written in the background).
+
     Args:
-        budget (float): The budget amount for building the team (must be >= 0)
-    
+        catalog (Catalog): The catalog version the team was solved against
+        budget (int): The budget amount
+        team (list): List of Product models
+        constraints (TeamConstraints): Restrictions the team was solved with
+    """
+    catalog.teams.put(budget, team, constraints)
+    if result_store is not None:
+        result_store.save(catalog.version, budget, team, constraints)
+
+
+def admit_solve(client_id, flight_key, catalog, budget, constraints=None, mode=SolverMode.exact, deadline_ms=None):
+    """
+    Charge a client for the work a request will cause before queueing it. Joining a
+    solve already in flight (same flight_key) causes none, so it costs the minimum
+    and isn't pending work.
+
+    Args:
+        client_id (str): Client identity (remote address)
+        flight_key (tuple): Key the request will be solved under in solver_flight
+        catalog (Catalog): The catalog version to solve against
+        budget (int): The budget amount for building the team
+        constraints (TeamConstraints): Optional restrictions on the team
+        mode (SolverMode): Exact or fast (anytime) solver
+        deadline_ms (int): Time budget of the fast solver in milliseconds
+
     Returns:
-        TeamBuilderResponse: Status, message, and budget information
+        float: The cost to pass to admission.release() once the request is answered
+
+    Raises:
+        HTTPException: 429 or 503, with Retry-After, if the request isn't admitted
+    """
+    if not admission.enabled:
+        return 0.0
+    joining = solver_flight.running(flight_key)
+    estimate = MIN_COST if joining else estimate_solve_cost(catalog, budget, constraints, mode, deadline_ms)
+    try:
+        return admission.admit(client_id, estimate, pending=not joining)
+    except AdmissionRejected as exc:
+        raise HTTPException(
+            status_code=exc.status_code, detail=exc.detail, headers={"Retry-After": str(exc.retry_after)}
+        )
+
+
+def solve_team(catalog, budget, constraints=None, mode=SolverMode.exact, deadline_ms=None, trace=None):
     """
+    Validate the budget and run the solver. Blocking - called through solver_flight
+    so that concurrent identical requests share a single computation.
+
+    Args:
+        catalog (Catalog): The catalog version to solve against
+        budget (int): The budget amount for building the team
+        constraints (TeamConstraints): Optional restrictions on the team
+        mode (SolverMode): Exact or fast (anytime) solver
+        deadline_ms (int): Time budget of the fast solver in milliseconds
+        trace (SolverTrace): Optional trace of the work done for this request
+
+    Returns:
+        tuple: (list of curated Product models, SolveReport for fast mode or None)
+    """
+    # the request's view of the catalog, shared by the checks below and the solver
+    index = catalog.index.restricted(constraints)
+    if constraints is not None:
+        # cheap feasibility check on the restricted catalog before anything is enumerated
+        categories = index.min_price_by_category
+        team_size = constraints.team_size
+        if (len(categories) < team_size
+                or len(constraints.required_categories) > team_size
+                or any(c not in categories for c in constraints.required_categories)):
+            raise HTTPException(
+                status_code=400,
+                detail=f"No team of {team_size} products from {team_size} categories satisfies the given constraints"
+            )
+
     # if budget is less than cheapest team combination, return error
-    minimum_budget = lowest_price_combination(sample_product_json) 
+    with trace_stage(trace, "minimum_budget"):
+        minimum_budget = lowest_price_combination(index, constraints, trace=trace)
     # do not allow budget to be less than minimum budget
 
     if budget < minimum_budget:
@@ -42,17 +275,460 @@ async def build_team(budget: int = Query(..., description="Budget amount for tea
             detail=f"Budget must be at least ${minimum_budget} to build a team"
         )
 
-    # curate product teams based on budget
-    curated_team = curate_product_team(sample_product_json, budget)
+    # answers survive catalog updates that don't affect them, see update_catalog
+    curated_team = catalog.teams.get(budget, constraints)
+    trace_count(trace, "team_cache_hits" if curated_team is not None else "team_cache_misses")
+    if mode == SolverMode.fast:
+        report = SolveReport(mode=mode)
+        if curated_team is None:
+            curated_team = curate_product_team(index, budget, constraints, mode, deadline_ms, report, trace=trace)
+            # a proven optimal team is exactly what the exact solver would return
+            if report.proven_optimal:
+                remember_team(catalog, budget, curated_team, constraints)
+        return curated_team, report
+
+    if curated_team is None:
+        # curate product teams based on budget
+        curated_team = curate_product_team(index, budget, constraints, trace=trace)
+        remember_team(catalog, budget, curated_team, constraints)
+    return curated_team, None
+
+
+def update_catalog(upserts=(), removed_ids=(), catalog_id=DEFAULT_CATALOG_ID) -> dict:
+    """
+    Apply product changes to the served catalog.
+    Cached teams that cannot be affected by the change are carried over to the new
+    catalog version, only the affected budget interval is re-solved.
+
+    Args:
+        upserts (list): Product dictionaries to add, or to replace by id.
+        removed_ids (iterable): Ids of products to remove.
+        catalog_id (str): Catalog to update.
+
+    Returns:
+        dict: The new catalog version and how many cached teams were reused/re-solved.
+    """
+    with _catalog_lock:
+        old_catalog = get_catalog(catalog_id)
+        new_catalog, changed_ids = old_catalog.updated(upserts, removed_ids)
+        new_catalog.build_index(old_catalog, changed_ids)
+        new_catalog.teams, stats = old_catalog.teams.migrate(
+            old_catalog.index,
+            new_catalog.index,
+            changed_ids,
+            lambda budget, constraints: curate_product_team(new_catalog.index, budget, constraints),
+        )
+        # swap atomically - requests already running keep using the old version.
+        # Pinned: the factory would reload the catalog without this change
+        catalogs.put(new_catalog, pinned=True)
+    if result_store is not None:
+        for budget, constraints, team in new_catalog.teams.items():
+            result_store.save(new_catalog.version, budget, team, constraints)
+    return {"version": new_catalog.version, **stats}
+
+
+def negotiate_media_type(request, offered) -> str:
+    """
+    Choose the response representation from the request's Accept header.
+
+    Args:
+        request (Request): Incoming request (None when called directly, which means JSON)
+        offered (list): Media types the endpoint can produce, preferred first
+
+    Returns:
+        str: The negotiated media type
+
+    Raises:
+        HTTPException: 406 when the client accepts none of the available types
+    """
+    offered = available(offered)
+    media_type = negotiate(request.headers.get("accept") if request is not None else None, offered)
+    if media_type is None:
+        raise HTTPException(status_code=406, detail=f"Supported media types: {', '.join(offered)}")
+    return media_type
+
+
+def negotiated_response(model, media_type, headers, response=None):
+    """
+    Return a response model in the negotiated representation. JSON goes through
+    FastAPI's usual serialization (the response model contract is unchanged), other
+    representations are encoded here.
+
+    Args:
+        model (BaseModel): The response model
+        media_type (str): The negotiated media type
+        headers (dict): Headers to set on the response
+        response (Response): Outgoing response of the endpoint, for JSON
+
+    Returns:
+        BaseModel or Response: What the endpoint returns
+    """
+    if media_type == JSON:
+        if response is not None:
+            response.headers.update(headers)
+        return model
+    return Response(content=encode(media_type, model), media_type=media_type, headers=headers)
+
+
+@app.get("/team-builder", responses={500:{'model': NotFoundException}})
+async def build_team(
+    budget: int = Query(..., description="Budget amount for team building", ge=0),
+    team_size: Annotated[int, Query(description="Number of products, each from a distinct category", ge=1)] = DEFAULT_TEAM_SIZE,
+    include_category: Annotated[Optional[List[ProductCategory]], Query(description="Categories the team must include")] = None,
+    exclude_id: Annotated[Optional[List[int]], Query(description="Product ids the team must not contain")] = None,
+    max_item_price: Annotated[Optional[int], Query(description="Maximum price of any single product", ge=0)] = None,
+    min_rating: Annotated[Optional[float], Query(description="Minimum rating of every product", ge=0, le=5)] = None,
+    mode: Annotated[SolverMode, Query(description="exact: optimal team, fast: best team found within deadline_ms")] = SolverMode.exact,
+    deadline_ms: Annotated[int, Query(description="Latency budget of the fast mode in milliseconds", ge=1, le=10000)] = 20,
+    catalog_id: Annotated[str, Query(alias="catalog", description="Catalog (storefront) to build the team from", pattern=CATALOG_ID_PATTERN)] = DEFAULT_CATALOG_ID,
+    debug: Annotated[bool, Query(description="Include a trace of the solver work in the response")] = False,
+    request: Request = None,
+    response: Response = None,
+) -> TeamBuilderResponse:
+    """
+    Build a team based on the provided budget.
+    Responses carry a strong ETag derived from the catalog version and the request
+    parameters, so a matching If-None-Match is answered with 304 without solving.
+    The representation is negotiated with the Accept header: JSON (default),
+    application/msgpack, or the compact application/vnd.teambuilder.ids+json.
+    
+    Args:
+        budget (float): The budget amount for building the team (must be >= 0)
+        team_size (int): Number of products in the team, up to the number of categories
+        include_category (list): Categories that must be part of the team
+        exclude_id (list): Ids of products that must not be part of the team
+        max_item_price (int): Maximum price of any single product
+        min_rating (float): Minimum rating of every product
+        mode (SolverMode): "exact" (default) or "fast" for the anytime solver
+        deadline_ms (int): Latency budget of the fast mode; the response reports the
+            optimality gap and whether the team is proven optimal
+        catalog_id (str): Catalog (tenant) to build the team from, `catalog` in the query
+        debug (bool): Return the solver trace (work counters, time per stage) in the
+            `trace` field; such responses bypass HTTP caching and request coalescing
+        request (Request): Incoming request, used for content negotiation and conditional headers
+        response (Response): Outgoing response, used to set caching headers
+    
+    Returns:
+        TeamBuilderResponse: Status, message, and budget information
+
+    Raises:
+        HTTPException: 406 when no acceptable representation can be produced, 429 when
+            the client exceeds its rate of solver work, 503 when the worker already has
+            too much work in progress (both with Retry-After)
+    """
+    media_type = negotiate_media_type(request, [JSON, MSGPACK, TEAM_IDS])
+    constraints = None
+    if (team_size != DEFAULT_TEAM_SIZE or include_category or exclude_id
+            or max_item_price is not None or min_rating is not None):
+        constraints = TeamConstraints(
+            team_size=team_size,
+            include_categories=include_category or (),
+            exclude_ids=exclude_id or (),
+            max_item_price=max_item_price,
+            min_rating=min_rating,
+        )
+
+    catalog = await get_catalog_async(catalog_id)
+    # trace when asked to, or for every request when an OTLP collector is configured
+    trace = None
+    if debug or otlp_endpoint():
+        trace = SolverTrace(attributes={"budget": budget, "team_size": team_size, "mode": mode.value})
+
+    option_parts = constraints.cache_key() if constraints else ()
+    if mode == SolverMode.fast:
+        # fast answers only get a validator once proven optimal, so the deadline doesn't matter
+        option_parts = (*option_parts, mode.value)
+    if media_type != JSON:
+        # each representation needs its own strong validator
+        option_parts = (*option_parts, media_type)
+    # a new solver release may return another team for the same request
+    etag = make_etag(catalog.version, SOLVER_VERSION, budget, *option_parts)
+    if not debug and request is not None and etag_matches(request.headers.get("if-none-match"), etag):
+        # the client already has this exact team - skip the solver entirely
+        return Response(
+            status_code=304,
+            headers={"ETag": etag, "Cache-Control": TEAM_CACHE_CONTROL, "Vary": "Accept"},
+        )
+
+    # errors (e.g. budget too low) are raised to every coalesced waiter
+    flight_key = (catalog.catalog_id, catalog.version, budget, constraints)
+    if mode == SolverMode.fast:
+        flight_key = (*flight_key, mode.value, deadline_ms)
+    if debug:
+        # a coalesced waiter would report somebody else's work
+        flight_key = (*flight_key, trace.trace_id)
+
+    cost = 0.0
+    if request is not None:
+        client_id = request.client.host if request.client else "unknown"
+        cost = admit_solve(client_id, flight_key, catalog, budget, constraints, mode, deadline_ms)
+    trace_count(trace, "admission_cost", cost)
+
+    try:
+        curated_team, report = await solver_flight.do(
+            flight_key, solve_team, catalog, budget, constraints, mode, deadline_ms, trace
+        )
+    finally:
+        admission.release(cost)
+        if trace is not None and not debug:
+            trace.finish()
+            export_trace(trace)
     total_cost = sum(product.price for product in curated_team)
 
-    return TeamBuilderResponse(
-        status="success",
-        message=f"Team builder endpoint called successfully with budget: ${budget:,.2f}",
-        budget=budget,
-        products=curated_team,
-        total_cost=total_cost
+    headers = {"Vary": "Accept"}
+    if debug:
+        headers["Cache-Control"] = "no-store"
+    # an approximate team may differ between calls, so it must not be cached as-is
+    elif report is None or report.proven_optimal:
+        headers["ETag"] = etag
+        headers["Cache-Control"] = TEAM_CACHE_CONTROL
+
+    if media_type == TEAM_IDS:
+        # no product models to serialize, clients resolve the ids via /catalog/products
+        team_response = TeamIdsResponse(
+            catalog=catalog.catalog_id,
+            version=catalog.version,
+            budget=budget,
+            product_ids=[product.id for product in curated_team],
+            total_cost=total_cost,
+            solver=report,
+        )
+    else:
+        team_response = TeamBuilderResponse(
+            status="success",
+            message=f"Team builder endpoint called successfully with budget: ${budget:,.2f}",
+            budget=budget,
+            products=curated_team,
+            total_cost=total_cost,
+            solver=report
+        )
+    if debug:
+        # time a serialization pass too, then attach the trace to the response
+        with trace.stage("serialize"):
+            encode(media_type, team_response)
+        trace.finish()
+        export_trace(trace)
+        team_response.trace = trace.to_dict()
+    return negotiated_response(team_response, media_type, headers, response)
+
+
+@app.get("/catalog/products")
+async def catalog_products(
+    catalog_id: Annotated[str, Query(alias="catalog", description="Catalog (storefront)", pattern=CATALOG_ID_PATTERN)] = DEFAULT_CATALOG_ID,
+    product_ids: Annotated[Optional[List[int]], Query(alias="id", description="Product ids (every product if omitted)")] = None,
+    request: Request = None,
+    response: Response = None,
+) -> CatalogProductsResponse:
+    """
+    Product details of a catalog version, for clients of the compact team
+    representation to resolve product ids. The response only changes with the
+    catalog version, so clients can cache it until a team reports a new version.
+
+    Args:
+        catalog_id (str): Catalog (tenant), `catalog` in the query
+        product_ids (list): Ids of the products to return, `id` in the query
+        request (Request): Incoming request, used for content negotiation and conditional headers
+        response (Response): Outgoing response, used to set caching headers
+
+    Returns:
+        CatalogProductsResponse: The catalog version and the requested products
+
+    Raises:
+        HTTPException: 404 for unknown product ids, 406 when no acceptable
+            representation can be produced
+    """
+    media_type = negotiate_media_type(request, [JSON, MSGPACK])
+    catalog = await get_catalog_async(catalog_id)
+    index = catalog.index
+    if product_ids is None:
+        products = sorted(index.products, key=lambda product: product['id'])
+    else:
+        missing = [product_id for product_id in product_ids if product_id not in index.products_by_id]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Unknown product ids: {missing}")
+        products = [index.products_by_id[product_id] for product_id in product_ids]
+
+    etag = make_etag(catalog.version, "products", *(product_ids or ()), *([media_type] if media_type != JSON else []))
+    headers = {"ETag": etag, "Cache-Control": TEAM_CACHE_CONTROL, "Vary": "Accept"}
+    if request is not None and etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    products_response = CatalogProductsResponse(
+        catalog=catalog.catalog_id,
+        version=catalog.version,
+        products=[index.model(product) for product in products],
     )
+    return negotiated_response(products_response, media_type, headers, response)
+
+
+@app.get("/catalog/stats")
+async def catalog_stats(
+    catalog_id: Annotated[str, Query(alias="catalog", description="Catalog (storefront)", pattern=CATALOG_ID_PATTERN)] = DEFAULT_CATALOG_ID,
+    team_size: Annotated[int, Query(description="Number of products in a team", ge=1)] = DEFAULT_TEAM_SIZE,
+    request: Request = None,
+    response: Response = None,
+) -> CatalogStatsResponse:
+    """
+    Budget bounds and per-category price ranges of a catalog, so clients can
+    validate a budget before calling /team-builder. Served from stats kept with the
+    catalog version; like team responses they carry an ETag.
+
+    Args:
+        catalog_id (str): Catalog (tenant), `catalog` in the query
+        team_size (int): Number of products in a team
+        request (Request): Incoming request, used for conditional headers
+        response (Response): Outgoing response, used to set caching headers
+
+    Returns:
+        CatalogStatsResponse: Minimum and saturation budgets, category stats
+    """
+    catalog = await get_catalog_async(catalog_id)
+    # the saturation budget comes from the solver
+    etag = make_etag(catalog.version, SOLVER_VERSION, "stats", team_size)
+    if request is not None and etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": TEAM_CACHE_CONTROL})
+
+    stats = catalog.stats
+    # the saturation budget is solved once per team size, off the event loop
+    saturation_budget = await asyncio.get_running_loop().run_in_executor(None, stats.saturation_budget, team_size)
+    if response is not None:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = TEAM_CACHE_CONTROL
+    return CatalogStatsResponse(
+        catalog=catalog.catalog_id,
+        version=catalog.version,
+        team_size=team_size,
+        product_count=stats.product_count,
+        min_budget=stats.minimum_budget(team_size),
+        saturation_budget=saturation_budget,
+        categories=[CategoryStats(category=name, **values) for name, values in stats.categories.items()],
+    )
+
+
+@app.websocket("/team-builder/live")
+async def live_team_builder(
+    websocket: WebSocket,
+    catalog_id: Annotated[str, Query(alias="catalog", pattern=CATALOG_ID_PATTERN)] = DEFAULT_CATALOG_ID,
+    team_size: Annotated[int, Query(ge=1)] = DEFAULT_TEAM_SIZE,
+):
+    """
+    Live budget exploration, e.g. for a budget slider. The client streams budget
+    updates ({"budget": 1000, "seq": 7}); while one is being solved, newer updates
+    replace older ones that haven't been answered yet, so a fast slider only pays
+    for the budgets it settles on. Teams come from the same cache and coalesced
+    solver as /team-builder, and each answer only carries the products that changed
+    since the previous answer on this connection:
+
+        {"type": "team", "seq": 7, "budget": 1000, "total_cost": 990,
+         "added": [<products>], "removed": [<ids>], "product_ids": [<team ids in order>]}
+
+    Invalid or infeasible budgets get {"type": "error", "seq", "budget", "status_code",
+    "detail"} and leave the team of the connection unchanged. Each answered update goes
+    through admission control like a /team-builder request, so rejected ones get an
+    error with status_code 429 or 503.
+
+    Args:
+        websocket (WebSocket): The client connection
+        catalog_id (str): Catalog (tenant) to build teams from, `catalog` in the query
+        team_size (int): Number of products in the teams
+    """
+    await websocket.accept()
+    try:
+        await get_catalog_async(catalog_id)
+    except HTTPException as exc:
+        await websocket.close(code=1008, reason=exc.detail)
+        return
+    constraints = TeamConstraints(team_size=team_size) if team_size != DEFAULT_TEAM_SIZE else None
+    client_id = websocket.client.host if websocket.client else "unknown"
+    updates = LatestOnly()
+    team_state = TeamDiffer()
+
+    async def answer_updates():
+        while True:
+            text = await updates.get()
+            seq = None
+            try:
+                budget, seq = parse_budget_update(text)
+                # pick up catalog updates between answers
+                catalog = await get_catalog_async(catalog_id)
+                # the same key as /team-builder, so both share solves in flight
+                flight_key = (catalog.catalog_id, catalog.version, budget, constraints)
+                cost = admit_solve(client_id, flight_key, catalog, budget, constraints)
+                try:
+                    team, _ = await solver_flight.do(flight_key, solve_team, catalog, budget, constraints)
+                finally:
+                    admission.release(cost)
+            except ValueError as exc:
+                await websocket.send_json({"type": "error", "seq": seq, "budget": None,
+                                           "status_code": 422, "detail": str(exc)})
+                continue
+            except HTTPException as exc:
+                await websocket.send_json({"type": "error", "seq": seq, "budget": budget,
+                                           "status_code": exc.status_code, "detail": exc.detail})
+                continue
+            await websocket.send_json({
+                "type": "team",
+                "seq": seq,
+                "budget": budget,
+                "total_cost": sum(product.price for product in team),
+                **team_state.diff(team),
+            })
+
+    async def read_updates():
+        while True:
+            # messages are parsed by the answering side, so a bad one can't stop the reader
+            updates.put(await websocket.receive_text())
+            live_stats["updates"] += 1
+
+    live_stats["connections"] += 1
+    tasks = {asyncio.create_task(read_updates()), asyncio.create_task(answer_updates())}
+    try:
+        # runs until the client disconnects (or answering fails)
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        live_stats["connections"] -= 1
+        live_stats["dropped"] += updates.dropped
+    for task in done:
+        if not isinstance(task.exception(), (WebSocketDisconnect, type(None))):
+            raise task.exception()
+
+
+@app.get("/ready")
+async def ready():
+    """
+    Readiness probe - only succeeds once the startup pipeline has warmed the worker.
+
+    Returns:
+        JSONResponse: 200 with phase timings when ready, 503 otherwise
+    """
+    snapshot = startup.snapshot()
+    return JSONResponse(status_code=200 if snapshot["ready"] else 503, content=snapshot)
+
+
+@app.get("/metrics")
+async def metrics() -> dict:
+    """
+    Expose internal counters for monitoring.
+
+    Returns:
+        dict: Startup phase timings, resident catalogs and request coalescing metrics
+            per (catalog, version, budget) key
+    """
+    return {
+        "startup": startup.snapshot(),
+        "catalogs": catalogs.snapshot(),
+        "live": dict(live_stats),
+        "admission": admission.snapshot(),
+        "result_store": result_store.snapshot() if result_store is not None else None,
+        "tracing": exporter.snapshot() if (exporter := trace_exporter()) is not None else None,
+        "coalescing": {
+            "in_flight": solver_flight.in_flight(),
+            "keys": solver_flight.snapshot(),
+        }
+    }
 
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,6 +1,7 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_serializer
+from typing import Optional, List, Tuple
 from enum import Enum
+from constants import DEFAULT_TEAM_SIZE
 
 # Response models
 class TeamBuilderResponse(BaseModel):
@@ -19,8 +20,10 @@ class ProductCategory(str, Enum):
     storage = "Storage"
     peripherals = "Peripherals"
 
-# Product model
+# Product model - frozen, instances are shared between responses (see CatalogIndex.model)
 class Product(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: int
     name: str
     price: int
@@ -29,6 +32,61 @@ class Product(BaseModel):
     category: Optional[ProductCategory]
     value: Optional[float] = None
 
+# Request constraints
+class TeamConstraints(BaseModel):
+    """
+    Optional restrictions on the team: its size and the products it may contain.
+    Frozen (hashable) so it can be part of cache and coalescing keys.
+    """
+    # a misspelled restriction would otherwise be silently dropped
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    team_size: int = Field(DEFAULT_TEAM_SIZE, ge=1)
+    include_categories: Tuple[ProductCategory, ...] = ()
+    exclude_ids: Tuple[int, ...] = ()
+    max_item_price: Optional[int] = None
+    min_rating: Optional[float] = None
+
+    @field_validator('include_categories', 'exclude_ids')
+    @classmethod
+    def _canonical_order(cls, values):
+        # the order parameters are given in doesn't matter, keep equal constraints equal
+        return tuple(sorted(set(values)))
+
+    def allows(self, product) -> bool:
+        """Whether a product dictionary passes the per-product filters."""
+        if product['id'] in self.exclude_ids:
+            return False
+        if self.max_item_price is not None and product['price'] > self.max_item_price:
+            return False
+        if self.min_rating is not None and product['rating'] < self.min_rating:
+            return False
+        return True
+
+    @property
+    def required_categories(self) -> Tuple[str, ...]:
+        """Category names that must be part of the team."""
+        return tuple(category.value for category in self.include_categories)
+
+    def cache_key(self) -> tuple:
+        """Plain tuple representation, used to derive ETags."""
+        return (self.team_size, self.required_categories, self.exclude_ids, self.max_item_price, self.min_rating)
+
+# Solver modes
+class SolverMode(str, Enum):
+    exact = "exact"
+    fast = "fast"
+
+class SolveReport(BaseModel):
+    """
+    How a team was solved and how far from the optimum it can be.
+    optimality_gap is relative: (upper bound - score) / upper bound.
+    """
+    mode: SolverMode = SolverMode.exact
+    proven_optimal: bool = True
+    optimality_gap: float = 0.0
+    elapsed_ms: Optional[float] = None
+
 # Response models
 class TeamBuilderResponse(BaseModel):
     status: str
@@ -36,6 +94,56 @@ class TeamBuilderResponse(BaseModel):
     budget: Optional[int] = None
     products: Optional[List[Product]] = None
     total_cost: Optional[int] = None
+    solver: Optional[SolveReport] = None
+    trace: Optional[dict] = None
+
+    @model_serializer(mode="wrap")
+    def _omit_unset_reports(self, handler):
+        # solver (fast mode) and trace (debug) only appear when requested,
+        # so the default response keeps its original fields
+        data = handler(self)
+        for field in ("solver", "trace"):
+            if data.get(field) is None:
+                data.pop(field, None)
+        return data
+
+class TeamIdsResponse(BaseModel):
+    """
+    Compact team for internal clients: catalog product ids instead of full products.
+    Details are fetched once per catalog version from /catalog/products.
+    """
+    catalog: str
+    version: str
+    budget: int
+    product_ids: List[int]
+    total_cost: int
+    solver: Optional[SolveReport] = None
+    trace: Optional[dict] = None
+
+class CatalogProductsResponse(BaseModel):
+    catalog: str
+    version: str
+    products: List[Product]
+
+class CategoryStats(BaseModel):
+    category: str
+    count: int
+    min_price: int
+    max_price: int
+
+class CatalogStatsResponse(BaseModel):
+    """
+    Budget bounds of a catalog: requests below min_budget can't be served, and any
+    budget from saturation_budget upwards returns the same team.
+    Both are None when the catalog has fewer categories than team members.
+    """
+    catalog: str
+    version: str
+    team_size: int
+    product_count: int
+    min_budget: Optional[int] = None
+    saturation_budget: Optional[int] = None
+    categories: List[CategoryStats]
 
 class NotFoundException(BaseModel):
     """
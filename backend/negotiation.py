@@ -0,0 +1,99 @@
+try:
+    import msgpack
+except ImportError:
+    # optional: only needed to serve application/msgpack
+    msgpack = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+# a team as catalog product ids plus total cost, resolved against /catalog/products
+TEAM_IDS = "application/vnd.teambuilder.ids+json"
+
+# other names clients use for the same representation
+ALIASES = {"application/x-msgpack": MSGPACK}
+
+
+def available(media_types) -> list:
+    """The given media types this worker can produce (msgpack needs the msgpack package)."""
+    return [media_type for media_type in media_types if media_type != MSGPACK or msgpack is not None]
+
+
+def parse_accept(header) -> list:
+    """
+    Parse an Accept header into (media range, quality) pairs.
+    Malformed quality values count as 1, like a missing one.
+
+    Args:
+        header (str): Raw Accept header value.
+
+    Returns:
+        list: (media range, q) tuples in header order.
+    """
+    ranges = []
+    for part in header.split(','):
+        media_range, *params = [item.strip() for item in part.split(';')]
+        if not media_range:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    pass
+        media_range = media_range.lower()
+        ranges.append((ALIASES.get(media_range, media_range), quality))
+    return ranges
+
+
+def negotiate(accept, offered):
+    """
+    Pick the representation of a response from the request's Accept header
+    (RFC 9110, 12.5.1): each offered type gets the quality of the most specific range
+    matching it, and the best one wins, ties going to the earliest offered.
+
+    Args:
+        accept (str): Raw Accept header value (None or empty accepts anything).
+        offered (list): Media types the endpoint can produce, preferred first.
+
+    Returns:
+        str: The chosen media type, or None if the client accepts none of them.
+    """
+    if not accept:
+        return offered[0]
+    ranges = parse_accept(accept)
+    best, best_quality = None, 0.0
+    for media_type in offered:
+        main_type = media_type.split('/')[0]
+        quality, specificity = 0.0, -1
+        for media_range, range_quality in ranges:
+            if media_range == media_type:
+                rank = 2
+            elif media_range == f"{main_type}/*":
+                rank = 1
+            elif media_range == "*/*":
+                rank = 0
+            else:
+                continue
+            if rank > specificity:
+                quality, specificity = range_quality, rank
+        if quality > best_quality:
+            best, best_quality = media_type, quality
+    return best
+
+
+def encode(media_type, model) -> bytes:
+    """
+    Serialize a response model in a negotiated representation.
+
+    Args:
+        media_type (str): JSON, MSGPACK or TEAM_IDS.
+        model (BaseModel): The response model.
+
+    Returns:
+        bytes: The response body.
+    """
+    if media_type == MSGPACK:
+        return msgpack.packb(model.model_dump(mode="json"))
+    return model.model_dump_json(exclude_none=media_type == TEAM_IDS).encode()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Offline precomputation of recommended teams
+
+Runs the team builder solver from logic.py over many budgets and catalogs without
+going through the API, using all CPU cores, and exports the results.
+
+Usage:
+    python3 precompute.py --range 245 2000 5 --format csv --output teams.csv
+    python3 precompute.py --catalog sample.json --catalog other.json --budgets 300 500 1000
+    python3 precompute.py --range 245 5000 1 --team-size 3 --format columnar --output teams.json
+
+Formats:
+    ndjson    one JSON object per line (default)
+    csv       one row per budget, product ids/names joined with ';'
+    columnar  one JSON object with an array per column
+    parquet   Parquet file (requires the optional pyarrow package)
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from constants import sample_product_json, DEFAULT_TEAM_SIZE, DEFAULT_CATALOG_ID
+from catalog import catalog_version, load_catalog
+from logic import CatalogIndex, curate_product_team, lowest_price_combination
+from models import TeamConstraints
+
+FORMATS = ("ndjson", "csv", "columnar", "parquet")
+COLUMNS = ("catalog", "catalog_version", "budget", "team_size", "status", "total_cost", "product_ids", "product_names")
+
+# per-process state, built once by the pool initializer
+_worker_catalogs = {}
+
+
+def _init_worker(catalogs):
+    # index every catalog once per process instead of once per budget
+    for name, products in catalogs.items():
+        _worker_catalogs[name] = (CatalogIndex(products), catalog_version(products))
+
+
+def solve_budgets(task):
+    """
+    Solve a chunk of budgets for one catalog (runs inside a worker process).
+
+    Args:
+        task (tuple): (catalog name, list of budgets, team size)
+
+    Returns:
+        list: One result row (dict) per budget
+    """
+    name, budgets, team_size = task
+    index, version = _worker_catalogs[name]
+    constraints = TeamConstraints(team_size=team_size) if team_size != DEFAULT_TEAM_SIZE else None
+    try:
+        minimum_budget = lowest_price_combination(index, constraints)
+    except ValueError:
+        minimum_budget = None
+
+    rows = []
+    for budget in budgets:
+        row = {
+            "catalog": name,
+            "catalog_version": version,
+            "budget": budget,
+            "team_size": team_size,
+            "status": "ok",
+            "total_cost": None,
+            "product_ids": [],
+            "product_names": [],
+        }
+        if minimum_budget is None:
+            row["status"] = "not_enough_categories"
+        elif budget < minimum_budget:
+            row["status"] = "below_minimum"
+        else:
+            team = curate_product_team(index, budget, constraints)
+            row["total_cost"] = sum(product.price for product in team)
+            row["product_ids"] = [product.id for product in team]
+            row["product_names"] = [product.name for product in team]
+        rows.append(row)
+    return rows
+
+
+def precompute(catalogs, budgets, team_size=DEFAULT_TEAM_SIZE, workers=None, chunk_size=64):
+    """
+    Solve every budget for every catalog in parallel.
+
+    Args:
+        catalogs (dict): Mapping of catalog name to list of product dictionaries
+        budgets (list): Budgets to solve
+        team_size (int): Number of products per team
+        workers (int): Number of worker processes (defaults to the number of CPUs)
+        chunk_size (int): Budgets per task sent to a worker
+
+    Returns:
+        list: Result rows ordered by catalog, then budget
+    """
+    budgets = sorted(set(budgets))
+    tasks = [
+        (name, budgets[start:start + chunk_size], team_size)
+        for name in catalogs
+        for start in range(0, len(budgets), chunk_size)
+    ]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        # no point paying for a process pool
+        _init_worker(catalogs)
+        chunks = map(solve_budgets, tasks)
+        return [row for chunk in chunks for row in chunk]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(catalogs,)) as pool:
+        return [row for chunk in pool.map(solve_budgets, tasks) for row in chunk]
+
+
+def write_rows(rows, output_format, output):
+    """
+    Write result rows in the requested format.
+
+    Args:
+        rows (list): Result rows from precompute()
+        output_format (str): One of FORMATS
+        output (str): Output file path, or None for stdout (not for parquet)
+    """
+    if output_format == "parquet":
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise SystemExit("❌ Parquet output needs pyarrow: pip install pyarrow (or use --format columnar)")
+        if output is None:
+            raise SystemExit("❌ Parquet output needs --output")
+        table = pyarrow.table({column: [row[column] for row in rows] for column in COLUMNS})
+        pyarrow.parquet.write_table(table, output)
+        return
+
+    out = open(output, "w", newline="") if output else sys.stdout
+    try:
+        if output_format == "ndjson":
+            for row in rows:
+                out.write(json.dumps(row) + "\n")
+        elif output_format == "csv":
+            writer = csv.DictWriter(out, fieldnames=COLUMNS)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({
+                    **row,
+                    "product_ids": ";".join(str(product_id) for product_id in row["product_ids"]),
+                    "product_names": ";".join(row["product_names"]),
+                })
+        elif output_format == "columnar":
+            json.dump({column: [row[column] for row in rows] for column in COLUMNS}, out)
+            out.write("\n")
+    finally:
+        if output:
+            out.close()
+
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Precompute recommended teams for many budgets")
+    parser.add_argument("--catalog", action="append", metavar="PATH",
+                        help="Catalog JSON file (repeatable). Defaults to the built-in sample catalog")
+    budgets = parser.add_mutually_exclusive_group(required=True)
+    budgets.add_argument("--budgets", type=int, nargs="+", metavar="BUDGET", help="Explicit list of budgets")
+    budgets.add_argument("--range", type=int, nargs=3, metavar=("START", "STOP", "STEP"),
+                         help="Budgets from START to STOP (inclusive) every STEP")
+    parser.add_argument("--team-size", type=int, default=DEFAULT_TEAM_SIZE)
+    parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    parser.add_argument("--output", help="Output file (defaults to stdout)")
+    parser.add_argument("--workers", type=int, help="Worker processes (defaults to all cores)")
+    args = parser.parse_args(argv)
+    if args.range and args.range[2] <= 0:
+        parser.error("--range STEP must be positive")
+    if args.team_size < 1:
+        parser.error("--team-size must be at least 1")
+    return args
+
+
+def main(argv=None):
+    """Main function"""
+    args = parse_args(argv)
+
+    if args.catalog:
+        catalogs = {os.path.splitext(os.path.basename(path))[0]: load_catalog(path) for path in args.catalog}
+    else:
+        catalogs = {DEFAULT_CATALOG_ID: sample_product_json}
+
+    if args.range:
+        start, stop, step = args.range
+        budgets = list(range(start, stop + 1, step))
+    else:
+        budgets = args.budgets
+
+    rows = precompute(catalogs, budgets, args.team_size, args.workers)
+    write_rows(rows, args.format, args.output)
+    print(f"✅ {len(rows)} teams precomputed for {len(catalogs)} catalog(s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+from logic import SOLVER_VERSION
+from models import Product, TeamConstraints
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class ResultStore:
+    """
+    Solved teams persisted in SQLite so a restarted worker starts warm.
+    Teams are keyed by catalog content version, budget and request options, so a
+    changed catalog simply never matches the old rows - and by the version of the
+    solver and of the row format, so neither do teams solved before a deploy that
+    changes what the solver returns. Reads happen once per catalog
+    (load() bulk-loads its rows into the catalog's TeamCache); writes are queued by
+    save() and written in batches by a background thread, off the request path.
+    The table is compacted down to max_entries rows (oldest first) as it grows.
+    """
+
+    # bump when the stored products or options are encoded differently
+    FORMAT_VERSION = 1
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS teams (
+            version TEXT NOT NULL,
+            catalog_version TEXT NOT NULL,
+            budget INTEGER NOT NULL,
+            options TEXT NOT NULL,
+            products TEXT NOT NULL,
+            stored_at REAL NOT NULL,
+            PRIMARY KEY (version, catalog_version, budget, options)
+        )
+    """
+
+    def __init__(self, path, max_entries=100000, batch_size=256, flush_interval=0.5, solver_version=SOLVER_VERSION):
+        """
+        Args:
+            path (str): SQLite database file.
+            max_entries (int): Rows kept after compaction.
+            batch_size (int): Maximum teams written per transaction.
+            flush_interval (float): Seconds the writer waits to fill a batch.
+            solver_version (int): Version of the solver the saved teams come from.
+        """
+        self.path = path
+        # rows of other versions are left to age out through compaction, another
+        # worker of the other version may still be using them during a deploy
+        self.version = f"{solver_version}.{self.FORMAT_VERSION}"
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.counters = {'loaded': 0, 'queued': 0, 'written': 0, 'compacted': 0, 'write_errors': 0}
+        connection = self._connect()
+        try:
+            with connection:
+                columns = [row[1] for row in connection.execute("PRAGMA table_info(teams)")]
+                if columns and "version" not in columns:
+                    # written before teams were versioned: no way to tell which solver they come from
+                    connection.execute("DROP TABLE teams")
+                connection.execute(self.SCHEMA)
+                connection.execute("CREATE INDEX IF NOT EXISTS teams_stored_at ON teams (stored_at)")
+            # upper bound on the row count (replaced rows are counted twice), checked before compacting
+            self._rows = connection.execute("SELECT COUNT(*) FROM teams").fetchone()[0]
+        finally:
+            connection.close()
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="result-store-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=10)
+        # readers don't block the writer (and vice versa)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def load(self, catalog) -> int:
+        """
+        Bulk-load the stored teams of a catalog version into its team cache,
+        most recently stored last so they are the last to be evicted.
+
+        Args:
+            catalog (Catalog): Catalog whose teams to load.
+
+        Returns:
+            int: Number of teams loaded.
+        """
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                "SELECT budget, options, products FROM teams WHERE version = ? AND catalog_version = ? "
+                "ORDER BY stored_at DESC LIMIT ?",
+                (self.version, catalog.version, catalog.teams.max_entries),
+            ).fetchall()
+        finally:
+            connection.close()
+        # same catalog content, so the catalog's shared models can stand in for the stored ones
+        models = catalog.index.models if catalog.index is not None else {}
+        for budget, options, products in reversed(rows):
+            team = [
+                models.get(product['id']) or Product.model_validate(product)
+                for product in json.loads(products)
+            ]
+            catalog.teams.put(budget, team, self._decode_options(options))
+        self.counters['loaded'] += len(rows)
+        return len(rows)
+
+    def save(self, catalog_version, budget, team, options=None):
+        """
+        Queue a solved team for writing. Never blocks on disk.
+
+        Args:
+            catalog_version (str): Content version of the catalog the team was solved against.
+            budget (int): The budget amount.
+            team (list): List of Product models.
+            options (TeamConstraints): Request options the team was solved with.
+        """
+        if not team:
+            return
+        products = json.dumps([product.model_dump(mode="json") for product in team])
+        self._queue.put((self.version, catalog_version, budget, self._encode_options(options), products, time.time()))
+        self.counters['queued'] += 1
+
+    def flush(self):
+        """Block until every queued team is written."""
+        self._queue.join()
+
+    def close(self):
+        """Write the remaining queue and stop the writer thread."""
+        self._queue.put(_STOP)
+        self._writer.join()
+
+    def __len__(self):
+        connection = self._connect()
+        try:
+            return connection.execute("SELECT COUNT(*) FROM teams").fetchone()[0]
+        finally:
+            connection.close()
+
+    def snapshot(self) -> dict:
+        """Return the store counters and pending writes for monitoring."""
+        return {"path": self.path, "pending": self._queue.qsize(), **self.counters}
+
+    @staticmethod
+    def _encode_options(options):
+        return options.model_dump_json() if options is not None else ""
+
+    @staticmethod
+    def _decode_options(options):
+        return TeamConstraints.model_validate_json(options) if options else None
+
+    def _write_loop(self):
+        connection = self._connect()
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            # gather more writes until the batch is full or the interval is over
+            while len(batch) < self.batch_size and batch[-1] is not _STOP:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            if batch[-1] is _STOP:
+                stopping = True
+            rows = [row for row in batch if row is not _STOP]
+            try:
+                if rows:
+                    with connection:
+                        connection.executemany("INSERT OR REPLACE INTO teams VALUES (?, ?, ?, ?, ?, ?)", rows)
+                    self.counters['written'] += len(rows)
+                    self._rows += len(rows)
+                    if self._rows > self.max_entries:
+                        self._compact(connection)
+            except sqlite3.Error as exc:
+                # losing a cached team only costs a re-solve after the next restart
+                self.counters['write_errors'] += len(rows)
+                logger.warning("Could not persist %d solved teams: %s", len(rows), exc)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        connection.close()
+
+    def _compact(self, connection):
+        self._rows = connection.execute("SELECT COUNT(*) FROM teams").fetchone()[0]
+        if self._rows <= self.max_entries:
+            return
+        # keep a 10% margin so that compaction doesn't run after every batch
+        excess = self._rows - int(self.max_entries * 0.9)
+        with connection:
+            connection.execute(
+                "DELETE FROM teams WHERE rowid IN (SELECT rowid FROM teams ORDER BY stored_at LIMIT ?)",
+                (excess,),
+            )
+        self._rows -= excess
+        self.counters['compacted'] += excess
@@ -0,0 +1,85 @@
+import asyncio
+from collections import OrderedDict
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into a single execution.
+    The first caller for a key (the leader) runs the function in a worker thread,
+    every caller that arrives while it is still running awaits the same future.
+    Results and exceptions are delivered to all waiters and nothing is kept once
+    the call completes - this is not a cache, only de-duplication of in-flight work.
+    """
+
+    # keep per-key metrics bounded, budgets are user controlled
+    MAX_TRACKED_KEYS = 1024
+
+    def __init__(self):
+        self._in_flight = {}
+        self._metrics = OrderedDict()
+
+    async def do(self, key, fn, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) once for all concurrent callers with the same key.
+
+        Args:
+            key (hashable): Identifies equivalent calls.
+            fn (callable): Blocking function to run off the event loop.
+
+        Returns:
+            Any: The result of fn, shared by every waiter.
+        """
+        metrics = self._key_metrics(key)
+        metrics['calls'] += 1
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            # someone is already computing this key, piggyback on their result
+            metrics['coalesced'] += 1
+        else:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(None, lambda: fn(*args, **kwargs))
+            self._in_flight[key] = future
+            metrics['executions'] += 1
+            future.add_done_callback(lambda done: self._finish(key, done))
+
+        # shield so that one cancelled waiter (e.g. a client disconnect)
+        # doesn't cancel the computation the other waiters depend on
+        return await asyncio.shield(future)
+
+    def running(self, key) -> bool:
+        """Whether a call with this key is in flight, i.e. a new caller would join it."""
+        return key in self._in_flight
+
+    def in_flight(self) -> int:
+        """Number of keys currently being computed."""
+        return len(self._in_flight)
+
+    def snapshot(self) -> dict:
+        """
+        Return a copy of the per-key metrics.
+
+        Returns:
+            dict: Mapping of str(key) to calls/executions/coalesced/errors counters.
+        """
+        return {str(key): dict(metrics) for key, metrics in self._metrics.items()}
+
+    def reset(self):
+        """Forget all collected metrics."""
+        self._metrics.clear()
+
+    def _finish(self, key, future):
+        del self._in_flight[key]
+        if not future.cancelled() and future.exception() is not None:
+            self._key_metrics(key)['errors'] += 1
+
+    def _key_metrics(self, key):
+        metrics = self._metrics.get(key)
+        if metrics is None:
+            metrics = {'calls': 0, 'executions': 0, 'coalesced': 0, 'errors': 0}
+            self._metrics[key] = metrics
+            if len(self._metrics) > self.MAX_TRACKED_KEYS:
+                self._metrics.popitem(last=False)
+        else:
+            self._metrics.move_to_end(key)
+        return metrics
@@ -0,0 +1,71 @@
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class StartupPipeline:
+    """
+    Records how long each phase of bringing a worker up takes (import, catalog load,
+    index build, warm-up solve) and whether the worker is ready to serve traffic.
+    Phases are recorded once - later calls to an already recorded phase are ignored,
+    so lazy paths (e.g. a request arriving before warm-up) can share the same hooks.
+    """
+
+    def __init__(self):
+        self.phases = OrderedDict()
+        self.ready = False
+        self.error = None
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time the enclosed block as a startup phase.
+
+        Args:
+            name (str): Phase name, e.g. "catalog_load".
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name, seconds):
+        """
+        Record a phase duration measured elsewhere.
+
+        Args:
+            name (str): Phase name.
+            seconds (float): Duration of the phase in seconds.
+        """
+        if name not in self.phases:
+            self.phases[name] = round(seconds * 1000, 3)
+
+    def mark_ready(self):
+        """Flag the worker as warm and ready for traffic."""
+        self.ready = True
+        self.error = None
+
+    def mark_failed(self, error):
+        """
+        Flag that warm-up failed - the worker stays not ready.
+
+        Args:
+            error (Exception): The error raised during warm-up.
+        """
+        self.ready = False
+        self.error = f"{type(error).__name__}: {error}"
+
+    def snapshot(self) -> dict:
+        """
+        Return the readiness state and phase timings in milliseconds.
+
+        Returns:
+            dict: ready flag, error (if any), per-phase and total durations.
+        """
+        return {
+            "ready": self.ready,
+            "error": self.error,
+            "phases_ms": dict(self.phases),
+            "total_ms": round(sum(self.phases.values()), 3),
+        }
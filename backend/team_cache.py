@@ -0,0 +1,131 @@
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+
+from logic import affected_budget_floor
+from constants import DEFAULT_TEAM_SIZE
+
+
+class TeamCache:
+    """
+    Solved teams for one catalog version, keyed by budget and request options
+    (the TeamConstraints of the request, None when unconstrained).
+
+    When the catalog changes, migrate() carries the cache over to the new version:
+    budgets below the lowest affected budget (see affected_budget_floor) depend only
+    on unchanged products and are reused, only the interval above it is re-solved.
+    """
+
+    MAX_ENTRIES = 4096
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._teams = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, budget, options=None):
+        """
+        Look up the cached team for a budget.
+
+        Args:
+            budget (int): The budget amount.
+            options (hashable): Request options the team was solved with.
+
+        Returns:
+            list: Cached list of Product models, or None on a miss.
+        """
+        key = (budget, options)
+        with self._lock:
+            team = self._teams.get(key)
+            if team is not None:
+                self._teams.move_to_end(key)
+            return team
+
+    def put(self, budget, team, options=None):
+        """
+        Store a solved team. Empty teams (no solution) are not cached.
+
+        Args:
+            budget (int): The budget amount.
+            team (list): List of Product models.
+            options (hashable): Request options the team was solved with.
+        """
+        if not team:
+            return
+        key = (budget, options)
+        with self._lock:
+            self._teams[key] = team
+            self._teams.move_to_end(key)
+            if len(self._teams) > self.max_entries:
+                # evict the least recently used budget
+                self._teams.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached team."""
+        with self._lock:
+            self._teams.clear()
+
+    def budgets(self, options=None) -> list:
+        """Sorted list of the budgets currently cached for the given options."""
+        with self._lock:
+            return sorted(budget for budget, key_options in self._teams if key_options == options)
+
+    def items(self) -> list:
+        """Snapshot of the cached entries as (budget, options, team) tuples, least recently used first."""
+        with self._lock:
+            return [(budget, options, team) for (budget, options), team in self._teams.items()]
+
+    def __len__(self):
+        return len(self._teams)
+
+    def migrate(self, old_index, new_index, changed_ids, solve):
+        """
+        Build the cache for an updated catalog, re-solving only affected budgets.
+        The affected interval is computed separately for every set of options,
+        against the index filtered by those options.
+
+        Args:
+            old_index (CatalogIndex): Index the cached teams were solved against.
+            new_index (CatalogIndex): Index of the updated catalog.
+            changed_ids (iterable): Ids of products added, removed or modified.
+            solve (callable): solve(budget, options) -> team against the new catalog.
+
+        Returns:
+            tuple: (TeamCache for the new catalog, dict with reused/resolved/dropped counts)
+        """
+        changed_ids = set(changed_ids)
+        with self._lock:
+            entries = list(self._teams.items())
+
+        grouped = {}
+        for (budget, options), team in entries:
+            grouped.setdefault(options, []).append((budget, team))
+
+        migrated = TeamCache(self.max_entries)
+        stats = {'affected_from_budget': None, 'reused': 0, 'resolved': 0, 'dropped': 0}
+        for options, group in grouped.items():
+            group.sort(key=lambda entry: entry[0])
+            floor = affected_budget_floor(
+                old_index.filtered(options),
+                new_index.filtered(options),
+                changed_ids,
+                options.team_size if options is not None else DEFAULT_TEAM_SIZE,
+            )
+            first_affected = bisect_left([budget for budget, _ in group], floor)
+
+            for budget, team in group[:first_affected]:
+                migrated.put(budget, team, options)
+            stats['reused'] += first_affected
+
+            for budget, _ in group[first_affected:]:
+                team = solve(budget, options)
+                if team:
+                    migrated.put(budget, team, options)
+                    stats['resolved'] += 1
+                else:
+                    stats['dropped'] += 1
+
+            if floor != float('inf'):
+                lowest = stats['affected_from_budget']
+                stats['affected_from_budget'] = floor if lowest is None else min(lowest, floor)
+        return migrated, stats
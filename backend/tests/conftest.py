@@ -0,0 +1,16 @@
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+
+@pytest.fixture(autouse=True)
+def fresh_catalog():
+    """Reload the served catalogs for every test so cached teams and updates (or rate limits) don't leak between tests"""
+    main.catalogs.clear()
+    main.admission.reset()
+    yield
+    main.catalogs.clear()
+    main.admission.reset()
@@ -0,0 +1,115 @@
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from admission import AdmissionController, AdmissionRejected, TokenBucket, estimate_solve_cost
+from catalog import Catalog
+from constants import sample_product_json
+from logic import curate_product_team, lowest_price_combination
+from models import SolverMode, TeamConstraints
+
+
+class TestTokenBucket:
+    """Test cases for the TokenBucket"""
+    
+    def test_take_and_refill(self):
+        """Test that tokens are spent and refilled at the configured rate"""
+        bucket = TokenBucket(rate=10, capacity=20, now=0)
+        
+        assert bucket.take(15, now=0) == 0
+        assert bucket.take(10, now=0) == pytest.approx(0.5)
+        assert bucket.take(10, now=0.5) == 0
+    
+    def test_cost_above_capacity_needs_full_bucket(self):
+        """Test that a request costing more than the burst is admitted with a full bucket"""
+        bucket = TokenBucket(rate=10, capacity=20, now=0)
+        
+        assert bucket.take(50, now=0) == 0
+        assert bucket.take(50, now=1) == pytest.approx(1.0)
+
+
+class TestAdmissionController:
+    """Test cases for the AdmissionController"""
+    
+    def test_rate_limited_client_gets_429(self):
+        """Test that a client over its bucket is rejected with a retry delay, others aren't"""
+        controller = AdmissionController(rate=1, burst=10, max_pending_cost=1000)
+        controller.release(controller.admit("a", 8))
+        
+        with pytest.raises(AdmissionRejected) as exc_info:
+            controller.admit("a", 8)
+        
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.retry_after == 6
+        assert controller.admit("b", 8) == 8
+        assert controller.snapshot()["rate_limited"] == 1
+    
+    def test_overload_sheds_with_503(self):
+        """Test that work in progress above the cap is shed until released"""
+        controller = AdmissionController(rate=100, burst=100, max_pending_cost=10)
+        cost = controller.admit("a", 8)
+        
+        with pytest.raises(AdmissionRejected) as exc_info:
+            controller.admit("b", 8)
+        assert exc_info.value.status_code == 503
+        
+        controller.release(cost)
+        assert controller.admit("b", 8) == 8
+    
+    def test_single_request_above_pending_cap_is_admitted_when_idle(self):
+        """Test that an idle worker always takes a request, however expensive"""
+        controller = AdmissionController(rate=100, burst=100, max_pending_cost=10)
+        
+        assert controller.admit("a", 50) == 50
+    
+    def test_joining_request_is_not_pending_work(self):
+        """Test that a request joining a solve in flight is charged but never shed"""
+        controller = AdmissionController(rate=1, burst=10, max_pending_cost=10)
+        controller.admit("a", 8)
+        
+        assert controller.admit("b", 1, pending=False) == 0
+        assert controller.snapshot()["pending_cost"] == 8
+        # still charged to the client's bucket
+        controller.admit("c", 10, pending=False)
+        with pytest.raises(AdmissionRejected) as exc_info:
+            controller.admit("c", 1, pending=False)
+        assert exc_info.value.status_code == 429
+    
+    def test_disabled(self):
+        """Test that a zero rate turns admission control off"""
+        controller = AdmissionController(rate=0)
+        
+        assert not controller.enabled
+        assert controller.admit("a", 1e9) == 0
+
+
+class TestEstimateSolveCost:
+    """Test cases for the solver cost estimate"""
+    
+    def setup_method(self):
+        self.catalog = Catalog(sample_product_json)
+        self.catalog.build_index()
+        self.min_budget = lowest_price_combination(sample_product_json)
+    
+    def test_cheap_requests_cost_one_token(self):
+        """Test that budgets below any team and cached teams cost the minimum"""
+        assert estimate_solve_cost(self.catalog, self.min_budget - 100) == 1
+        
+        self.catalog.teams.put(3000, curate_product_team(self.catalog.index, 3000))
+        assert estimate_solve_cost(self.catalog, 3000) == 1
+    
+    def test_cost_grows_with_budget_and_team_size(self):
+        """Test that larger budgets and teams are estimated as more work"""
+        small = estimate_solve_cost(self.catalog, self.min_budget)
+        large = estimate_solve_cost(self.catalog, 5000)
+        larger_team = estimate_solve_cost(self.catalog, 5000, TeamConstraints(team_size=8))
+        
+        assert 1 < small < large < larger_team
+    
+    def test_fast_mode_cost_is_capped_by_deadline(self):
+        """Test that a short deadline bounds the cost of the fast mode"""
+        exact = estimate_solve_cost(self.catalog, 5000, TeamConstraints(team_size=8))
+        fast = estimate_solve_cost(self.catalog, 5000, TeamConstraints(team_size=8), SolverMode.fast, 5)
+        
+        assert fast == 2 < exact
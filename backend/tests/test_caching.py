@@ -0,0 +1,61 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from caching import make_etag, etag_matches
+from catalog import catalog_version
+from constants import sample_product_json
+
+
+class TestMakeEtag:
+    """Test cases for make_etag function"""
+    
+    def test_make_etag_is_quoted_and_deterministic(self):
+        """Test that the ETag is a quoted strong validator and stable"""
+        etag = make_etag("v1", 500)
+        
+        assert etag.startswith('"') and etag.endswith('"')
+        assert not etag.startswith('W/')
+        assert etag == make_etag("v1", 500)
+    
+    def test_make_etag_depends_on_every_part(self):
+        """Test that changing any part changes the ETag"""
+        assert make_etag("v1", 500) != make_etag("v2", 500)
+        assert make_etag("v1", 500) != make_etag("v1", 501)
+
+
+class TestEtagMatches:
+    """Test cases for etag_matches function"""
+    
+    def test_etag_matches_exact(self):
+        """Test exact match and missing header"""
+        etag = make_etag("v1", 500)
+        
+        assert etag_matches(etag, etag)
+        assert not etag_matches(None, etag)
+        assert not etag_matches('"other"', etag)
+    
+    def test_etag_matches_list_wildcard_and_weak(self):
+        """Test tag lists, the * wildcard and weak comparison"""
+        etag = make_etag("v1", 500)
+        
+        assert etag_matches(f'"other", {etag}', etag)
+        assert etag_matches('*', etag)
+        assert etag_matches(f'W/{etag}', etag)
+
+
+class TestCatalogVersion:
+    """Test cases for catalog_version function"""
+    
+    def test_catalog_version_ignores_ordering(self):
+        """Test that product and key order do not change the version"""
+        reordered = [dict(reversed(list(p.items()))) for p in reversed(sample_product_json)]
+        
+        assert catalog_version(reordered) == catalog_version(sample_product_json)
+    
+    def test_catalog_version_changes_with_content(self):
+        """Test that a price change produces a new version"""
+        changed = [dict(p) for p in sample_product_json]
+        changed[0]['price'] += 1
+        
+        assert catalog_version(changed) != catalog_version(sample_product_json)
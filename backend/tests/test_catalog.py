@@ -0,0 +1,169 @@
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+import time
+
+from catalog import Catalog, CatalogRegistry
+from constants import sample_product_json
+
+
+def make_factory(known=("a", "b", "c")):
+    """Factory building a small indexed catalog per known id, recording every load"""
+    loads = []
+
+    def factory(catalog_id):
+        if catalog_id not in known:
+            return None
+        loads.append(catalog_id)
+        catalog = Catalog(sample_product_json, catalog_id)
+        catalog.build_index()
+        return catalog
+
+    return factory, loads
+
+
+class TestCatalogRegistry:
+    """Test cases for the per-tenant CatalogRegistry"""
+    
+    def test_catalogs_are_loaded_lazily_once(self):
+        """Test that a catalog is only loaded on first use and then stays resident"""
+        factory, loads = make_factory()
+        registry = CatalogRegistry(factory)
+        
+        assert loads == []
+        first = registry.get("a")
+        
+        assert registry.get("a") is first
+        assert first.index is not None
+        assert loads == ["a"]
+    
+    def test_unknown_catalog_raises_key_error(self):
+        """Test that an id the factory doesn't know raises KeyError"""
+        factory, _ = make_factory()
+        registry = CatalogRegistry(factory)
+        
+        with pytest.raises(KeyError):
+            registry.get("missing")
+        assert "missing" not in registry
+    
+    def test_least_recently_used_catalog_is_evicted(self):
+        """Test that cold catalogs are evicted once the memory budget is exceeded"""
+        factory, loads = make_factory()
+        size = factory("a").memory_bytes
+        loads.clear()
+        registry = CatalogRegistry(factory, memory_budget_bytes=2 * size)
+        
+        registry.get("a")
+        registry.get("b")
+        registry.get("a")
+        registry.get("c")
+        
+        assert "a" in registry and "c" in registry
+        assert "b" not in registry
+        assert registry.snapshot()["evictions"] == 1
+        # an evicted catalog is simply reloaded on its next use
+        registry.get("b")
+        assert loads == ["a", "b", "c", "b"]
+    
+    def test_catalog_larger_than_budget_stays_resident(self):
+        """Test that the catalog just loaded is served even if it alone exceeds the budget"""
+        factory, _ = make_factory()
+        registry = CatalogRegistry(factory, memory_budget_bytes=1)
+        
+        registry.get("a")
+        registry.get("b")
+        
+        assert [c["id"] for c in registry.snapshot()["resident"]] == ["b"]
+    
+    def test_pinned_catalog_is_never_evicted(self):
+        """Test that a catalog put as pinned stays resident under memory pressure"""
+        factory, loads = make_factory()
+        size = factory("a").memory_bytes
+        loads.clear()
+        registry = CatalogRegistry(factory, memory_budget_bytes=2 * size)
+        updated, _ = registry.get("a").updated(removed_ids=[1])
+        updated.build_index()
+        
+        registry.put(updated, pinned=True)
+        registry.get("b")
+        registry.get("c")
+        
+        assert registry.get("a") is updated
+        assert "b" not in registry
+        assert [(c["id"], c["pinned"]) for c in registry.snapshot()["resident"]] == [("c", False), ("a", True)]
+    
+    def test_get_resident_never_loads(self):
+        """Test that get_resident only returns catalogs already loaded"""
+        factory, loads = make_factory()
+        registry = CatalogRegistry(factory)
+        
+        assert registry.get_resident("a") is None
+        assert loads == []
+        catalog = registry.get("a")
+        assert registry.get_resident("a") is catalog
+    
+    def test_put_replaces_catalog_version(self):
+        """Test that put swaps in a new version of a resident catalog"""
+        factory, _ = make_factory()
+        registry = CatalogRegistry(factory)
+        old = registry.get("a")
+        new, _ = old.updated(removed_ids=[1])
+        new.build_index()
+        
+        registry.put(new)
+        
+        assert registry.get("a") is new
+        assert len(registry.snapshot()["resident"]) == 1
+    
+    def test_concurrent_first_requests_load_once(self):
+        """Test that threads racing for a cold catalog share one load"""
+        factory, loads = make_factory()
+        registry = CatalogRegistry(factory)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(registry.get("a"))) for _ in range(8)]
+        
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert loads == ["a"]
+        assert all(catalog is results[0] for catalog in results)
+    
+    def test_request_arriving_as_load_finishes_does_not_reload(self):
+        """Test that a thread arriving when the load lock is dropped finds the loaded catalog"""
+        factory, loads = make_factory()
+        registry = CatalogRegistry(factory)
+        lock = registry._lock
+        late = []
+        
+        loader = threading.current_thread()
+        
+        class YieldingLock:
+            """The registry lock, letting waiting threads run whenever the loading thread releases it"""
+            def __enter__(self):
+                lock.acquire()
+            
+            def __exit__(self, *exc_info):
+                lock.release()
+                if threading.current_thread() is loader:
+                    time.sleep(0.01)
+        
+        class LoadLocks(dict):
+            def pop(self, *args):
+                # another request comes in right as the load lock goes away
+                late.append(threading.Thread(target=lambda: late.append(registry.get("a"))))
+                late[0].start()
+                return super().pop(*args)
+        
+        registry._lock = YieldingLock()
+        registry._load_locks = LoadLocks()
+        first = registry.get("a")
+        late[0].join()
+        
+        assert loads == ["a"]
+        assert late[1] is first
+        assert registry.snapshot()["loads"] == 1
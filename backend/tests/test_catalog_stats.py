@@ -0,0 +1,139 @@
+import pytest
+import random
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import catalog_stats
+from benchmark import synthetic_catalog
+from catalog import Catalog
+from catalog_stats import CatalogStats, LIMIT_BUDGET
+from constants import sample_product_json
+from logic import CatalogIndex, find_best_combination, lowest_price_combination
+from models import ProductCategory, TeamConstraints
+
+
+def team_ids(index, budget, team_size):
+    team = find_best_combination(index.categories, budget, (), team_size)
+    return sorted(product['id'] for product in team) if team else None
+
+
+def random_catalog(seed):
+    """Small random catalog and team size, with prices spread over the score tiers"""
+    rng = random.Random(seed)
+    category_count, max_products, max_price = rng.randint(1, 4), rng.randint(1, 12), rng.choice([100, 300, 600, 1500])
+    products = []
+    for category in rng.sample([category.value for category in ProductCategory], category_count):
+        for _ in range(rng.randint(1, max_products)):
+            products.append({
+                "id": len(products) + 1,
+                "name": f"{category} {len(products) + 1}",
+                "category": category,
+                "price": rng.randint(1, max_price),
+                "rating": round(rng.uniform(1.0, 5.0), 1),
+            })
+    index = CatalogIndex(products)
+    return index, rng.randint(1, len(index.categories))
+
+
+class TestCatalogStats:
+    """Test cases for the budget statistics of a catalog"""
+    
+    def setup_method(self):
+        self.index = CatalogIndex(sample_product_json)
+        self.stats = CatalogStats(self.index)
+    
+    def test_category_stats(self):
+        """Test per-category counts and price ranges"""
+        audio = [p['price'] for p in sample_product_json if p['category'] == 'Audio']
+        
+        assert self.stats.categories['Audio'] == {"count": len(audio), "min_price": min(audio), "max_price": max(audio)}
+        assert self.stats.product_count == len(sample_product_json)
+    
+    def test_minimum_budget_matches_lowest_price_combination(self):
+        """Test the minimum budget for every team size, and None beyond the categories"""
+        for team_size in range(1, 9):
+            expected = lowest_price_combination(sample_product_json, TeamConstraints(team_size=team_size))
+            assert self.stats.minimum_budget(team_size) == expected
+        
+        assert self.stats.minimum_budget(9) is None
+        assert self.stats.saturation_budget(9) is None
+    
+    @pytest.mark.parametrize("team_size", [3, 5, 8])
+    def test_team_stops_changing_at_saturation_budget(self, team_size):
+        """Test that the saturation budget is the first budget returning the final team"""
+        saturation = self.stats.saturation_budget(team_size)
+        final_team = team_ids(self.index, LIMIT_BUDGET, team_size)
+        
+        assert team_ids(self.index, saturation - 1, team_size) != final_team
+        for budget in range(saturation, saturation + 3000, 37):
+            assert team_ids(self.index, budget, team_size) == final_team
+
+    
+    # in several of these catalogs the team changes back at a tier boundary of the score weights
+    @pytest.mark.parametrize("seed", range(40))
+    def test_saturation_budget_on_random_catalogs(self, seed):
+        """Test that every budget from the saturation budget up returns the final team, on random catalogs"""
+        index, team_size = random_catalog(seed)
+        stats = CatalogStats(index)
+        saturation = stats.saturation_budget(team_size)
+        
+        def solved_ids(budget):
+            team = find_best_combination(index.candidates(budget, team_size), budget, (), team_size)
+            return sorted(product['id'] for product in team) if team else None
+        
+        final_team = solved_ids(LIMIT_BUDGET)
+        if saturation > stats.minimum_budget(team_size):
+            assert solved_ids(saturation - 1) != final_team
+        for budget in range(saturation, max(saturation, 1001) + 1000):
+            assert solved_ids(budget) == final_team, budget
+
+
+class TestCatalogStatsUpdates:
+    """Test cases for maintaining stats incrementally across catalog updates"""
+    
+    def updated(self, catalog, upserts=(), removed_ids=()):
+        new_catalog, changed_ids = catalog.updated(upserts, removed_ids)
+        new_catalog.build_index(catalog, changed_ids)
+        return new_catalog
+    
+    def test_incremental_stats_match_full_rebuild(self):
+        """Test that updated stats equal stats computed from scratch"""
+        catalog = Catalog(sample_product_json)
+        catalog.build_index()
+        cheap_storage = {"id": 100, "name": "USB stick", "category": "Storage", "price": 5, "rating": 4.0}
+        
+        new_catalog = self.updated(catalog, upserts=[cheap_storage, dict(sample_product_json[0], price=999)],
+                                   removed_ids=[2])
+        rebuilt = CatalogStats(CatalogIndex(new_catalog.products))
+        
+        assert new_catalog.stats.categories == rebuilt.categories
+        assert new_catalog.stats.minimum_budgets == rebuilt.minimum_budgets
+        assert new_catalog.stats.saturation_budget() == rebuilt.saturation_budget()
+    
+    def test_removing_a_category_updates_stats(self):
+        """Test that a category disappears once its last product is removed"""
+        catalog = Catalog(sample_product_json)
+        catalog.build_index()
+        storage_ids = [p['id'] for p in sample_product_json if p['category'] == 'Storage']
+        
+        new_catalog = self.updated(catalog, removed_ids=storage_ids)
+        
+        assert 'Storage' not in new_catalog.stats.categories
+        assert new_catalog.stats.minimum_budget(8) is None
+    
+    def test_saturation_kept_when_no_team_can_change(self, monkeypatch):
+        """Test that a change outside the searched candidates doesn't trigger a re-solve"""
+        products = synthetic_catalog(15)
+        catalog = Catalog(products)
+        catalog.build_index()
+        saturation = catalog.stats.saturation_budget()
+        # the worst value product of a category is never a candidate
+        worst = min(catalog.index.categories['Audio'], key=lambda p: p['value'])
+        original = next(p for p in products if p['id'] == worst['id'])
+        
+        new_catalog = self.updated(catalog, upserts=[dict(original, name="Renamed")])
+        monkeypatch.setattr(catalog_stats, "saturation_budget", lambda *args: pytest.fail("re-solved"))
+        
+        assert new_catalog.version != catalog.version
+        assert new_catalog.stats.saturation_budget() == saturation
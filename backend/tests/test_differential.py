@@ -0,0 +1,85 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from differential import ENGINES, check_case, random_case, run, shrink, main
+from logic import find_best_combination
+
+
+def short_team_engine(categories, budget, required_categories, team_size):
+    """Broken engine: leaves the last team member out"""
+    combination = find_best_combination(categories, budget, required_categories, team_size)
+    return combination[:-1] if combination else combination
+
+
+def other_tie_engine(categories, budget, required_categories, team_size):
+    """Broken engine: breaks score ties towards the largest product ids"""
+    return [max(products, key=lambda p: (p['value'], p['id'])) for products in categories.values()][:team_size]
+
+
+class TestDifferentialHarness:
+    """Test cases for the differential solver testing harness"""
+    
+    def test_registered_engines_match_reference(self):
+        """Test that every registered engine agrees with the brute-force reference"""
+        report = run(cases=300, seed=1000)
+        
+        assert set(report) == set(ENGINES) >= {"dp", "fast"}
+        for name, result in report.items():
+            assert result["mismatches"] == [], name
+            assert len(result["speedups"]) == 300
+    
+    def test_random_case_is_reproducible(self):
+        """Test that the seed alone reproduces a case"""
+        assert random_case(42) == random_case(42)
+        assert random_case(42) != random_case(43)
+    
+    def test_mismatch_is_detected_and_shrunk(self):
+        """Test that a broken engine is reported with a smaller reproducer that still fails"""
+        engines = {"broken": short_team_engine}
+        
+        mismatches = run(cases=100, seed=0, engines=engines)["broken"]["mismatches"]
+        
+        assert mismatches
+        minimal = mismatches[0]["case"]
+        assert not check_case(minimal, engines)["engines"]["broken"]["ok"]
+        assert mismatches[0]["reason"] == "team has 0 products, expected 1"
+        # nothing left to remove: a single affordable product is enough to break it
+        assert len(minimal["products"]) == 1
+        assert minimal["team_size"] == 1 and minimal["required_categories"] == ()
+    
+    def test_tie_going_to_another_team_is_detected(self):
+        """Test that an engine returning another team with the optimal score is a mismatch"""
+        case = {
+            "seed": None,
+            "products": [
+                {"id": 1, "name": "Audio 1", "category": "Audio", "price": 100, "rating": 4.0},
+                {"id": 2, "name": "Audio 2", "category": "Audio", "price": 100, "rating": 4.0},
+            ],
+            "budget": 150,
+            "team_size": 1,
+            "required_categories": (),
+        }
+        
+        results = check_case(case, {"dp": ENGINES["dp"], "fast": ENGINES["fast"], "broken": other_tie_engine})["engines"]
+        
+        assert results["dp"]["ok"] and results["fast"]["ok"]
+        assert results["broken"]["reason"] == "team [2] differs from the reference's [1] on a score tie"
+    
+    def test_shrink_keeps_case_failing(self):
+        """Test that shrinking never returns a case the engine passes"""
+        case = next(
+            case for case in map(random_case, range(200))
+            if not check_case(case, {"broken": short_team_engine})["engines"]["broken"]["ok"]
+        )
+        
+        minimal = shrink(case, "broken", short_team_engine)
+        
+        assert len(minimal["products"]) <= len(case["products"])
+        assert not check_case(minimal, {"broken": short_team_engine})["engines"]["broken"]["ok"]
+    
+    def test_cli_exit_code(self, capsys):
+        """Test that the CLI prints the relative speed and succeeds without mismatches"""
+        assert main(["--cases", "20", "--engine", "dp"]) == 0
+        
+        assert "speedup" in capsys.readouterr().out
@@ -0,0 +1,91 @@
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+
+from live import LatestOnly, TeamDiffer, parse_budget_update
+from logic import curate_product_team
+from constants import sample_product_json
+
+
+class TestLatestOnly:
+    """Test cases for the single-slot LatestOnly mailbox"""
+    
+    @pytest.mark.asyncio
+    async def test_newer_value_replaces_pending_one(self):
+        """Test that only the newest pending value is taken and the others counted as dropped"""
+        mailbox = LatestOnly()
+        for budget in (500, 600, 700):
+            mailbox.put(budget)
+        
+        assert await mailbox.get() == 700
+        assert mailbox.dropped == 2
+    
+    @pytest.mark.asyncio
+    async def test_get_waits_for_a_value(self):
+        """Test that get blocks until the next put"""
+        mailbox = LatestOnly()
+        waiter = asyncio.create_task(mailbox.get())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        
+        mailbox.put(800)
+        
+        assert await waiter == 800
+        assert mailbox.dropped == 0
+
+
+class TestParseBudgetUpdate:
+    """Test cases for parsing live budget updates"""
+    
+    def test_valid_update(self):
+        """Test that budget and the optional seq are returned"""
+        assert parse_budget_update('{"budget": 1000, "seq": 3}') == (1000, 3)
+        assert parse_budget_update('{"budget": 0}') == (0, None)
+    
+    @pytest.mark.parametrize("text", ["1000", "not json", '{"budget": -1}', '{"budget": "1000"}', '{"budget": true}'])
+    def test_invalid_update(self, text):
+        """Test that malformed updates raise ValueError"""
+        with pytest.raises(ValueError):
+            parse_budget_update(text)
+
+
+class TestTeamDiffer:
+    """Test cases for the per-connection TeamDiffer"""
+    
+    def test_first_diff_adds_whole_team(self):
+        """Test that the first team is sent in full"""
+        team = curate_product_team(sample_product_json, 1000)
+        
+        diff = TeamDiffer().diff(team)
+        
+        assert [p["id"] for p in diff["added"]] == diff["product_ids"] == [p.id for p in team]
+        assert diff["removed"] == []
+    
+    def test_diff_only_contains_changes(self):
+        """Test that later diffs only carry changed products"""
+        differ = TeamDiffer()
+        small = curate_product_team(sample_product_json, 500)
+        large = curate_product_team(sample_product_json, 3000)
+        differ.diff(small)
+        
+        diff = differ.diff(large)
+        
+        small_ids, large_ids = {p.id for p in small}, {p.id for p in large}
+        assert {p["id"] for p in diff["added"]} == large_ids - small_ids
+        assert set(diff["removed"]) == small_ids - large_ids
+        assert differ.diff(large) == {"added": [], "removed": [], "product_ids": [p.id for p in large]}
+    
+    def test_modified_product_is_resent(self):
+        """Test that a product changed under the same id counts as added"""
+        differ = TeamDiffer()
+        team = curate_product_team(sample_product_json, 1000)
+        differ.diff(team)
+        repriced = [team[0].model_copy(update={"price": team[0].price + 1})] + team[1:]
+        
+        diff = differ.diff(repriced)
+        
+        assert [p["id"] for p in diff["added"]] == [team[0].id]
+        assert diff["removed"] == []
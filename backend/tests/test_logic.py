@@ -1,6 +1,8 @@
 import pytest
+import random
 import sys
 import os
+from unittest.mock import patch
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from logic import (
@@ -8,9 +10,18 @@ from logic import (
     find_best_combination, 
     find_best_products_for_categories,
     calculate_rating_to_price_ratio, 
-    lowest_price_combination
+    lowest_price_combination,
+    category_combinations,
+    exhaustive_best_combination,
+    composite_score,
+    score_weights,
+    team_rank,
+    approximate_best_combination,
+    candidate_products,
+    CatalogIndex,
+    MAX_PRODUCTS_PER_CATEGORY
 )
-from models import Product, ProductCategory
+from models import Product, ProductCategory, TeamConstraints, SolverMode, SolveReport
 from constants import sample_product_json
 
 
@@ -296,3 +307,375 @@ class TestCurateProductTeam:
             assert isinstance(product.category, ProductCategory)
             assert hasattr(product, 'value')
             assert product.value is not None
+
+
+class TestTeamConstraints:
+    """Test cases for constraint-aware team curation"""
+    
+    def test_curate_product_team_includes_required_category(self):
+        """Test that a required category is always part of the team"""
+        constraints = TeamConstraints(include_categories=[ProductCategory.storage, ProductCategory.peripherals])
+        
+        result = curate_product_team(sample_product_json, 600, constraints)
+        
+        categories = set(p.category for p in result)
+        assert len(result) == 5
+        assert {ProductCategory.storage, ProductCategory.peripherals} <= categories
+    
+    def test_curate_product_team_excludes_products(self):
+        """Test that excluded products are replaced rather than dropping the team"""
+        unconstrained = curate_product_team(sample_product_json, 5000)
+        excluded = [p.id for p in unconstrained[:2]]
+        
+        result = curate_product_team(sample_product_json, 5000, TeamConstraints(exclude_ids=excluded))
+        
+        assert len(result) == 5
+        assert not set(excluded) & set(p.id for p in result)
+    
+    def test_curate_product_team_max_item_price_and_min_rating(self):
+        """Test the per-item price cap and minimum rating filters"""
+        constraints = TeamConstraints(max_item_price=150, min_rating=4.2)
+        
+        result = curate_product_team(sample_product_json, 2000, constraints)
+        
+        assert len(result) == 5
+        assert all(p.price <= 150 and p.rating >= 4.2 for p in result)
+    
+    def test_curate_product_team_unsatisfiable_constraints(self):
+        """Test that constraints leaving fewer than 5 categories return an empty team"""
+        result = curate_product_team(sample_product_json, 5000, TeamConstraints(min_rating=4.8))
+        
+        assert result == []
+    
+    def test_lowest_price_combination_with_constraints(self):
+        """Test that the minimum budget accounts for required categories and filters"""
+        unconstrained = lowest_price_combination(sample_product_json)
+        with_storage = lowest_price_combination(
+            sample_product_json, TeamConstraints(include_categories=[ProductCategory.storage])
+        )
+        
+        assert with_storage > unconstrained
+        with pytest.raises(ValueError):
+            lowest_price_combination(sample_product_json, TeamConstraints(min_rating=4.8))
+    
+    def test_category_combinations_only_enumerates_remaining_slots(self):
+        """Test that required categories shrink the subsets generated"""
+        names = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']
+        
+        all_subsets = list(category_combinations(names, 5))
+        required = list(category_combinations(names, 5, ('B', 'G')))
+        
+        assert len(all_subsets) == 56
+        assert len(required) == 20  # C(6, 3)
+        assert all('B' in subset and 'G' in subset for subset in required)
+        assert all(list(subset) == sorted(subset) for subset in required)
+
+
+class TestTeamSize:
+    """Test cases for configurable team sizes and the dynamic programming solver"""
+    
+    def test_find_best_combination_matches_exhaustive_search(self):
+        """Test that the DP solver finds the same team as the exhaustive reference"""
+        categories = CatalogIndex(sample_product_json).categories
+        
+        for team_size in range(1, 9):
+            for budget in range(0, 3000, 97):
+                fast = find_best_combination(categories, budget, (), team_size)
+                reference = exhaustive_best_combination(categories, budget, (), team_size)
+                
+                assert (fast is None) == (reference is None), (team_size, budget)
+                if fast:
+                    fast_score = composite_score(sum(p['value'] for p in fast), sum(p['price'] for p in fast), budget)
+                    reference_score = composite_score(
+                        sum(p['value'] for p in reference), sum(p['price'] for p in reference), budget
+                    )
+                    assert fast_score == pytest.approx(reference_score), (team_size, budget)
+                    assert sorted(p['id'] for p in fast) == sorted(p['id'] for p in reference), (team_size, budget)
+    
+    def test_engines_break_ties_the_same_way(self):
+        """Test that every engine picks the team with the smallest ids among equal scores"""
+        products = [
+            {"id": product_id, "name": f"{category} {product_id}", "price": 100, "rating": 4.0, "category": category}
+            for product_id, category in [(7, "Audio"), (3, "Audio"), (5, "Displays"), (2, "Displays"), (4, "Cameras")]
+        ]
+        categories = CatalogIndex(products).categories
+        
+        results = [
+            find_best_combination(categories, 250, (), 2),
+            exhaustive_best_combination(categories, 250, (), 2),
+            approximate_best_combination(categories, 250, (), 2)[0],
+        ]
+        
+        for result in results:
+            assert sorted(p['id'] for p in result) == [2, 3]
+        by_id = {p['id']: p for ps in categories.values() for p in ps}
+        assert team_rank(results[0], 250) > team_rank([by_id[7], by_id[5]], 250)
+    
+    @pytest.mark.parametrize("team_size", [1, 3, 8])
+    def test_curate_product_team_with_team_size(self, team_size):
+        """Test that teams of other sizes use distinct categories within budget"""
+        constraints = TeamConstraints(team_size=team_size)
+        budget = lowest_price_combination(sample_product_json, constraints) + 200
+        
+        result = curate_product_team(sample_product_json, budget, constraints)
+        
+        assert len(result) == team_size
+        assert len(set(p.category for p in result)) == team_size
+        assert sum(p.price for p in result) <= budget
+    
+    def test_curate_product_team_larger_than_category_count(self):
+        """Test that asking for more members than categories returns an empty team"""
+        result = curate_product_team(sample_product_json, 10000, TeamConstraints(team_size=9))
+        
+        assert result == []
+    
+    def test_lowest_price_combination_per_team_size(self):
+        """Test the minimum budget for different team sizes"""
+        assert lowest_price_combination(sample_product_json, TeamConstraints(team_size=1)) == 20
+        assert lowest_price_combination(sample_product_json, TeamConstraints(team_size=3)) == 20 + 40 + 45
+        # all 8 categories: the cheapest product of every category
+        assert lowest_price_combination(sample_product_json, TeamConstraints(team_size=8)) == 20 + 80 + 45 + 60 + 150 + 40 + 130 + 95
+        with pytest.raises(ValueError, match="Not enough categories available"):
+            lowest_price_combination(sample_product_json, TeamConstraints(team_size=9))
+
+
+class TestFastMode:
+    """Test cases for the anytime (fast) solver mode"""
+    
+    def setup_method(self):
+        """Set up a catalog with more products per category than the sample"""
+        rng = random.Random(7)
+        categories = [category.value for category in ProductCategory]
+        self.products = [
+            {"id": i, "name": f"Product {i}", "category": rng.choice(categories),
+             "price": rng.randint(5, 400), "rating": round(rng.uniform(1.0, 5.0), 1)}
+            for i in range(60)
+        ]
+    
+    def weighted_score(self, team, budget):
+        value_weight, cost_weight = score_weights(budget)
+        return sum(value_weight * p.value + cost_weight * p.price for p in team)
+    
+    def test_fast_mode_with_time_left_is_proven_optimal(self):
+        """Test that a generous deadline lets the fast mode prove optimality"""
+        report = SolveReport()
+        
+        fast = curate_product_team(self.products, 900, None, SolverMode.fast, 1000, report)
+        exact = curate_product_team(self.products, 900)
+        
+        assert report.mode == SolverMode.fast
+        assert report.proven_optimal is True
+        assert report.optimality_gap == 0.0
+        assert self.weighted_score(fast, 900) == pytest.approx(self.weighted_score(exact, 900))
+    
+    def test_fast_mode_gap_bounds_the_optimum(self):
+        """Test that without time for the exact solve the reported gap is a true bound"""
+        for budget in range(150, 1500, 50):
+            report = SolveReport()
+            fast = curate_product_team(self.products, budget, None, SolverMode.fast, 1e-6, report)
+            exact = curate_product_team(self.products, budget)
+            
+            assert len(fast) == len(exact) == 5
+            assert sum(p.price for p in fast) <= budget
+            fast_score = self.weighted_score(fast, budget)
+            exact_score = self.weighted_score(exact, budget)
+            assert fast_score <= exact_score + 1e-9
+            # upper bound = fast score / (1 - gap) must not be below the optimum
+            assert exact_score <= fast_score / (1 - report.optimality_gap) + 1e-9
+            if report.proven_optimal:
+                assert fast_score == pytest.approx(exact_score)
+    
+    def test_fast_mode_respects_constraints(self):
+        """Test that the greedy seed and local search keep required categories"""
+        constraints = TeamConstraints(include_categories=[ProductCategory.storage], team_size=3)
+        
+        result = curate_product_team(sample_product_json, 400, constraints, SolverMode.fast, 1e-6)
+        
+        assert len(result) == 3
+        assert ProductCategory.storage in [p.category for p in result]
+        assert sum(p.price for p in result) <= 400
+    
+    def test_approximate_best_combination_without_feasible_team(self):
+        """Test that an impossible budget returns no team, proven optimal"""
+        categories = CatalogIndex(sample_product_json).categories
+        
+        combination, upper_bound, proven_optimal = approximate_best_combination(categories, 100)
+        
+        assert combination is None
+        assert proven_optimal is True
+
+
+class TestProductModelPool:
+    """Test cases for the shared Product models of a catalog index"""
+    
+    def test_responses_share_prebuilt_models(self):
+        """Test that teams are assembled from the index's models, not new instances"""
+        index = CatalogIndex(sample_product_json)
+        index.build_models()
+        
+        first = curate_product_team(index, 1000)
+        second = curate_product_team(index, 1200, TeamConstraints(min_rating=4.0))
+        
+        assert all(product is index.models[product.id] for product in first + second)
+        assert len(index.models) == len(sample_product_json)
+    
+    def test_models_are_immutable(self):
+        """Test that a shared model can't be modified by one response"""
+        product = curate_product_team(sample_product_json, 1000)[0]
+        
+        with pytest.raises(Exception):
+            product.price = 1
+    
+    def test_models_match_product_data(self):
+        """Test that pooled models carry the same fields as the product dictionaries"""
+        index = CatalogIndex(sample_product_json)
+        index.build_models()
+        
+        for product in index.products:
+            model = index.models[product['id']]
+            assert (model.name, model.price, model.rating, model.value) == (
+                product['name'], product['price'], product['rating'], product['value']
+            )
+            assert model.category == ProductCategory(product['category'])
+    
+    def test_unchanged_models_are_reused_across_versions(self):
+        """Test that a new catalog version only validates the changed products"""
+        old = CatalogIndex(sample_product_json)
+        old.build_models()
+        changed = dict(sample_product_json[0], price=sample_product_json[0]['price'] + 1)
+        
+        new = CatalogIndex([changed] + sample_product_json[1:])
+        new.build_models(old, {changed['id']})
+        
+        assert new.models[changed['id']].price == changed['price']
+        assert all(new.models[p['id']] is old.models[p['id']] for p in sample_product_json[1:])
+
+
+class TestCandidateIndex:
+    """Test cases for the budget-aware candidates of a catalog index"""
+    
+    def setup_method(self):
+        """Audio has ten well-rated products just out of reach, and a cheaper, lower-value one"""
+        self.products = [
+            {"id": i, "name": f"Speaker {i}", "category": "Audio", "price": 50, "rating": 5.0}
+            for i in range(1, 11)
+        ] + [
+            {"id": 11, "name": "Budget Speaker", "category": "Audio", "price": 30, "rating": 2.4},
+            {"id": 12, "name": "Premium Speaker", "category": "Audio", "price": 60, "rating": 5.0},
+            {"id": 13, "name": "Cable", "category": "Electronics", "price": 10, "rating": 4.0},
+            {"id": 14, "name": "USB Stick", "category": "Storage", "price": 15, "rating": 4.0},
+        ]
+    
+    def test_affordable_product_beyond_top_ten_is_chosen(self):
+        """Test that products no team can afford don't take the slots of ones that fit"""
+        constraints = TeamConstraints(team_size=1, include_categories=[ProductCategory.audio])
+        
+        result = curate_product_team(self.products, 40, constraints)
+        
+        assert [product.id for product in result] == [11]
+        # without the requirement the cable is the better team
+        assert [product.id for product in curate_product_team(self.products, 40, TeamConstraints(team_size=1))] == [13]
+    
+    def test_unknown_constraint_is_rejected(self):
+        """Test that a misspelled restriction fails instead of being ignored"""
+        with pytest.raises(ValueError):
+            TeamConstraints(team_size=2, required_categories=["Audio"])
+    
+    def test_max_affordable_prices(self):
+        """Test that each category's limit leaves room for the cheapest other categories"""
+        index = CatalogIndex(self.products)
+        
+        assert index.max_affordable_prices(100, 2) == {"Audio": 90, "Electronics": 85, "Storage": 90}
+        assert index.max_affordable_prices(100, 3) == {"Audio": 75, "Electronics": 55, "Storage": 60}
+        assert index.max_affordable_prices(100, 4) == {}
+    
+    def test_candidates_only_include_products_that_fit(self):
+        """Test that low budgets only leave the products some team can afford"""
+        index = CatalogIndex(self.products)
+        
+        assert [p['id'] for p in index.candidates(40, 2)["Audio"]] == [11]
+        assert len(index.candidates(1000, 2)["Audio"]) == MAX_PRODUCTS_PER_CATEGORY
+        assert all(products == [] for products in index.candidates(20, 3).values())
+    
+    def test_candidate_ids_are_candidates_at_some_budget(self):
+        """Test that a product is a candidate unless enough better, cheaper products exist"""
+        index = CatalogIndex(self.products)
+        
+        # the premium speaker ranks behind ten cheaper speakers, so it never gets a slot
+        assert index.candidate_ids("Audio") == set(range(1, 12))
+        seen = set()
+        for budget in range(0, 200):
+            for team_size in (1, 2, 3):
+                seen.update(p['id'] for p in index.candidates(budget, team_size)["Audio"])
+        assert seen == index.candidate_ids("Audio")
+    
+    def test_candidates_match_linear_reference(self):
+        """Test the bisected candidates against a linear scan on random catalogs"""
+        rng = random.Random(7)
+        for _ in range(50):
+            products = [
+                {
+                    "id": i,
+                    "name": f"Product {i}",
+                    "category": rng.choice([category.value for category in ProductCategory]),
+                    "price": rng.choice([rng.randint(1, 300), rng.randrange(25, 301, 25)]),
+                    "rating": rng.choice([3.0, 4.0, 5.0, round(rng.uniform(1.0, 5.0), 1)]),
+                }
+                for i in range(1, rng.randint(2, 120))
+            ]
+            index = CatalogIndex(products)
+            for team_size in range(1, 7):
+                budget = rng.randint(0, 200 * team_size)
+                assert index.candidates(budget, team_size) == candidate_products(index.categories, budget, team_size)
+
+
+class TestRestrictedIndex:
+    """Test cases for the per-request restricted view of a catalog index"""
+    
+    def test_matches_filtered_index(self):
+        """Test the restricted view against an index rebuilt from the allowed products"""
+        rng = random.Random(11)
+        for _ in range(100):
+            products = [
+                {
+                    "id": i,
+                    "name": f"Product {i}",
+                    "category": rng.choice([category.value for category in ProductCategory]),
+                    "price": rng.randint(1, 300),
+                    "rating": rng.choice([3.0, 4.0, 4.5, 5.0]),
+                }
+                for i in range(1, rng.randint(5, 150))
+            ]
+            index = CatalogIndex(products)
+            constraints = TeamConstraints(
+                team_size=rng.randint(1, 5),
+                exclude_ids=rng.sample(range(1, 50), rng.randint(0, 10)),
+                max_item_price=rng.choice([None, rng.randint(20, 300)]),
+                min_rating=rng.choice([None, 4.0, 4.5]),
+            )
+            budget = rng.randint(0, 900)
+            view, filtered = index.restricted(constraints), index.filtered(constraints)
+            
+            assert view.min_price_by_category == filtered.min_price_by_category
+            assert view.candidates(budget, constraints.team_size) == candidate_products(
+                filtered.categories, budget, constraints.team_size
+            )
+    
+    def test_constrained_request_doesnt_rebuild_index(self):
+        """Test that constrained solves reuse the prebuilt index instead of indexing the allowed products"""
+        index = CatalogIndex(sample_product_json)
+        constraints = TeamConstraints(exclude_ids=[1], max_item_price=300, min_rating=4.0)
+        
+        with patch.object(CatalogIndex, "__init__", side_effect=AssertionError("index rebuilt")):
+            view = index.restricted(constraints)
+            minimum = lowest_price_combination(view, constraints)
+            result = curate_product_team(view, minimum + 300, constraints)
+        
+        assert result and all(constraints.allows(product.model_dump(mode="json")) for product in result)
+    
+    def test_unconstrained_view_is_the_index(self):
+        """Test that constraints without product filters don't create a view"""
+        index = CatalogIndex(sample_product_json)
+        
+        assert index.restricted(None) is index
+        assert index.restricted(TeamConstraints(team_size=3)) is index
@@ -7,8 +7,13 @@ from fastapi.testclient import TestClient
 from fastapi import HTTPException
 from unittest.mock import patch, MagicMock
 import json
+import time
+import asyncio
+import threading
 
-from main import app, build_team
+import main
+from main import app, build_team, warm_up, update_catalog, get_catalog
+from startup import StartupPipeline
 from models import TeamBuilderResponse, Product, ProductCategory
 from constants import sample_product_json
 from logic import lowest_price_combination
@@ -317,3 +322,636 @@ class TestAPIIntegration:
         for response in responses:
             for product in response["products"]:
                 assert all(field in product for field in ["id", "name", "price", "rating", "category", "value"])
+
+
+class TestTeamBuilderHTTPCaching:
+    """Test cases for ETag / Cache-Control handling on the team builder endpoint"""
+    
+    def setup_method(self):
+        """Set up test data for each test"""
+        self.budget = lowest_price_combination(sample_product_json) + 100
+    
+    def test_team_builder_sets_caching_headers(self):
+        """Test that successful responses carry an ETag and Cache-Control"""
+        response = client.get(f"/team-builder?budget={self.budget}")
+        
+        assert response.status_code == 200
+        assert response.headers["etag"].startswith('"')
+        assert "max-age" in response.headers["cache-control"]
+    
+    def test_team_builder_etag_is_stable_per_budget(self):
+        """Test that the same budget yields the same ETag and different budgets differ"""
+        first = client.get(f"/team-builder?budget={self.budget}")
+        second = client.get(f"/team-builder?budget={self.budget}")
+        other = client.get(f"/team-builder?budget={self.budget + 1}")
+        
+        assert first.headers["etag"] == second.headers["etag"]
+        assert first.headers["etag"] != other.headers["etag"]
+    
+    def test_team_builder_if_none_match_returns_304_without_solving(self):
+        """Test that a matching If-None-Match short-circuits before the solver"""
+        etag = client.get(f"/team-builder?budget={self.budget}").headers["etag"]
+        
+        with patch('main.curate_product_team') as mock_curate, \
+                patch('main.lowest_price_combination') as mock_lowest_price:
+            response = client.get(
+                f"/team-builder?budget={self.budget}",
+                headers={"If-None-Match": etag}
+            )
+        
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+        mock_curate.assert_not_called()
+        mock_lowest_price.assert_not_called()
+    
+    def test_team_builder_etag_changes_with_solver_version(self, monkeypatch):
+        """Test that a solver release invalidates the teams clients and caches hold"""
+        etag = client.get(f"/team-builder?budget={self.budget}").headers["etag"]
+        monkeypatch.setattr(main, "SOLVER_VERSION", main.SOLVER_VERSION + 1)
+        
+        response = client.get(f"/team-builder?budget={self.budget}", headers={"If-None-Match": etag})
+        
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+    
+    def test_team_builder_stale_etag_returns_full_response(self):
+        """Test that a non-matching If-None-Match gets a normal 200 response"""
+        response = client.get(
+            f"/team-builder?budget={self.budget}",
+            headers={"If-None-Match": '"stale"'}
+        )
+        
+        assert response.status_code == 200
+        assert len(response.json()["products"]) == 5
+    
+    def test_team_builder_error_has_no_etag(self):
+        """Test that 400 responses are not given a cache validator"""
+        response = client.get("/team-builder?budget=1")
+        
+        assert response.status_code == 400
+        assert "etag" not in response.headers
+
+
+class TestMetricsEndpoint:
+    """Test cases for the metrics endpoint"""
+    
+    def test_metrics_reports_coalescing_per_key(self):
+        """Test that solver runs show up in the coalescing metrics"""
+        budget = lowest_price_combination(sample_product_json) + 123
+        client.get(f"/team-builder?budget={budget}")
+        
+        response = client.get("/metrics")
+        
+        assert response.status_code == 200
+        keys = response.json()["coalescing"]["keys"]
+        matching = [m for key, m in keys.items() if f", {budget}, " in key]
+        assert matching and matching[0]["executions"] >= 1
+
+
+class TestReadinessEndpoint:
+    """Test cases for the readiness probe and startup pipeline"""
+    
+    def test_ready_returns_503_before_warm_up(self):
+        """Test that the probe fails while the worker is still cold"""
+        with patch('main.startup', StartupPipeline()):
+            response = client.get("/ready")
+        
+        assert response.status_code == 503
+        assert response.json()["ready"] is False
+    
+    def test_ready_turns_green_after_lifespan_warm_up(self):
+        """Test that running the lifespan warms the worker and times every phase"""
+        with patch('main.startup', StartupPipeline()):
+            with TestClient(app) as lifespan_client:
+                deadline = time.monotonic() + 5
+                response = lifespan_client.get("/ready")
+                while response.status_code != 200 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                    response = lifespan_client.get("/ready")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["ready"] is True
+        assert "warm_up_solve" in data["phases_ms"]
+    
+    def test_warm_up_failure_keeps_worker_not_ready(self):
+        """Test that a failing warm-up solve leaves the probe red"""
+        pipeline = StartupPipeline()
+        with patch('main.startup', pipeline), \
+                patch('main.curate_product_team', side_effect=RuntimeError("solver broken")):
+            with pytest.raises(RuntimeError):
+                warm_up()
+        
+        assert pipeline.ready is False
+        assert "solver broken" in pipeline.error
+    
+    def test_metrics_include_startup_phases(self):
+        """Test that the import phase is exposed through the metrics endpoint"""
+        response = client.get("/metrics")
+        
+        assert "import" in response.json()["startup"]["phases_ms"]
+
+
+class TestCatalogUpdates:
+    """Test cases for updating the served catalog"""
+    
+    def test_update_catalog_changes_served_team_and_etag(self):
+        """Test that a price change is reflected in responses and validators"""
+        budget = 10000
+        before = client.get(f"/team-builder?budget={budget}")
+        
+        # make the 4K Monitor so cheap and well rated it must be picked
+        stats = update_catalog(upserts=[dict(sample_product_json[10], price=1, rating=5.0)])
+        after = client.get(f"/team-builder?budget={budget}")
+        
+        assert stats["resolved"] >= 1
+        assert after.headers["etag"] != before.headers["etag"]
+        assert 11 in [p["id"] for p in after.json()["products"]]
+        assert [p for p in after.json()["products"] if p["id"] == 11][0]["price"] == 1
+
+
+class TestTeamBuilderConstraints:
+    """Test cases for constraint query parameters on the team builder endpoint"""
+    
+    def test_team_builder_with_constraints(self):
+        """Test that constraints are applied to the returned team"""
+        response = client.get(
+            "/team-builder?budget=1500&include_category=Storage&exclude_id=20&max_item_price=300&min_rating=4.2"
+        )
+        
+        assert response.status_code == 200
+        products = response.json()["products"]
+        assert len(products) == 5
+        assert "Storage" in [p["category"] for p in products]
+        assert 20 not in [p["id"] for p in products]
+        assert all(p["price"] <= 300 and p["rating"] >= 4.2 for p in products)
+    
+    def test_team_builder_unsatisfiable_constraints(self):
+        """Test that impossible constraints are rejected with a 400"""
+        response = client.get("/team-builder?budget=5000&min_rating=4.8")
+        
+        assert response.status_code == 400
+        assert "constraints" in response.json()["detail"]
+    
+    def test_team_builder_constrained_minimum_budget(self):
+        """Test that the minimum budget message reflects the constraints"""
+        unconstrained_minimum = lowest_price_combination(sample_product_json)
+        
+        response = client.get(f"/team-builder?budget={unconstrained_minimum}&include_category=Storage")
+        
+        assert response.status_code == 400
+        assert "must be at least" in response.json()["detail"]
+    
+    def test_team_builder_invalid_category(self):
+        """Test that unknown categories are rejected by validation"""
+        response = client.get("/team-builder?budget=1000&include_category=Toys")
+        
+        assert response.status_code == 422
+    
+    def test_team_builder_constraints_change_etag_not_order(self):
+        """Test that the ETag depends on constraints but not on parameter order"""
+        plain = client.get("/team-builder?budget=1000")
+        first = client.get("/team-builder?budget=1000&exclude_id=1&exclude_id=2")
+        second = client.get("/team-builder?budget=1000&exclude_id=2&exclude_id=1")
+        
+        assert plain.headers["etag"] != first.headers["etag"]
+        assert first.headers["etag"] == second.headers["etag"]
+
+
+class TestTeamBuilderTeamSize:
+    """Test cases for the team_size query parameter"""
+    
+    @pytest.mark.parametrize("team_size", [3, 8])
+    def test_team_builder_team_size(self, team_size):
+        """Test that the endpoint returns teams of the requested size"""
+        response = client.get(f"/team-builder?budget=2000&team_size={team_size}")
+        
+        assert response.status_code == 200
+        products = response.json()["products"]
+        assert len(products) == team_size
+        assert len(set(p["category"] for p in products)) == team_size
+    
+    def test_team_builder_team_size_above_category_count(self):
+        """Test that a team larger than the number of categories is rejected"""
+        response = client.get("/team-builder?budget=2000&team_size=9")
+        
+        assert response.status_code == 400
+        assert "No team of 9 products" in response.json()["detail"]
+    
+    def test_team_builder_team_size_zero(self):
+        """Test that team_size must be at least 1"""
+        response = client.get("/team-builder?budget=2000&team_size=0")
+        
+        assert response.status_code == 422
+    
+    def test_team_builder_default_team_size_shares_etag(self):
+        """Test that an explicit default team size is the same request as omitting it"""
+        implicit = client.get("/team-builder?budget=1000")
+        explicit = client.get("/team-builder?budget=1000&team_size=5")
+        
+        assert implicit.headers["etag"] == explicit.headers["etag"]
+
+
+class TestTeamBuilderFastMode:
+    """Test cases for the mode=fast query parameter"""
+    
+    def test_team_builder_fast_mode_reports_quality(self):
+        """Test that the fast mode returns a team with a solver report"""
+        response = client.get("/team-builder?budget=1000&mode=fast&deadline_ms=50")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["products"]) == 5
+        assert data["solver"]["mode"] == "fast"
+        assert data["solver"]["proven_optimal"] is True
+        assert data["solver"]["optimality_gap"] == 0.0
+    
+    def test_team_builder_exact_mode_has_no_report(self):
+        """Test that the default exact mode keeps the response unchanged"""
+        response = client.get("/team-builder?budget=1000")
+        
+        assert set(response.json()) == {"status", "message", "budget", "products", "total_cost"}
+    
+    def test_team_builder_fast_mode_etag_differs_from_exact(self):
+        """Test that fast and exact representations get distinct validators"""
+        exact = client.get("/team-builder?budget=1000")
+        fast = client.get("/team-builder?budget=1000&mode=fast")
+        
+        assert exact.headers["etag"] != fast.headers["etag"]
+    
+    def test_team_builder_invalid_mode_and_deadline(self):
+        """Test validation of mode and deadline_ms"""
+        assert client.get("/team-builder?budget=1000&mode=slow").status_code == 422
+        assert client.get("/team-builder?budget=1000&mode=fast&deadline_ms=0").status_code == 422
+
+
+class TestTeamBuilderDebugTrace:
+    """Test cases for the debug query parameter"""
+    
+    def test_team_builder_debug_returns_trace(self):
+        """Test that debug=true returns the solver work counters and stage timings"""
+        response = client.get("/team-builder?budget=1000&debug=true")
+        
+        assert response.status_code == 200
+        trace = response.json()["trace"]
+        assert trace["counters"]["team_cache_misses"] == 1
+        assert trace["counters"]["combinations_enumerated"] > 0
+        assert {"minimum_budget", "search", "serialize"} <= set(trace["stages_ms"])
+        # traced responses are never cached
+        assert "etag" not in response.headers
+        assert response.headers["cache-control"] == "no-store"
+    
+    def test_team_builder_debug_reports_cache_hit(self):
+        """Test that a cached team shows up in the trace instead of solver work"""
+        client.get("/team-builder?budget=1000")
+        response = client.get("/team-builder?budget=1000&debug=true")
+        
+        counters = response.json()["trace"]["counters"]
+        assert counters["team_cache_hits"] == 1
+        assert "combinations_enumerated" not in counters
+    
+    def test_team_builder_without_debug_has_no_trace(self):
+        """Test that the trace field is left out by default"""
+        response = client.get("/team-builder?budget=1000")
+        
+        assert "trace" not in response.json()
+
+
+class TestTeamBuilderCatalogs:
+    """Test cases for serving several catalogs (tenants)"""
+    
+    @pytest.fixture
+    def catalog_dir(self, tmp_path, monkeypatch):
+        """A CATALOG_DIR with a small storefront catalog"""
+        cheap = [dict(product, price=max(1, product["price"] // 10)) for product in sample_product_json]
+        (tmp_path / "outlet.json").write_text(json.dumps(cheap))
+        monkeypatch.setenv("CATALOG_DIR", str(tmp_path))
+        return tmp_path
+    
+    def test_team_builder_uses_requested_catalog(self, catalog_dir):
+        """Test that each catalog is solved against its own products"""
+        budget = lowest_price_combination(sample_product_json) - 1
+        
+        default = client.get(f"/team-builder?budget={budget}")
+        outlet = client.get(f"/team-builder?budget={budget}&catalog=outlet")
+        
+        assert default.status_code == 400
+        assert outlet.status_code == 200
+        assert len(outlet.json()["products"]) == 5
+        resident = [c["id"] for c in client.get("/metrics").json()["catalogs"]["resident"]]
+        assert resident == ["default", "outlet"]
+    
+    def test_team_builder_unknown_catalog(self, catalog_dir):
+        """Test that an unknown catalog is a 404"""
+        response = client.get("/team-builder?budget=1000&catalog=nope")
+        
+        assert response.status_code == 404
+    
+    def test_team_builder_rejects_invalid_catalog_id(self, catalog_dir):
+        """Test that catalog ids can't be used to reach other paths"""
+        response = client.get("/team-builder?budget=1000&catalog=../outlet")
+        
+        assert response.status_code == 422
+    
+    def test_update_catalog_only_changes_that_catalog(self, catalog_dir):
+        """Test that updating one tenant's catalog leaves the others untouched"""
+        default_version = get_catalog().version
+        outlet_version = get_catalog("outlet").version
+        
+        stats = update_catalog(removed_ids=[1], catalog_id="outlet")
+        
+        assert get_catalog().version == default_version
+        assert get_catalog("outlet").version == stats["version"] != outlet_version
+    
+    def test_updated_catalog_survives_memory_pressure(self, catalog_dir):
+        """Test that an updated catalog is never evicted (and reloaded without the update)"""
+        (catalog_dir / "clearance.json").write_text(json.dumps(sample_product_json))
+        stats = update_catalog(removed_ids=[1], catalog_id="outlet")
+        
+        with patch.object(main.catalogs, "memory_budget_bytes", 1):
+            # loading another catalog evicts every unpinned catalog but itself
+            get_catalog("clearance")
+        
+        assert [c["id"] for c in main.catalogs.snapshot()["resident"]] == ["outlet", "clearance"]
+        assert get_catalog("outlet").version == stats["version"]
+    
+    def test_lazy_catalog_load_runs_off_the_event_loop(self, catalog_dir):
+        """Test that loading a cold catalog doesn't block the event loop thread"""
+        loaded_in = []
+        original = main.catalogs._factory
+        
+        def factory(catalog_id):
+            try:
+                asyncio.get_running_loop()
+                loaded_in.append("event loop")
+            except RuntimeError:
+                loaded_in.append("worker thread")
+            return original(catalog_id)
+        
+        with patch.object(main.catalogs, "_factory", factory):
+            response = client.get("/team-builder?budget=1000&catalog=outlet")
+            client.get("/team-builder?budget=1000&catalog=outlet")
+        
+        assert response.status_code == 200
+        # loaded once, and the second request found it resident
+        assert loaded_in == ["worker thread"]
+
+
+class TestLiveTeamBuilder:
+    """Test cases for the /team-builder/live websocket"""
+    
+    def test_live_sends_team_then_diffs(self):
+        """Test that the first answer carries the whole team and later ones only changes"""
+        with client.websocket_connect("/team-builder/live") as websocket:
+            websocket.send_json({"budget": 500, "seq": 1})
+            first = websocket.receive_json()
+            websocket.send_json({"budget": 3000, "seq": 2})
+            second = websocket.receive_json()
+        
+        assert first["type"] == "team" and first["seq"] == 1
+        assert len(first["added"]) == 5 and first["removed"] == []
+        expected = build_team_ids(3000)
+        assert second["product_ids"] == expected
+        assert {p["id"] for p in second["added"]} == set(expected) - set(first["product_ids"])
+        assert set(second["removed"]) == set(first["product_ids"]) - set(expected)
+    
+    def test_live_reports_errors_and_keeps_team(self):
+        """Test that a budget below the minimum is an error that doesn't reset the diff state"""
+        min_budget = lowest_price_combination(sample_product_json)
+        with client.websocket_connect("/team-builder/live") as websocket:
+            websocket.send_json({"budget": 1000})
+            team = websocket.receive_json()
+            websocket.send_json({"budget": min_budget - 1})
+            error = websocket.receive_json()
+            websocket.send_text("nonsense")
+            invalid = websocket.receive_json()
+            websocket.send_json({"budget": 1000})
+            unchanged = websocket.receive_json()
+        
+        assert error["type"] == "error" and error["status_code"] == 400
+        assert invalid["type"] == "error" and invalid["status_code"] == 422
+        assert unchanged["added"] == [] and unchanged["removed"] == []
+        assert unchanged["product_ids"] == team["product_ids"]
+    
+    def test_live_answers_latest_budget(self):
+        """Test that a burst of updates always ends with the answer to the last one"""
+        budgets = list(range(400, 2000, 50))
+        with client.websocket_connect("/team-builder/live?team_size=3") as websocket:
+            for seq, budget in enumerate(budgets):
+                websocket.send_json({"budget": budget, "seq": seq})
+            answers = [websocket.receive_json()]
+            while answers[-1]["seq"] != len(budgets) - 1:
+                answers.append(websocket.receive_json())
+        
+        seqs = [answer["seq"] for answer in answers]
+        assert seqs == sorted(seqs)
+        assert all(len(answer["product_ids"]) == 3 for answer in answers)
+    
+    def test_live_updates_go_through_admission(self, monkeypatch):
+        """Test that streamed budgets are charged to the client like /team-builder requests"""
+        from admission import AdmissionController
+        monkeypatch.setattr(main, "admission", AdmissionController(rate=1, burst=20, max_pending_cost=1000))
+        with client.websocket_connect("/team-builder/live") as websocket:
+            answers = []
+            for seq, budget in enumerate(range(3000, 3100, 10)):
+                websocket.send_json({"budget": budget, "seq": seq})
+                answers.append(websocket.receive_json())
+        
+        assert answers[0]["type"] == "team"
+        assert any(answer["type"] == "error" and answer["status_code"] == 429 for answer in answers)
+        snapshot = main.admission.snapshot()
+        assert snapshot["rate_limited"] >= 1 and snapshot["pending_cost"] == 0
+    
+    def test_live_update_shed_when_overloaded(self):
+        """Test that a streamed budget gets a 503 error once too much work is in progress"""
+        main.admission.pending_cost = main.admission.max_pending_cost
+        with client.websocket_connect("/team-builder/live") as websocket:
+            websocket.send_json({"budget": 3000, "seq": 1})
+            error = websocket.receive_json()
+        
+        assert error == {"type": "error", "seq": 1, "budget": 3000, "status_code": 503,
+                         "detail": "Server is busy, please retry shortly"}
+    
+    def test_live_unknown_catalog_closes(self):
+        """Test that connecting to an unknown catalog closes the socket"""
+        from starlette.websockets import WebSocketDisconnect
+        
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            with client.websocket_connect("/team-builder/live?catalog=nope") as websocket:
+                websocket.receive_json()
+        
+        assert exc_info.value.code == 1008
+
+
+def build_team_ids(budget):
+    """Ids of the team /team-builder returns for a budget"""
+    return [p["id"] for p in client.get(f"/team-builder?budget={budget}").json()["products"]]
+
+
+class TestTeamBuilderAdmission:
+    """Test cases for cost-aware admission control on /team-builder"""
+    
+    def test_expensive_burst_is_rate_limited(self, monkeypatch):
+        """Test that a burst of expensive solves gets 429 while cheap requests still pass"""
+        import main
+        from admission import AdmissionController
+        monkeypatch.setattr(main, "admission", AdmissionController(rate=1, burst=20, max_pending_cost=1000))
+        min_budget = lowest_price_combination(sample_product_json)
+        
+        statuses = [client.get(f"/team-builder?budget={budget}").status_code for budget in range(3000, 3100, 10)]
+        rejected = client.get("/team-builder?budget=4000")
+        cheap = client.get(f"/team-builder?budget={min_budget - 1}")
+        
+        assert statuses[0] == 200 and 429 in statuses
+        assert rejected.status_code == 429
+        assert int(rejected.headers["retry-after"]) >= 1
+        # a too-small budget is still answered, it costs a single token
+        assert cheap.status_code == 400
+        assert client.get("/metrics").json()["admission"]["rate_limited"] >= 2
+    
+    def test_overloaded_worker_sheds_with_503(self):
+        """Test that requests are shed once too much work is in progress"""
+        import main
+        main.admission.pending_cost = main.admission.max_pending_cost
+        
+        response = client.get("/team-builder?budget=3000")
+        
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+
+    
+    @pytest.mark.asyncio
+    async def test_burst_joining_one_solve_is_admitted(self, monkeypatch):
+        """Test that requests coalesced onto a solve in flight are neither shed nor charged its cost"""
+        import main
+        from admission import AdmissionController
+        from starlette.requests import Request
+        monkeypatch.setattr(main, "admission", AdmissionController(rate=1, burst=200, max_pending_cost=40))
+        solving = threading.Event()
+        finish = threading.Event()
+        real_solve_team = main.solve_team
+        
+        def slow_solve_team(*args):
+            solving.set()
+            finish.wait(5)
+            return real_solve_team(*args)
+        
+        monkeypatch.setattr(main, "solve_team", slow_solve_team)
+        request = Request({"type": "http", "method": "GET", "path": "/team-builder", "query_string": b"",
+                           "headers": [], "client": ("10.0.0.1", 1234)})
+        
+        leader = asyncio.ensure_future(build_team(3000, request=request))
+        while not solving.is_set():
+            await asyncio.sleep(0.001)
+        pending = main.admission.pending_cost
+        joiners = [asyncio.ensure_future(build_team(3000, request=request)) for _ in range(100)]
+        await asyncio.sleep(0.01)
+        
+        assert main.admission.pending_cost == pending > 1
+        finish.set()
+        responses = await asyncio.gather(leader, *joiners)
+        
+        assert all(response.status == "success" for response in responses)
+        snapshot = main.admission.snapshot()
+        assert snapshot["admitted"] == 101 and snapshot["overloaded"] == 0
+        assert snapshot["pending_cost"] == 0
+
+
+class TestTeamBuilderResultStore:
+    """Test cases for persisting solved teams across restarts"""
+    
+    def test_restarted_worker_answers_from_store(self, tmp_path, monkeypatch):
+        """Test that teams solved before a restart are cache hits afterwards"""
+        import main
+        from result_store import ResultStore
+        store = ResultStore(str(tmp_path / "teams.sqlite3"), flush_interval=0.01)
+        monkeypatch.setattr(main, "result_store", store)
+        
+        first = client.get("/team-builder?budget=1200")
+        store.flush()
+        # a restart: nothing in memory, only the store on disk
+        main.catalogs.clear()
+        monkeypatch.setattr(main, "result_store", ResultStore(store.path))
+        second = client.get("/team-builder?budget=1200&debug=true")
+        
+        assert second.json()["products"] == first.json()["products"]
+        assert second.json()["trace"]["counters"]["team_cache_hits"] == 1
+    
+    def test_updated_catalog_teams_are_persisted(self, tmp_path, monkeypatch):
+        """Test that teams carried over by a catalog update are stored under the new version"""
+        import main
+        from result_store import ResultStore
+        store = ResultStore(str(tmp_path / "teams.sqlite3"), flush_interval=0.01)
+        monkeypatch.setattr(main, "result_store", store)
+        client.get("/team-builder?budget=1200")
+        
+        update_catalog(removed_ids=[1])
+        store.flush()
+        
+        assert len(store) == 2
+
+
+class TestCatalogStatsEndpoint:
+    """Test cases for the /catalog/stats endpoint"""
+    
+    def test_catalog_stats(self):
+        """Test that the stats give the budget bounds /team-builder enforces"""
+        response = client.get("/catalog/stats")
+        
+        assert response.status_code == 200
+        data = response.json()
+        min_budget = data["min_budget"]
+        assert min_budget == lowest_price_combination(sample_product_json)
+        assert client.get(f"/team-builder?budget={min_budget}").status_code == 200
+        assert client.get(f"/team-builder?budget={min_budget - 1}").status_code == 400
+        assert data["saturation_budget"] > min_budget
+        assert sum(c["count"] for c in data["categories"]) == data["product_count"] == len(sample_product_json)
+    
+    def test_catalog_stats_saturated_team(self):
+        """Test that budgets above the saturation budget all get the same team"""
+        saturation = client.get("/catalog/stats?team_size=3").json()["saturation_budget"]
+        
+        teams = [
+            [p["id"] for p in client.get(f"/team-builder?budget={budget}&team_size=3").json()["products"]]
+            for budget in (saturation, saturation + 500, saturation * 10)
+        ]
+        
+        assert teams[0] == teams[1] == teams[2]
+    
+    def test_catalog_stats_conditional_request(self):
+        """Test that stats carry an ETag and a matching If-None-Match gets a 304"""
+        etag = client.get("/catalog/stats").headers["etag"]
+        
+        assert client.get("/catalog/stats", headers={"If-None-Match": etag}).status_code == 304
+        assert client.get("/catalog/stats?team_size=3").headers["etag"] != etag
+    
+    def test_catalog_stats_etag_changes_with_solver_version(self, monkeypatch):
+        """Test that a solver release invalidates cached saturation budgets"""
+        etag = client.get("/catalog/stats").headers["etag"]
+        monkeypatch.setattr(main, "SOLVER_VERSION", main.SOLVER_VERSION + 1)
+        
+        response = client.get("/catalog/stats", headers={"If-None-Match": etag})
+        
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+    
+    def test_catalog_stats_follow_updates(self):
+        """Test that stats reflect catalog updates"""
+        update_catalog(upserts=[{"id": 100, "name": "Cable", "category": "Electronics", "price": 1, "rating": 3.0}])
+        
+        data = client.get("/catalog/stats").json()
+        
+        electronics = next(c for c in data["categories"] if c["category"] == "Electronics")
+        assert electronics["min_price"] == 1
+        assert data["product_count"] == len(sample_product_json) + 1
+    
+    def test_catalog_stats_without_enough_categories(self):
+        """Test that bounds are null for team sizes above the category count"""
+        data = client.get("/catalog/stats?team_size=9").json()
+        
+        assert data["min_budget"] is None and data["saturation_budget"] is None
+    
+    def test_catalog_stats_unknown_catalog(self):
+        """Test that an unknown catalog is a 404"""
+        assert client.get("/catalog/stats?catalog=nope").status_code == 404
@@ -0,0 +1,175 @@
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+import negotiation
+from main import app
+from negotiation import JSON, MSGPACK, TEAM_IDS, negotiate, parse_accept
+from constants import sample_product_json
+from logic import lowest_price_combination
+
+client = TestClient(app)
+
+
+class TestNegotiate:
+    """Test cases for Accept header negotiation"""
+
+    def test_missing_or_wildcard_accept_gets_json(self):
+        """Test that browsers and clients without preferences keep getting JSON"""
+        offered = [JSON, MSGPACK, TEAM_IDS]
+
+        assert negotiate(None, offered) == JSON
+        assert negotiate("*/*", offered) == JSON
+        assert negotiate("application/json, text/plain, */*", offered) == JSON
+        assert negotiate("text/html,application/xhtml+xml,*/*;q=0.8", offered) == JSON
+
+    def test_explicit_type_wins_over_wildcards(self):
+        """Test that the most specific range decides the quality of a type"""
+        offered = [JSON, MSGPACK, TEAM_IDS]
+
+        assert negotiate("application/msgpack", offered) == MSGPACK
+        assert negotiate("application/x-msgpack", offered) == MSGPACK
+        assert negotiate(f"{TEAM_IDS}, */*;q=0.1", offered) == TEAM_IDS
+        assert negotiate("application/*;q=0.5, application/json;q=0.2", offered) == MSGPACK
+
+    def test_nothing_acceptable(self):
+        """Test that unsupported or refused types give None"""
+        assert negotiate("text/csv", [JSON, MSGPACK]) is None
+        assert negotiate("application/json;q=0", [JSON]) is None
+
+    def test_parse_accept_qualities(self):
+        """Test quality parsing, including malformed values"""
+        assert parse_accept("Application/JSON;q=0.5, */*;q=oops, ") == [(JSON, 0.5), ("*/*", 1.0)]
+
+
+class TestTeamBuilderRepresentations:
+    """Test cases for the negotiated /team-builder representations"""
+
+    def setup_method(self):
+        self.budget = lowest_price_combination(sample_product_json) + 300
+
+    def test_json_contract_unchanged(self):
+        """Test that JSON responses keep the full products and now vary on Accept"""
+        response = client.get(f"/team-builder?budget={self.budget}")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == JSON
+        assert response.headers["vary"] == "Accept"
+        data = response.json()
+        assert data["status"] == "success"
+        assert {"id", "name", "price", "rating", "category"} <= set(data["products"][0])
+
+    def test_ids_representation(self):
+        """Test that the compact team references catalog ids and matches the JSON team"""
+        full = client.get(f"/team-builder?budget={self.budget}").json()
+
+        response = client.get(f"/team-builder?budget={self.budget}", headers={"Accept": TEAM_IDS})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == TEAM_IDS
+        data = response.json()
+        assert data["product_ids"] == [product["id"] for product in full["products"]]
+        assert data["total_cost"] == full["total_cost"]
+        assert data["budget"] == self.budget
+        assert data["catalog"] == "default" and data["version"]
+        assert "products" not in data and "solver" not in data
+        assert len(response.content) < len(client.get(f"/team-builder?budget={self.budget}").content) / 3
+
+    def test_representations_have_distinct_etags(self):
+        """Test that a cached JSON team doesn't validate the compact one"""
+        json_response = client.get(f"/team-builder?budget={self.budget}")
+        ids_response = client.get(f"/team-builder?budget={self.budget}", headers={"Accept": TEAM_IDS})
+
+        assert json_response.headers["etag"] != ids_response.headers["etag"]
+        revalidated = client.get(
+            f"/team-builder?budget={self.budget}",
+            headers={"Accept": TEAM_IDS, "If-None-Match": ids_response.headers["etag"]},
+        )
+        assert revalidated.status_code == 304
+        stale = client.get(
+            f"/team-builder?budget={self.budget}",
+            headers={"Accept": TEAM_IDS, "If-None-Match": json_response.headers["etag"]},
+        )
+        assert stale.status_code == 200
+
+    def test_debug_trace_in_ids_representation(self):
+        """Test that the trace is attached whatever the representation"""
+        response = client.get(f"/team-builder?budget={self.budget}&debug=true", headers={"Accept": TEAM_IDS})
+
+        assert response.headers["cache-control"] == "no-store"
+        assert "serialize" in response.json()["trace"]["stages_ms"]
+
+    def test_unacceptable_type(self):
+        """Test that a client accepting nothing we produce gets 406"""
+        response = client.get(f"/team-builder?budget={self.budget}", headers={"Accept": "text/csv"})
+
+        assert response.status_code == 406
+
+    def test_msgpack_without_package(self):
+        """Test that msgpack isn't offered when the optional package is missing"""
+        with patch.object(negotiation, "msgpack", None):
+            response = client.get(f"/team-builder?budget={self.budget}", headers={"Accept": MSGPACK})
+
+        assert response.status_code == 406
+        assert MSGPACK not in response.json()["detail"]
+
+    def test_msgpack_representation(self):
+        """Test that msgpack carries the same payload as JSON"""
+        msgpack = pytest.importorskip("msgpack")
+        full = client.get(f"/team-builder?budget={self.budget}").json()
+
+        response = client.get(f"/team-builder?budget={self.budget}", headers={"Accept": MSGPACK})
+
+        assert response.headers["content-type"] == MSGPACK
+        assert msgpack.unpackb(response.content) == full
+
+
+class TestCatalogProducts:
+    """Test cases for the /catalog/products endpoint"""
+
+    def test_all_products(self):
+        """Test that every product of the catalog is returned, by id"""
+        response = client.get("/catalog/products")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [product["id"] for product in data["products"]] == sorted(p["id"] for p in sample_product_json)
+        assert data["catalog"] == "default"
+
+    def test_resolves_compact_team(self):
+        """Test that the ids of a compact team resolve to the full team's products"""
+        budget = lowest_price_combination(sample_product_json) + 300
+        full = client.get(f"/team-builder?budget={budget}").json()
+        team = client.get(f"/team-builder?budget={budget}", headers={"Accept": TEAM_IDS}).json()
+
+        query = "&".join(f"id={product_id}" for product_id in team["product_ids"])
+        data = client.get(f"/catalog/products?{query}").json()
+
+        assert data["version"] == team["version"]
+        assert data["products"] == full["products"]
+
+    def test_unknown_ids(self):
+        """Test that unknown product ids are reported"""
+        response = client.get("/catalog/products?id=1&id=9999")
+
+        assert response.status_code == 404
+        assert "9999" in response.json()["detail"]
+
+    def test_cached_until_catalog_changes(self):
+        """Test that product details revalidate with 304 for the same catalog version"""
+        response = client.get("/catalog/products?id=1")
+
+        revalidated = client.get("/catalog/products?id=1", headers={"If-None-Match": response.headers["etag"]})
+
+        assert revalidated.status_code == 304
+        assert client.get("/catalog/products?id=2", headers={"If-None-Match": response.headers["etag"]}).status_code == 200
+
+    def test_ids_representation_not_offered(self):
+        """Test that the compact team type isn't a representation of products"""
+        response = client.get("/catalog/products", headers={"Accept": TEAM_IDS})
+
+        assert response.status_code == 406
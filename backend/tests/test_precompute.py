@@ -0,0 +1,74 @@
+import pytest
+import sys
+import os
+import csv
+import json
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from precompute import main, precompute
+from logic import curate_product_team, lowest_price_combination
+from constants import sample_product_json
+
+
+class TestPrecompute:
+    """Test cases for the offline precomputation CLI"""
+    
+    def test_precompute_matches_solver(self):
+        """Test that precomputed rows match curate_product_team"""
+        minimum_budget = lowest_price_combination(sample_product_json)
+        budgets = [minimum_budget - 1, minimum_budget, 800, 2000]
+        
+        rows = precompute({"default": sample_product_json}, budgets, workers=1)
+        
+        assert [row["budget"] for row in rows] == budgets
+        assert rows[0]["status"] == "below_minimum"
+        for row in rows[1:]:
+            team = curate_product_team(sample_product_json, row["budget"])
+            assert row["status"] == "ok"
+            assert row["product_ids"] == [p.id for p in team]
+            assert row["total_cost"] == sum(p.price for p in team)
+    
+    def test_precompute_in_parallel_keeps_order(self):
+        """Test that a process pool returns rows ordered by catalog and budget"""
+        budgets = list(range(300, 400, 10))
+        catalogs = {"a": sample_product_json, "b": sample_product_json[:15]}
+        
+        rows = precompute(catalogs, budgets, workers=2, chunk_size=3)
+        
+        assert [(row["catalog"], row["budget"]) for row in rows] == [(c, b) for c in "ab" for b in budgets]
+        assert rows == precompute(catalogs, budgets, workers=1, chunk_size=3)
+    
+    def test_cli_ndjson_from_catalog_file(self, tmp_path):
+        """Test the CLI with a catalog file and a budget list"""
+        catalog = tmp_path / "store.json"
+        catalog.write_text(json.dumps(sample_product_json))
+        output = tmp_path / "teams.ndjson"
+        
+        main(["--catalog", str(catalog), "--budgets", "500", "1000", "--workers", "1", "--output", str(output)])
+        
+        rows = [json.loads(line) for line in output.read_text().splitlines()]
+        assert [row["catalog"] for row in rows] == ["store", "store"]
+        assert all(len(row["product_ids"]) == 5 for row in rows)
+    
+    def test_cli_csv_and_columnar_with_team_size(self, tmp_path):
+        """Test the CSV and columnar formats for a budget range"""
+        csv_output = tmp_path / "teams.csv"
+        columnar_output = tmp_path / "teams.json"
+        
+        main(["--range", "500", "520", "10", "--team-size", "3", "--format", "csv",
+              "--workers", "1", "--output", str(csv_output)])
+        main(["--range", "500", "520", "10", "--team-size", "3", "--format", "columnar",
+              "--workers", "1", "--output", str(columnar_output)])
+        
+        with open(csv_output) as csv_file:
+            rows = list(csv.DictReader(csv_file))
+        columns = json.loads(columnar_output.read_text())
+        assert [row["budget"] for row in rows] == ["500", "510", "520"]
+        assert all(len(row["product_ids"].split(";")) == 3 for row in rows)
+        assert columns["budget"] == [500, 510, 520]
+        assert [len(ids) for ids in columns["product_ids"]] == [3, 3, 3]
+    
+    def test_cli_requires_budgets(self):
+        """Test that either --budgets or --range is required"""
+        with pytest.raises(SystemExit):
+            main(["--format", "csv"])
@@ -0,0 +1,124 @@
+import sys
+import os
+import sqlite3
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import Catalog
+from constants import sample_product_json
+from logic import curate_product_team
+from models import TeamConstraints
+from result_store import ResultStore
+
+
+def indexed_catalog(products=sample_product_json):
+    catalog = Catalog(products)
+    catalog.build_index()
+    return catalog
+
+
+class TestResultStore:
+    """Test cases for the persistent SQLite ResultStore"""
+    
+    def test_teams_survive_a_restart(self, tmp_path):
+        """Test that saved teams are bulk-loaded into a fresh catalog's cache"""
+        path = str(tmp_path / "teams.sqlite3")
+        catalog = indexed_catalog()
+        constraints = TeamConstraints(team_size=3, include_categories=["Audio"])
+        team = curate_product_team(catalog.index, 1000)
+        constrained = curate_product_team(catalog.index, 800, constraints)
+        store = ResultStore(path, flush_interval=0.01)
+        store.save(catalog.version, 1000, team)
+        store.save(catalog.version, 800, constrained, constraints)
+        store.close()
+        
+        restarted = indexed_catalog()
+        loaded = ResultStore(path).load(restarted)
+        
+        assert loaded == 2
+        assert restarted.teams.get(1000) == team
+        assert restarted.teams.get(800, TeamConstraints(team_size=3, include_categories=["Audio"])) == constrained
+    
+    def test_other_catalog_versions_are_not_loaded(self, tmp_path):
+        """Test that teams of a different catalog content are ignored"""
+        store = ResultStore(str(tmp_path / "teams.sqlite3"), flush_interval=0.01)
+        catalog = indexed_catalog()
+        store.save(catalog.version, 1000, curate_product_team(catalog.index, 1000))
+        store.flush()
+        
+        changed = indexed_catalog(sample_product_json[1:])
+        
+        assert store.load(changed) == 0
+        assert len(changed.teams) == 0
+    
+    def test_other_solver_versions_are_not_loaded(self, tmp_path):
+        """Test that teams solved by another solver version are ignored after a deploy"""
+        path = str(tmp_path / "teams.sqlite3")
+        catalog = indexed_catalog()
+        old = ResultStore(path, flush_interval=0.01, solver_version=0)
+        old.save(catalog.version, 1000, curate_product_team(catalog.index, 1000))
+        old.close()
+        
+        store = ResultStore(path)
+        
+        assert store.load(catalog) == 0
+        assert len(catalog.teams) == 0
+        assert ResultStore(path, solver_version=0).load(catalog) == 1
+    
+    def test_unversioned_table_is_dropped(self, tmp_path):
+        """Test that teams stored before versioning are discarded"""
+        path = str(tmp_path / "teams.sqlite3")
+        connection = sqlite3.connect(path)
+        with connection:
+            connection.execute(
+                "CREATE TABLE teams (catalog_version TEXT NOT NULL, budget INTEGER NOT NULL, options TEXT NOT NULL, "
+                "products TEXT NOT NULL, stored_at REAL NOT NULL, PRIMARY KEY (catalog_version, budget, options))"
+            )
+            connection.execute("INSERT INTO teams VALUES ('v', 1000, '', '[]', 0)")
+        connection.close()
+        
+        store = ResultStore(path, flush_interval=0.01)
+        catalog = indexed_catalog()
+        store.save(catalog.version, 1000, curate_product_team(catalog.index, 1000))
+        store.flush()
+        
+        assert len(store) == 1
+        assert store.load(indexed_catalog()) == 1
+    
+    def test_writes_are_batched(self, tmp_path):
+        """Test that many saves are written together by the background writer"""
+        store = ResultStore(str(tmp_path / "teams.sqlite3"), batch_size=64, flush_interval=0.05)
+        catalog = indexed_catalog()
+        team = curate_product_team(catalog.index, 1000)
+        
+        for budget in range(100):
+            store.save(catalog.version, budget, team)
+        store.flush()
+        
+        assert len(store) == 100
+        assert store.snapshot()["written"] == 100
+        assert store.snapshot()["pending"] == 0
+    
+    def test_compaction_bounds_the_table(self, tmp_path):
+        """Test that the oldest rows are dropped once max_entries is exceeded"""
+        store = ResultStore(str(tmp_path / "teams.sqlite3"), max_entries=50, batch_size=10, flush_interval=0.01)
+        catalog = indexed_catalog()
+        team = curate_product_team(catalog.index, 1000)
+        
+        for budget in range(200):
+            store.save(catalog.version, budget, team)
+        store.flush()
+        
+        assert len(store) <= 50
+        store.load(catalog)
+        # the most recent budgets are the ones kept
+        assert 199 in catalog.teams.budgets()
+        assert 0 not in catalog.teams.budgets()
+    
+    def test_empty_teams_are_not_saved(self, tmp_path):
+        """Test that 'no solution' isn't persisted"""
+        store = ResultStore(str(tmp_path / "teams.sqlite3"))
+        
+        store.save("version", 10, [])
+        store.flush()
+        
+        assert len(store) == 0
@@ -0,0 +1,75 @@
+import pytest
+import sys
+import os
+import asyncio
+import threading
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test cases for the SingleFlight request coalescing helper"""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        """Test that concurrent callers with the same key run the function once"""
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+        
+        def slow_solve(budget):
+            calls.append(budget)
+            release.wait(timeout=5)
+            return budget * 2
+        
+        waiters = [asyncio.create_task(flight.do(500, slow_solve, 500)) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        release.set()
+        results = await asyncio.gather(*waiters)
+        
+        assert results == [1000] * 5
+        assert calls == [500]
+        assert flight.snapshot()["500"] == {"calls": 5, "executions": 1, "coalesced": 4, "errors": 0}
+        assert flight.in_flight() == 0
+    
+    @pytest.mark.asyncio
+    async def test_different_keys_are_not_coalesced(self):
+        """Test that distinct keys each get their own execution"""
+        flight = SingleFlight()
+        
+        results = await asyncio.gather(flight.do(1, lambda: "a"), flight.do(2, lambda: "b"))
+        
+        assert results == ["a", "b"]
+        assert flight.snapshot()["1"]["executions"] == 1
+        assert flight.snapshot()["2"]["executions"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_all_waiters(self):
+        """Test that an exception is raised in every coalesced caller"""
+        flight = SingleFlight()
+        release = threading.Event()
+        
+        def failing_solve():
+            release.wait(timeout=5)
+            raise ValueError("solver failed")
+        
+        waiters = [asyncio.create_task(flight.do("key", failing_solve)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        
+        assert all(isinstance(r, ValueError) for r in results)
+        assert flight.snapshot()["key"]["errors"] == 1
+        assert flight.in_flight() == 0
+    
+    @pytest.mark.asyncio
+    async def test_sequential_calls_are_not_cached(self):
+        """Test that completed calls are forgotten and run again"""
+        flight = SingleFlight()
+        calls = []
+        
+        await flight.do("key", lambda: calls.append(1))
+        await flight.do("key", lambda: calls.append(1))
+        
+        assert len(calls) == 2
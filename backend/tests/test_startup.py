@@ -0,0 +1,50 @@
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from startup import StartupPipeline
+
+
+class TestStartupPipeline:
+    """Test cases for the StartupPipeline phase recorder"""
+    
+    def test_phase_records_duration_once(self):
+        """Test that a phase is timed and only the first recording is kept"""
+        pipeline = StartupPipeline()
+        
+        with pipeline.phase("catalog_load"):
+            pass
+        pipeline.record("catalog_load", 10.0)
+        
+        assert list(pipeline.phases) == ["catalog_load"]
+        assert pipeline.phases["catalog_load"] < 10000
+    
+    def test_phase_is_recorded_when_block_raises(self):
+        """Test that a failing phase still reports its duration"""
+        pipeline = StartupPipeline()
+        
+        with pytest.raises(RuntimeError):
+            with pipeline.phase("warm_up_solve"):
+                raise RuntimeError("boom")
+        
+        assert "warm_up_solve" in pipeline.phases
+    
+    def test_ready_and_failed_states(self):
+        """Test readiness transitions and the snapshot contents"""
+        pipeline = StartupPipeline()
+        pipeline.record("import", 0.5)
+        
+        assert pipeline.snapshot()["ready"] is False
+        
+        pipeline.mark_failed(ValueError("bad catalog"))
+        snapshot = pipeline.snapshot()
+        assert snapshot["ready"] is False
+        assert snapshot["error"] == "ValueError: bad catalog"
+        
+        pipeline.mark_ready()
+        snapshot = pipeline.snapshot()
+        assert snapshot["ready"] is True
+        assert snapshot["error"] is None
+        assert snapshot["phases_ms"] == {"import": 500.0}
+        assert snapshot["total_ms"] == 500.0
@@ -0,0 +1,115 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic import CatalogIndex, affected_budget_floor, curate_product_team, lowest_price_combination
+from catalog import Catalog
+from team_cache import TeamCache
+from constants import sample_product_json
+
+
+def solve_all(catalog, budgets):
+    """Solve every budget from scratch against a catalog"""
+    return {budget: curate_product_team(catalog.index, budget) for budget in budgets}
+
+
+class TestTeamCache:
+    """Test cases for the TeamCache store"""
+    
+    def test_put_and_get(self):
+        """Test storing and retrieving a team, and that empty teams are not cached"""
+        cache = TeamCache()
+        
+        cache.put(500, ["team"])
+        cache.put(600, [])
+        
+        assert cache.get(500) == ["team"]
+        assert cache.get(600) is None
+        assert cache.budgets() == [500]
+    
+    def test_least_recently_used_budget_is_evicted(self):
+        """Test that the cache stays within its size bound"""
+        cache = TeamCache(max_entries=2)
+        cache.put(1, ["a"])
+        cache.put(2, ["b"])
+        cache.get(1)
+        cache.put(3, ["c"])
+        
+        assert cache.budgets() == [1, 3]
+
+
+class TestAffectedBudgetFloor:
+    """Test cases for affected_budget_floor function"""
+    
+    def setup_method(self):
+        """Set up the sample catalog index"""
+        self.index = CatalogIndex(sample_product_json)
+    
+    def test_no_changes_affect_nothing(self):
+        """Test that an empty change set keeps every result"""
+        assert affected_budget_floor(self.index, self.index, []) == float('inf')
+    
+    def test_expensive_product_only_affects_high_budgets(self):
+        """Test that a price change on the VR Headset only matters above its threshold"""
+        changed = [dict(p, price=340) if p['id'] == 20 else p for p in sample_product_json]
+        
+        new_index = CatalogIndex(changed)
+        
+        floor = affected_budget_floor(self.index, new_index, [20])
+        
+        # the cheaper new price makes the headset feasible from a lower budget
+        assert floor == new_index.feasibility_threshold(20, 5) < self.index.feasibility_threshold(20, 5)
+        assert floor > lowest_price_combination(sample_product_json)
+    
+    def test_removing_a_category_affects_everything(self):
+        """Test that a category disappearing invalidates all budgets"""
+        changed = [p for p in sample_product_json if p['category'] != 'Storage']
+        
+        assert affected_budget_floor(self.index, CatalogIndex(changed), [16]) == 0
+
+
+class TestTeamCacheMigration:
+    """Test cases for carrying cached teams over a catalog update"""
+    
+    def setup_method(self):
+        """Fill a cache for the sample catalog over a wide range of budgets"""
+        self.catalog = Catalog(sample_product_json)
+        self.catalog.build_index()
+        self.budgets = list(range(lowest_price_combination(sample_product_json), 2000, 25))
+        for budget, team in solve_all(self.catalog, self.budgets).items():
+            self.catalog.teams.put(budget, team)
+    
+    def migrate(self, upserts=(), removed_ids=()):
+        new_catalog, changed_ids = self.catalog.updated(upserts, removed_ids)
+        new_catalog.build_index()
+        teams, stats = self.catalog.teams.migrate(
+            self.catalog.index, new_catalog.index, changed_ids,
+            lambda budget, options: curate_product_team(new_catalog.index, budget, options)
+        )
+        return new_catalog, teams, stats
+    
+    def test_migrated_cache_matches_full_resolve(self):
+        """Test that reused and re-solved teams equal a from-scratch solve"""
+        vr_headset = dict(sample_product_json[19], price=280, rating=5.0)
+        new_catalog, teams, stats = self.migrate(upserts=[vr_headset])
+        
+        expected = solve_all(new_catalog, self.budgets)
+        for budget in self.budgets:
+            assert teams.get(budget) == expected[budget]
+        assert stats['reused'] > 0
+        assert stats['resolved'] < len(self.budgets)
+    
+    def test_removed_product_is_never_served(self):
+        """Test that removing a product re-solves every team that used it"""
+        new_catalog, teams, stats = self.migrate(removed_ids=[11])
+        
+        for budget in teams.budgets():
+            assert 11 not in [p.id for p in teams.get(budget)]
+        assert new_catalog.version != self.catalog.version
+    
+    def test_unchanged_upsert_reuses_everything(self):
+        """Test that re-sending an identical product keeps all teams"""
+        new_catalog, teams, stats = self.migrate(upserts=[dict(sample_product_json[0])])
+        
+        assert stats['reused'] == len(self.budgets)
+        assert stats['resolved'] == 0
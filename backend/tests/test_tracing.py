@@ -0,0 +1,157 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import threading
+from unittest.mock import patch
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from tracing import SolverTrace, TraceExporter, export_trace, trace_exporter, trace_stage, trace_count
+from logic import curate_product_team, exhaustive_best_combination, lowest_price_combination, CatalogIndex
+from constants import sample_product_json
+
+
+class TestSolverTrace:
+    """Test cases for the SolverTrace recorder"""
+    
+    def test_counters_and_stages(self):
+        """Test that counters add up and repeated stages accumulate"""
+        trace = SolverTrace()
+        trace.count("combinations_enumerated", 10)
+        trace.count("combinations_enumerated")
+        with trace.stage("search"):
+            pass
+        with trace.stage("search"):
+            pass
+        
+        data = trace.to_dict()
+        assert data["counters"] == {"combinations_enumerated": 11}
+        assert list(data["stages_ms"]) == ["search"]
+        assert len(data["trace_id"]) == 32
+    
+    def test_helpers_ignore_missing_trace(self):
+        """Test that trace_stage and trace_count are no-ops without a trace"""
+        with trace_stage(None, "search"):
+            trace_count(None, "combinations_enumerated")
+    
+    def test_to_otlp_spans(self):
+        """Test the OTLP/JSON structure: a root span with counters and a child per stage"""
+        trace = SolverTrace(attributes={"budget": 1000})
+        trace.count("subsets_considered", 3)
+        with trace.stage("search"):
+            pass
+        trace.finish()
+        
+        spans = trace.to_otlp()["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        root, child = spans
+        assert root["traceId"] == trace.trace_id == child["traceId"]
+        assert child["parentSpanId"] == root["spanId"]
+        assert child["name"] == "search"
+        attributes = {a["key"]: a["value"] for a in root["attributes"]}
+        assert attributes["budget"] == {"intValue": "1000"}
+        assert attributes["solver.subsets_considered"] == {"intValue": "3"}
+
+
+class TestSolverTraceCounters:
+    """Test cases for the counters recorded by the solver functions"""
+    
+    def test_curate_product_team_records_work(self):
+        """Test that the DP solver reports enumerated combinations and stages"""
+        trace = SolverTrace()
+        curate_product_team(sample_product_json, 1000, trace=trace)
+        
+        assert trace.counters["combinations_enumerated"] > 0
+        assert trace.counters["combinations_pruned"] > 0
+        assert set(trace.stages_ms()) == {"filter", "search", "build_models"}
+    
+    def test_exhaustive_search_counts_subsets(self):
+        """Test that the reference search counts every category subset it considers"""
+        trace = SolverTrace()
+        exhaustive_best_combination(CatalogIndex(sample_product_json).categories, 1000, trace=trace)
+        
+        # 8 categories choose 5
+        assert trace.counters["subsets_considered"] == 56
+        assert trace.counters["combinations_enumerated"] > 0
+    
+    def test_lowest_price_combination_records_categories(self):
+        """Test that the minimum budget computation counts the categories it looked at"""
+        trace = SolverTrace()
+        lowest_price_combination(sample_product_json, trace=trace)
+        
+        assert trace.counters["minimum_budget_categories"] == 8
+
+
+class TestExportTrace:
+    """Test cases for exporting traces to an OTLP collector"""
+    
+    def test_export_disabled_without_endpoint(self, monkeypatch):
+        """Test that nothing is exported when no collector is configured"""
+        monkeypatch.delenv("OTEL_EXPORTER_OTLP_ENDPOINT", raising=False)
+        
+        assert export_trace(SolverTrace()) is None
+    
+    def test_export_posts_batches_to_collector(self):
+        """Test that queued traces are posted together as OTLP/JSON to {endpoint}/v1/traces"""
+        received = []
+        
+        class Collector(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                received.append((self.path, json.loads(body)))
+                self.send_response(200)
+                self.end_headers()
+            
+            def log_message(self, *args):
+                pass
+        
+        server = HTTPServer(("127.0.0.1", 0), Collector)
+        thread = threading.Thread(target=server.handle_request)
+        thread.start()
+        try:
+            exporter = TraceExporter(f"http://127.0.0.1:{server.server_port}/", schedule_delay=0.2)
+            traces = [SolverTrace(), SolverTrace()]
+            for trace in traces:
+                trace.finish()
+                assert exporter.export(trace)
+            exporter.flush()
+        finally:
+            thread.join(timeout=5)
+            server.server_close()
+        
+        assert len(received) == 1
+        path, body = received[0]
+        assert path == "/v1/traces"
+        spans = body["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert {span["traceId"] for span in spans} == {trace.trace_id for trace in traces}
+        assert exporter.counters["exported"] == 2
+    
+    def test_export_failure_is_ignored(self):
+        """Test that an unreachable collector doesn't raise"""
+        exporter = TraceExporter("http://127.0.0.1:1", schedule_delay=0)
+        
+        assert exporter.export(SolverTrace())
+        exporter.flush()
+        
+        assert exporter.counters["failed"] == 1
+    
+    def test_full_queue_drops_traces(self):
+        """Test that traces are dropped and counted instead of queued without bound"""
+        blocked = threading.Event()
+        
+        with patch("tracing._post_traces", side_effect=lambda url, payload: blocked.wait(5)):
+            exporter = TraceExporter("http://collector", max_queue_size=2, batch_size=1, schedule_delay=0)
+            results = [exporter.export(SolverTrace()) for _ in range(10)]
+            blocked.set()
+            exporter.flush()
+        
+        # at most one trace in the exporter's hands plus a full queue
+        assert results.count(True) <= 3
+        assert exporter.counters["dropped"] == results.count(False) >= 7
+        assert exporter.snapshot()["pending"] == 0
+    
+    def test_export_trace_shares_exporter_per_endpoint(self, monkeypatch):
+        """Test that the configured endpoint gets a single exporter"""
+        monkeypatch.setenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://127.0.0.1:1")
+        
+        assert trace_exporter() is trace_exporter("http://127.0.0.1:1")
@@ -0,0 +1,310 @@
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+logger = logging.getLogger(__name__)
+
+# Standard OpenTelemetry variable; when set, traces are exported to {endpoint}/v1/traces (OTLP/HTTP JSON)
+OTLP_ENDPOINT_ENV = "OTEL_EXPORTER_OTLP_ENDPOINT"
+# standard batch span processor settings: queued traces, traces per POST, wait for a batch in ms
+MAX_QUEUE_SIZE_ENV = "OTEL_BSP_MAX_QUEUE_SIZE"
+MAX_EXPORT_BATCH_SIZE_ENV = "OTEL_BSP_MAX_EXPORT_BATCH_SIZE"
+SCHEDULE_DELAY_ENV = "OTEL_BSP_SCHEDULE_DELAY"
+
+_exporters = {}
+_exporters_lock = threading.Lock()
+
+
+class SolverTrace:
+    """
+    Structured record of the work done for one request: counters (category subsets
+    considered, combinations enumerated and pruned...) and the wall time of each stage.
+    Passed down to the solver functions as an optional `trace` argument; stages that
+    run more than once accumulate.
+    """
+
+    def __init__(self, name="team-builder", attributes=None):
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.trace_id = os.urandom(16).hex()
+        self.counters = defaultdict(int)
+        self.spans = []
+        self._started_ns = time.time_ns()
+        self._ended_ns = None
+
+    def count(self, name, amount=1):
+        """
+        Increment a work counter.
+
+        Args:
+            name (str): Counter name, e.g. "combinations_enumerated".
+            amount (int): How much to add.
+        """
+        self.counters[name] += amount
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Time the enclosed block as a stage of the request.
+
+        Args:
+            name (str): Stage name, e.g. "search".
+        """
+        started_ns = time.time_ns()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append({
+                "name": name,
+                "start_ns": started_ns,
+                "end_ns": started_ns + int((time.perf_counter() - started) * 1e9),
+            })
+
+    def finish(self):
+        """Mark the end of the traced request."""
+        self._ended_ns = time.time_ns()
+
+    def stages_ms(self) -> dict:
+        """Total wall time per stage in milliseconds."""
+        totals = defaultdict(float)
+        for span in self.spans:
+            totals[span["name"]] += (span["end_ns"] - span["start_ns"]) / 1e6
+        return {name: round(ms, 3) for name, ms in totals.items()}
+
+    def to_dict(self) -> dict:
+        """
+        Plain representation for the debug response field.
+
+        Returns:
+            dict: trace id, counters and per-stage wall time
+        """
+        return {
+            "trace_id": self.trace_id,
+            "counters": dict(self.counters),
+            "stages_ms": self.stages_ms(),
+        }
+
+    def to_otlp(self) -> dict:
+        """
+        OTLP/JSON export request: one root span for the request (carrying the counters
+        as attributes) and one child span per stage.
+
+        Returns:
+            dict: Body for POST {endpoint}/v1/traces
+        """
+        return otlp_request([self])
+
+    def otlp_spans(self) -> list:
+        """The OTLP/JSON spans of this trace: the request's root span, then one per stage."""
+        ended_ns = self._ended_ns or time.time_ns()
+        root_span_id = os.urandom(8).hex()
+
+        def attribute(key, value):
+            if isinstance(value, bool):
+                typed = {"boolValue": value}
+            elif isinstance(value, int):
+                typed = {"intValue": str(value)}
+            elif isinstance(value, float):
+                typed = {"doubleValue": value}
+            else:
+                typed = {"stringValue": str(value)}
+            return {"key": key, "value": typed}
+
+        root = {
+            "traceId": self.trace_id,
+            "spanId": root_span_id,
+            "name": self.name,
+            "kind": 2,  # SPAN_KIND_SERVER
+            "startTimeUnixNano": str(self._started_ns),
+            "endTimeUnixNano": str(ended_ns),
+            "attributes": [attribute(k, v) for k, v in self.attributes.items()]
+                          + [attribute(f"solver.{k}", v) for k, v in self.counters.items()],
+        }
+        children = [
+            {
+                "traceId": self.trace_id,
+                "spanId": os.urandom(8).hex(),
+                "parentSpanId": root_span_id,
+                "name": span["name"],
+                "kind": 1,  # SPAN_KIND_INTERNAL
+                "startTimeUnixNano": str(span["start_ns"]),
+                "endTimeUnixNano": str(span["end_ns"]),
+            }
+            for span in self.spans
+        ]
+        return [root] + children
+
+
+def otlp_request(traces) -> dict:
+    """
+    OTLP/JSON export request carrying the spans of several traces.
+
+    Args:
+        traces (list): Finished SolverTrace objects.
+
+    Returns:
+        dict: Body for POST {endpoint}/v1/traces
+    """
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "team-builder-api"}}]},
+            "scopeSpans": [{
+                "scope": {"name": "team-builder.solver"},
+                "spans": [span for trace in traces for span in trace.otlp_spans()],
+            }],
+        }]
+    }
+
+
+def otlp_endpoint():
+    """The configured OTLP collector endpoint, or None when export is disabled."""
+    return os.environ.get(OTLP_ENDPOINT_ENV) or None
+
+
+class TraceExporter:
+    """
+    Exports finished traces to an OTLP collector from a background thread, several
+    traces per POST. The queue is bounded: when the collector is slow or down, new
+    traces are dropped (and counted) instead of piling up in memory.
+    """
+
+    def __init__(self, endpoint, max_queue_size=2048, batch_size=512, schedule_delay=5.0):
+        """
+        Args:
+            endpoint (str): Collector base URL, traces are posted to {endpoint}/v1/traces.
+            max_queue_size (int): Traces waiting for export before new ones are dropped.
+            batch_size (int): Maximum traces per POST.
+            schedule_delay (float): Seconds the exporter waits to fill a batch.
+        """
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.batch_size = batch_size
+        self.schedule_delay = schedule_delay
+        self.counters = {'queued': 0, 'exported': 0, 'dropped': 0, 'failed': 0}
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._thread = threading.Thread(target=self._export_loop, name="otlp-export", daemon=True)
+        self._thread.start()
+
+    def export(self, trace) -> bool:
+        """
+        Queue a finished trace for export. Never blocks.
+
+        Returns:
+            bool: False if the queue was full and the trace was dropped.
+        """
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.counters['dropped'] += 1
+            return False
+        self.counters['queued'] += 1
+        return True
+
+    def flush(self):
+        """Block until every queued trace was exported (or failed to)."""
+        self._queue.join()
+
+    def snapshot(self) -> dict:
+        """Return the exporter counters and queue length for monitoring."""
+        return {"url": self.url, "pending": self._queue.qsize(), **self.counters}
+
+    def _export_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.schedule_delay
+            # gather more traces until the batch is full or the delay is over
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            try:
+                if _post_traces(self.url, otlp_request(batch)) is None:
+                    self.counters['failed'] += len(batch)
+                else:
+                    self.counters['exported'] += len(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+def trace_exporter(endpoint=None):
+    """
+    The exporter of a collector endpoint, created on first use with the OTEL_BSP_*
+    settings (defaults: 2048 queued traces, 512 per POST, 5000 ms delay).
+
+    Args:
+        endpoint (str): Collector base URL (defaults to OTEL_EXPORTER_OTLP_ENDPOINT).
+
+    Returns:
+        TraceExporter: The exporter, or None when export is disabled.
+    """
+    endpoint = endpoint or otlp_endpoint()
+    if not endpoint:
+        return None
+    with _exporters_lock:
+        exporter = _exporters.get(endpoint)
+        if exporter is None:
+            exporter = _exporters[endpoint] = TraceExporter(
+                endpoint,
+                max_queue_size=int(os.environ.get(MAX_QUEUE_SIZE_ENV, 2048)),
+                batch_size=int(os.environ.get(MAX_EXPORT_BATCH_SIZE_ENV, 512)),
+                schedule_delay=float(os.environ.get(SCHEDULE_DELAY_ENV, 5000)) / 1000,
+            )
+    return exporter
+
+
+def export_trace(trace, endpoint=None):
+    """
+    Send a trace to the OTLP collector off the request path. Export failures are
+    logged and otherwise ignored - tracing must never fail a request.
+
+    Args:
+        trace (SolverTrace): The finished trace.
+        endpoint (str): Collector base URL (defaults to OTEL_EXPORTER_OTLP_ENDPOINT).
+
+    Returns:
+        bool: Whether the trace was queued (False when dropped), None when export is disabled.
+    """
+    exporter = trace_exporter(endpoint)
+    if exporter is None:
+        return None
+    return exporter.export(trace)
+
+
+def _post_traces(url, payload):
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=2) as response:
+            return response.status
+    except Exception as exc:
+        logger.warning("Could not export solver traces to %s: %s", url, exc)
+        return None
+
+
+def trace_stage(trace, name):
+    """
+    Time a stage on an optional trace - a no-op context when trace is None.
+
+    Args:
+        trace (SolverTrace): Trace of the current request, or None.
+        name (str): Stage name.
+    """
+    return trace.stage(name) if trace is not None else nullcontext()
+
+
+def trace_count(trace, name, amount=1):
+    """Increment a counter on an optional trace (no-op when trace is None)."""
+    if trace is not None:
+        trace.count(name, amount)